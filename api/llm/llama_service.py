@@ -2,6 +2,7 @@ from typing import Dict, Any, List
 import httpx
 import json
 import os
+from services.single_flight import get_single_flight
 
 class LlamaService:
     def __init__(self):
@@ -11,6 +12,12 @@ class LlamaService:
     
     async def get_available_models(self) -> List[Dict[str, Any]]:
         """Get list of available models from Ollama"""
+        # Every generate/chat call asks for the model list, so share concurrent lookups
+        return await get_single_flight("llm.get_available_models").do(
+            self.ollama_base_url, self._fetch_available_models
+        )
+    
+    async def _fetch_available_models(self) -> List[Dict[str, Any]]:
         import asyncio
         
         for attempt in range(3):
@@ -1,15 +1,28 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
-from rest.manhwa import router as manhwa_router
-from rest.search import router as search_router
-from rest.llm import router as llm_router
-from rest.manhwa_import import router as import_router
+from services.startup_report import get_startup_report
 import os
+import sys
 import logging
 
 logger = logging.getLogger(__name__)
+startup_report = get_startup_report()
+
+# Routers only import their modules; services and clients are built on first use
+with startup_report.measure("rest.manhwa", "import"):
+    from rest.manhwa import router as manhwa_router
+with startup_report.measure("rest.search", "import"):
+    from rest.search import router as search_router
+with startup_report.measure("rest.llm", "import"):
+    from rest.llm import router as llm_router
+with startup_report.measure("rest.manhwa_import", "import"):
+    from rest.manhwa_import import router as import_router
+with startup_report.measure("rest middleware", "import"):
+    from rest.http_cache import ETagMiddleware
+    from rest.compression import CompressionMiddleware
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -18,40 +31,82 @@ async def lifespan(app: FastAPI):
     print("=== Starting Paimon's Codex API ===")
     logger.info("Starting Paimon's Codex API")
     
+    # Build the app-scoped services once; routers get them through rest.dependencies
+    from services.container import initialize_container
+    services = initialize_container()
+    app.state.services = services
+    
     # Initialize background scheduler
     try:
         print("=== Importing scheduler modules ===")
         from services.background_scheduler import initialize_scheduler
-        from services.manhwa_import_service import ManhwaImportService
-        
-        print("=== Importing ManhwaService ===")
-        from services.manhwa_service import ManhwaService
-        
-        print("=== Importing MinIO client ===")
-        from dal.minio_client import get_minio_client
-        
-        print("=== Initializing ManhwaService ===")
-        # Initialize import service for scheduler
-        manhwa_service = ManhwaService()
-        
-        print("=== Getting MinIO client ===")
-        minio_client = get_minio_client()
-        
-        print("=== Creating ManhwaImportService ===")
-        import_service = ManhwaImportService(manhwa_service, minio_client)
         
         print("=== Initializing scheduler ===")
-        # Start background scheduler
-        await initialize_scheduler(import_service)
+        # The import service (MinIO + catalog) is resolved when the first import runs
+        await initialize_scheduler(import_service_provider=lambda: services.import_service)
         print("=== Background scheduler started ===")
         logger.info("Background scheduler started")
-        
+    
     except Exception as e:
         print(f"=== ERROR: Failed to initialize background scheduler: {e} ===")
         import traceback
         traceback.print_exc()
         logger.warning(f"Failed to initialize background scheduler: {e}")
     
+    # Start write-behind view counter; the Oracle client is the one service built eagerly,
+    # since catalog reads need it right away (the session pool itself is still created lazily)
+    if services.oracle_client:
+        try:
+            from services.view_counter import initialize_view_counter
+            await initialize_view_counter(services.oracle_client)
+            logger.info("View counter started")
+        except Exception as e:
+            logger.warning(f"Failed to initialize view counter: {e}")
+    
+    # In-process vector index, warmed from Oracle in the background; searches use Oracle until then
+    if services.oracle_client:
+        from services.vector_index import vector_index_enabled
+        if vector_index_enabled():
+            try:
+                from services.vector_index import initialize_vector_index
+                await initialize_vector_index(services.oracle_client)
+                logger.info("Vector index warming started")
+            except Exception as e:
+                logger.warning(f"Failed to initialize vector index: {e}")
+    
+    # In-process BM25 index for keyword search, fused with vector results once warm
+    if services.oracle_client:
+        from services.lexical_index import lexical_index_enabled
+        if lexical_index_enabled():
+            try:
+                from services.lexical_index import initialize_lexical_index
+                await initialize_lexical_index(services.oracle_client)
+                logger.info("Lexical index warming started")
+            except Exception as e:
+                logger.warning(f"Failed to initialize lexical index: {e}")
+    
+    # In-memory prefix index behind /search/suggest
+    if services.oracle_client:
+        from services.suggest_index import suggest_index_enabled
+        if suggest_index_enabled():
+            try:
+                from services.suggest_index import initialize_suggest_index
+                await initialize_suggest_index(services.oracle_client)
+                logger.info("Suggest index warming started")
+            except Exception as e:
+                logger.warning(f"Failed to initialize suggest index: {e}")
+    
+    # Pick up a catalog re-embedding that a restart interrupted
+    if services.oracle_client:
+        try:
+            from services.reindex_job import resume_reindex_job
+            if resume_reindex_job(services.oracle_client):
+                logger.info("Resumed interrupted reindex from its checkpoint")
+        except Exception as e:
+            logger.warning(f"Failed to resume reindex: {e}")
+    
+    startup_report.mark_ready()
+    
     yield
     
     # Shutdown
@@ -63,20 +118,90 @@ async def lifespan(app: FastAPI):
         logger.info("Background scheduler stopped")
     except Exception as e:
         logger.warning(f"Error shutting down scheduler: {e}")
+    
+    try:
+        from services.view_counter import shutdown_view_counter
+        await shutdown_view_counter()
+        logger.info("View counter flushed")
+    except Exception as e:
+        logger.warning(f"Error flushing view counter: {e}")
+    
+    # Stopped before the indexes and the session pool; its checkpoint lets the next start resume
+    if "services.reindex_job" in sys.modules:
+        try:
+            from services.reindex_job import shutdown_reindex_job
+            await shutdown_reindex_job()
+        except Exception as e:
+            logger.warning(f"Error stopping reindex: {e}")
+    
+    if "services.vector_index_lifecycle" in sys.modules:
+        try:
+            from services.vector_index_lifecycle import shutdown_vector_index_lifecycle
+            await shutdown_vector_index_lifecycle()
+        except Exception as e:
+            logger.warning(f"Error stopping vector index rebuild: {e}")
+    
+    if "services.vector_index" in sys.modules:
+        try:
+            from services.vector_index import shutdown_vector_index
+            await shutdown_vector_index()
+        except Exception as e:
+            logger.warning(f"Error stopping vector index: {e}")
+    
+    if "services.lexical_index" in sys.modules:
+        try:
+            from services.lexical_index import shutdown_lexical_index
+            await shutdown_lexical_index()
+        except Exception as e:
+            logger.warning(f"Error stopping lexical index: {e}")
+    
+    if "services.suggest_index" in sys.modules:
+        try:
+            from services.suggest_index import shutdown_suggest_index
+            await shutdown_suggest_index()
+        except Exception as e:
+            logger.warning(f"Error stopping suggest index: {e}")
+    
+    try:
+        from services.memory_repository import save_memory_snapshot
+        if save_memory_snapshot():
+            logger.info("In-memory catalog snapshot saved")
+    except Exception as e:
+        logger.warning(f"Error saving in-memory catalog snapshot: {e}")
+    
+    # Only if something loaded the Oracle driver; importing it here just to shut down is wasted work
+    if "dal.oracle_client" in sys.modules:
+        try:
+            from dal.oracle_client import close_pool
+            await close_pool()
+            logger.info("Oracle session pool closed")
+        except Exception as e:
+            logger.warning(f"Error closing Oracle session pool: {e}")
+    
+    from services.container import shutdown_container
+    shutdown_container()
 
 app = FastAPI(
     title="Paimon's Codex API", 
     description="Manhwa platform API with AI-powered features",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Content-hash ETags and 304s for routes that declare a Cache-Control policy
+app.add_middleware(ETagMiddleware)
+
+# Added after ETagMiddleware so it wraps it: ETags are computed on the uncompressed body
+app.add_middleware(CompressionMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://localhost:3001"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Mount static files for assets (images, etc.)
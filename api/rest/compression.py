@@ -0,0 +1,191 @@
+import asyncio
+import os
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Already-compressed payloads that aren't worth spending CPU on
+_INCOMPRESSIBLE_PREFIXES = (b"image/", b"video/", b"audio/", b"application/zip", b"application/gzip")
+
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Map each accepted coding to its q-value"""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+def _compressible(headers: Dict[bytes, bytes]) -> bool:
+    """Whether a response with these (lowercased) headers is a candidate for compression"""
+    return b"content-encoding" not in headers and not headers.get(b"content-type", b"").startswith(_INCOMPRESSIBLE_PREFIXES)
+
+def _vary_accept_encoding(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    """Add Accept-Encoding to the response's Vary header, merging into one that is already there"""
+    for index, (name, value) in enumerate(headers):
+        if name.lower() != b"vary":
+            continue
+        tokens = [token.strip().lower() for token in value.split(b",")]
+        if b"*" in tokens or b"accept-encoding" in tokens:
+            return headers
+        return headers[:index] + [(name, value + b", Accept-Encoding")] + headers[index + 1:]
+    return headers + [(b"vary", b"Accept-Encoding")]
+
+class _GzipEncoder:
+    name = b"gzip"
+    
+    def __init__(self, level: int):
+        # wbits=31 writes a gzip header and trailer around the deflate stream
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    
+    def process(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+    
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+    
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+class _BrotliEncoder:
+    name = b"br"
+    
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+    
+    def process(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+    
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+    
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+class CompressionMiddleware:
+    """Brotli/gzip response compression negotiated from Accept-Encoding
+    
+    Brotli is preferred when the `brotli` package is installed and the client accepts it,
+    gzip otherwise. Bodies smaller than `minimum_size`, responses that already carry a
+    Content-Encoding and binary media types are sent as-is. Streaming responses are
+    compressed chunk by chunk. Every response that could have been compressed carries
+    `Vary: Accept-Encoding`, whether or not this one was, so shared caches key on it.
+    """
+    
+    def __init__(
+        self,
+        app,
+        minimum_size: Optional[int] = None,
+        gzip_level: Optional[int] = None,
+        brotli_quality: Optional[int] = None
+    ):
+        self.app = app
+        self.minimum_size = minimum_size if minimum_size is not None else int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+        self.gzip_level = gzip_level if gzip_level is not None else int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+        # Quality 4 keeps brotli close to gzip -6 in CPU while still compressing better
+        self.brotli_quality = brotli_quality if brotli_quality is not None else int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+        # Base64 image payloads take tens of ms to compress; do those off the event loop
+        self.offload_bytes = int(os.getenv("COMPRESSION_OFFLOAD_BYTES", str(256 * 1024)))
+    
+    def _select_encoder(self, scope):
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        if not accept_encoding:
+            return None
+        
+        accepted = _parse_accept_encoding(accept_encoding)
+        if brotli is not None and accepted.get("br", 0) > 0:
+            return _BrotliEncoder(self.brotli_quality)
+        if accepted.get("gzip", accepted.get("*", 0)) > 0:
+            return _GzipEncoder(self.gzip_level)
+        return None
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        encoder = self._select_encoder(scope)
+        if encoder is None:
+            async def send_with_vary(message):
+                if message["type"] == "http.response.start":
+                    headers = message.get("headers", [])
+                    if _compressible({name.lower(): value for name, value in headers}):
+                        message = {**message, "headers": _vary_accept_encoding(list(headers))}
+                await send(message)
+            
+            await self.app(scope, receive, send_with_vary)
+            return
+        
+        start_message: Optional[dict] = None
+        passthrough = False
+        streaming = False
+        
+        def compressed_headers(headers: List[Tuple[bytes, bytes]], content_length: Optional[int]):
+            headers = [(name, value) for name, value in headers if name.lower() != b"content-length"]
+            headers.append((b"content-encoding", encoder.name))
+            if content_length is not None:
+                headers.append((b"content-length", str(content_length).encode("latin-1")))
+            return headers
+        
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough, streaming
+            
+            if passthrough:
+                await send(message)
+                return
+            
+            if message["type"] == "http.response.start":
+                headers = {name.lower(): value for name, value in message.get("headers", [])}
+                if not _compressible(headers):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = {**message, "headers": _vary_accept_encoding(list(message.get("headers", [])))}
+                return
+            
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            
+            if not streaming:
+                if not more_body:
+                    # Whole body in one message: compress it in one go if it's big enough
+                    if len(body) < self.minimum_size:
+                        passthrough = True
+                        await send(start_message)
+                        await send(message)
+                        return
+                    if len(body) >= self.offload_bytes:
+                        compressed = await asyncio.to_thread(lambda: encoder.process(body) + encoder.finish())
+                    else:
+                        compressed = encoder.process(body) + encoder.finish()
+                    await send({**start_message, "headers": compressed_headers(start_message.get("headers", []), len(compressed))})
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                
+                streaming = True
+                await send({**start_message, "headers": compressed_headers(start_message.get("headers", []), None)})
+            
+            chunk = encoder.process(body) + (encoder.flush() if more_body else encoder.finish())
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+        
+        await self.app(scope, receive, send_wrapper)
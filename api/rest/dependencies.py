@@ -0,0 +1,37 @@
+from typing import TYPE_CHECKING
+from fastapi import Request
+from services.container import ServiceContainer
+
+if TYPE_CHECKING:
+    from llm.llama_service import LlamaService
+    from services.manhwa_service import ManhwaService
+    from services.search_service import SearchService
+    from services.image_generation_service import ImageGenerationService
+    from services.manhwa_storage_service import ManhwaStorageService
+    from services.manhwa_import_service import ManhwaImportService
+
+# FastAPI dependencies that hand routers the app-scoped services; each is built on first use
+
+def get_services(request: Request) -> ServiceContainer:
+    return request.app.state.services
+
+def get_manhwa_service(request: Request) -> "ManhwaService":
+    return request.app.state.services.manhwa_service
+
+def get_search_service(request: Request) -> "SearchService":
+    return request.app.state.services.search_service
+
+def get_import_service(request: Request) -> "ManhwaImportService":
+    return request.app.state.services.import_service
+
+def get_minio(request: Request):
+    return request.app.state.services.minio_client
+
+def get_llama_service(request: Request) -> "LlamaService":
+    return request.app.state.services.llama_service
+
+def get_image_service(request: Request) -> "ImageGenerationService":
+    return request.app.state.services.image_service
+
+def get_storage_service(request: Request) -> "ManhwaStorageService":
+    return request.app.state.services.storage_service
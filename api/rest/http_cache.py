@@ -0,0 +1,111 @@
+import hashlib
+from typing import List, Optional
+
+from fastapi import Depends, Response
+
+# Per-route Cache-Control policies for catalog reads
+CATALOG_LIST_POLICY = "public, max-age=30, stale-while-revalidate=120"
+# Detail pages revalidate every time so page views still reach the view counter; 304s keep that cheap
+CATALOG_DETAIL_POLICY = "public, no-cache"
+SIMILAR_POLICY = "public, max-age=300, stale-while-revalidate=600"
+SEARCH_POLICY = "public, max-age=60, stale-while-revalidate=300"
+# Fired on every keystroke; a short max-age absorbs repeat prefixes without hiding new titles for long
+SUGGEST_POLICY = "public, max-age=10, stale-while-revalidate=30"
+
+def cache_control(policy: str):
+    """Route dependency that applies a Cache-Control policy to successful responses"""
+    async def set_cache_control(response: Response):
+        response.headers["Cache-Control"] = policy
+    return Depends(set_cache_control)
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" are equivalent for If-None-Match
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+class ETagMiddleware:
+    """Add content-hash ETags to cacheable GET responses and answer If-None-Match with 304
+    
+    Only 200 responses that carry a Cache-Control header (and not no-store) are hashed,
+    so routes opt in through `cache_control(...)`. Bodies larger than `max_body_bytes`
+    are passed through untouched.
+    """
+    
+    def __init__(self, app, max_body_bytes: int = 1024 * 1024):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        
+        if_none_match = None
+        for name, value in scope["headers"]:
+            if name == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+                break
+        
+        start_message: Optional[dict] = None
+        body_chunks: List[bytes] = []
+        body_size = 0
+        passthrough = False
+        
+        async def send_wrapper(message):
+            nonlocal start_message, body_size, passthrough
+            
+            if passthrough:
+                await send(message)
+                return
+            
+            if message["type"] == "http.response.start":
+                headers = {name.lower(): value for name, value in message.get("headers", [])}
+                cache_control_value = headers.get(b"cache-control", b"")
+                if message["status"] != 200 or not cache_control_value or b"no-store" in cache_control_value or b"etag" in headers:
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+            
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            
+            body_chunks.append(message.get("body", b""))
+            body_size += len(body_chunks[-1])
+            
+            if body_size > self.max_body_bytes:
+                # Too large to buffer; flush what we have and stream the rest
+                passthrough = True
+                await send(start_message)
+                await send({"type": "http.response.body", "body": b"".join(body_chunks), "more_body": message.get("more_body", False)})
+                return
+            
+            if message.get("more_body", False):
+                return
+            
+            body = b"".join(body_chunks)
+            etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            headers = [
+                (name, value) for name, value in start_message.get("headers", [])
+                if name.lower() != b"content-length"
+            ]
+            headers.append((b"etag", etag.encode("latin-1")))
+            
+            if if_none_match and _etag_matches(if_none_match, etag):
+                not_modified_headers = [
+                    (name, value) for name, value in headers
+                    if name.lower() not in (b"content-type", b"content-encoding")
+                ]
+                await send({"type": "http.response.start", "status": 304, "headers": not_modified_headers})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            
+            headers.append((b"content-length", str(len(body)).encode("latin-1")))
+            await send({**start_message, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+        
+        await self.app(scope, receive, send_wrapper)
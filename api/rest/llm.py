@@ -1,17 +1,15 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import logging
 from llm.llama_service import LlamaService
 from services.image_generation_service import ImageGenerationService
 from services.manhwa_storage_service import ManhwaStorageService
+from rest.dependencies import get_llama_service, get_image_service, get_storage_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-llama_service = LlamaService()
-image_service = ImageGenerationService()
-storage_service = ManhwaStorageService()
 
 class GenerateRequest(BaseModel):
     prompt: str
@@ -38,7 +36,7 @@ class ChatResponse(BaseModel):
     model: str = None
 
 @router.get("/models")
-async def get_models():
+async def get_models(llama_service: LlamaService = Depends(get_llama_service)):
     """Get available models from Ollama"""
     try:
         models = await llama_service.get_available_models()
@@ -47,7 +45,7 @@ async def get_models():
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/generate", response_model=GenerateResponse)
-async def generate_text(request: GenerateRequest):
+async def generate_text(request: GenerateRequest, llama_service: LlamaService = Depends(get_llama_service)):
     try:
         result = await llama_service.generate(
             prompt=request.prompt,
@@ -60,7 +58,7 @@ async def generate_text(request: GenerateRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, llama_service: LlamaService = Depends(get_llama_service)):
     """Chat with AI using conversation format"""
     try:
         messages = [{"role": msg.role, "content": msg.content} for msg in request.messages]
@@ -70,7 +68,7 @@ async def chat(request: ChatRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/summarize")
-async def summarize_manhwa(manhwa_id: str):
+async def summarize_manhwa(manhwa_id: str, llama_service: LlamaService = Depends(get_llama_service)):
     return await llama_service.summarize_manhwa(manhwa_id)
 
 class StoryGenerationRequest(BaseModel):
@@ -106,7 +104,7 @@ class ChapterResponse(BaseModel):
     key_dialogue: List[str]
 
 @router.post("/generate-story", response_model=StoryResponse)
-async def generate_manhwa_story(request: StoryGenerationRequest):
+async def generate_manhwa_story(request: StoryGenerationRequest, llama_service: LlamaService = Depends(get_llama_service)):
     """Generate a complete manhwa story outline with chapters"""
     try:
         result = await llama_service.generate_manhwa_story(
@@ -122,7 +120,7 @@ async def generate_manhwa_story(request: StoryGenerationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/generate-chapter", response_model=ChapterResponse)
-async def generate_manhwa_chapter(request: ChapterGenerationRequest):
+async def generate_manhwa_chapter(request: ChapterGenerationRequest, llama_service: LlamaService = Depends(get_llama_service)):
     """Generate detailed content for a specific chapter"""
     try:
         result = await llama_service.generate_manhwa_chapter(
@@ -135,7 +133,7 @@ async def generate_manhwa_chapter(request: ChapterGenerationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/generate-character-sheet")
-async def generate_character_sheet(character_name: str, description: str, art_style: str = "anime style"):
+async def generate_character_sheet(character_name: str, description: str, art_style: str = "anime style", llama_service: LlamaService = Depends(get_llama_service)):
     """Generate consistent character description for art generation"""
     try:
         result = await llama_service.generate_character_sheet(character_name, description, art_style)
@@ -172,7 +170,7 @@ class ImageResponse(BaseModel):
     type: str
 
 @router.get("/art-styles")
-async def get_art_styles():
+async def get_art_styles(image_service: ImageGenerationService = Depends(get_image_service)):
     """Get available art styles for image generation"""
     try:
         styles = image_service.get_style_options()
@@ -181,7 +179,7 @@ async def get_art_styles():
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/generate-character-art", response_model=ImageResponse)
-async def generate_character_art(request: CharacterArtRequest):
+async def generate_character_art(request: CharacterArtRequest, image_service: ImageGenerationService = Depends(get_image_service)):
     """Generate character artwork using Stable Diffusion"""
     try:
         result = await image_service.generate_character_art(
@@ -195,7 +193,7 @@ async def generate_character_art(request: CharacterArtRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/generate-scene-art", response_model=ImageResponse)
-async def generate_scene_art(request: ImageGenerationRequest):
+async def generate_scene_art(request: ImageGenerationRequest, image_service: ImageGenerationService = Depends(get_image_service)):
     """Generate scene artwork for manhwa panels"""
     try:
         result = await image_service.generate_scene_art(
@@ -210,7 +208,7 @@ async def generate_scene_art(request: ImageGenerationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/generate-cover-art", response_model=ImageResponse)
-async def generate_cover_art(request: CoverArtRequest):
+async def generate_cover_art(request: CoverArtRequest, image_service: ImageGenerationService = Depends(get_image_service)):
     """Generate cover artwork for manhwa"""
     try:
         result = await image_service.generate_cover_art(
@@ -224,7 +222,12 @@ async def generate_cover_art(request: CoverArtRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/generate-full-manhwa")
-async def generate_full_manhwa(story_request: StoryGenerationRequest):
+async def generate_full_manhwa(
+    story_request: StoryGenerationRequest,
+    llama_service: LlamaService = Depends(get_llama_service),
+    image_service: ImageGenerationService = Depends(get_image_service),
+    storage_service: ManhwaStorageService = Depends(get_storage_service)
+):
     """Generate complete manhwa with story and art"""
     try:
         # Handle advanced configuration if provided
@@ -408,7 +411,7 @@ async def generate_full_manhwa(story_request: StoryGenerationRequest):
 
 # Manhwa Storage Management Endpoints
 @router.get("/manhwa-list")
-async def get_manhwa_list():
+async def get_manhwa_list(storage_service: ManhwaStorageService = Depends(get_storage_service)):
     """Get list of all stored manhwa"""
     try:
         manhwa_list = await storage_service.get_manhwa_list()
@@ -417,7 +420,7 @@ async def get_manhwa_list():
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/manhwa/{manhwa_id}")
-async def get_manhwa_details(manhwa_id: str):
+async def get_manhwa_details(manhwa_id: str, storage_service: ManhwaStorageService = Depends(get_storage_service)):
     """Get detailed manhwa data including all assets"""
     try:
         manhwa_details = await storage_service.get_manhwa_details(manhwa_id)
@@ -430,7 +433,7 @@ async def get_manhwa_details(manhwa_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/manhwa/{manhwa_id}")
-async def delete_manhwa(manhwa_id: str):
+async def delete_manhwa(manhwa_id: str, storage_service: ManhwaStorageService = Depends(get_storage_service)):
     """Delete manhwa and all its assets"""
     try:
         deleted = await storage_service.delete_manhwa(manhwa_id)
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response, Depends
 from typing import List, Optional
 from pydantic import BaseModel
 from services.manhwa_service import ManhwaService
+from rest.http_cache import cache_control, CATALOG_LIST_POLICY, CATALOG_DETAIL_POLICY, SIMILAR_POLICY
+from rest.dependencies import get_manhwa_service
 
 router = APIRouter()
-manhwa_service = ManhwaService()
 
 class ManhwaResponse(BaseModel):
     id: str
@@ -16,37 +17,50 @@ class ManhwaResponse(BaseModel):
     cover_image: Optional[str] = None
     slug: str
 
-@router.get("/", response_model=List[ManhwaResponse])
-async def get_all_manhwa(skip: int = 0, limit: int = 20):
-    return await manhwa_service.get_all(skip=skip, limit=limit)
+@router.get("/", response_model=List[ManhwaResponse], dependencies=[cache_control(CATALOG_LIST_POLICY)])
+async def get_all_manhwa(response: Response, skip: int = 0, limit: int = 20, cursor: Optional[str] = None, manhwa_service: ManhwaService = Depends(get_manhwa_service)):
+    """List manhwa newest first
+    
+    Every full page carries an `X-Next-Cursor` header; pass it back as `cursor` to fetch the
+    next page by keyset instead of offset. `skip` is ignored when a cursor is given.
+    """
+    try:
+        page = await manhwa_service.get_page(skip=skip, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return page["items"]
 
-@router.get("/{manhwa_id}", response_model=ManhwaResponse)
-async def get_manhwa(manhwa_id: str):
+@router.get("/{manhwa_id}", response_model=ManhwaResponse, dependencies=[cache_control(CATALOG_DETAIL_POLICY)])
+async def get_manhwa(manhwa_id: str, manhwa_service: ManhwaService = Depends(get_manhwa_service)):
     manhwa = await manhwa_service.get_by_id(manhwa_id)
     if not manhwa:
         raise HTTPException(status_code=404, detail="Manhwa not found")
+    manhwa_service.record_view(manhwa_id)
     return manhwa
 
 @router.post("/", response_model=ManhwaResponse)
-async def create_manhwa(manhwa_data: dict):
+async def create_manhwa(manhwa_data: dict, manhwa_service: ManhwaService = Depends(get_manhwa_service)):
     return await manhwa_service.create(manhwa_data)
 
 @router.put("/{manhwa_id}", response_model=ManhwaResponse)
-async def update_manhwa(manhwa_id: str, manhwa_data: dict):
+async def update_manhwa(manhwa_id: str, manhwa_data: dict, manhwa_service: ManhwaService = Depends(get_manhwa_service)):
     manhwa = await manhwa_service.update(manhwa_id, manhwa_data)
     if not manhwa:
         raise HTTPException(status_code=404, detail="Manhwa not found")
     return manhwa
 
 @router.delete("/{manhwa_id}")
-async def delete_manhwa(manhwa_id: str):
+async def delete_manhwa(manhwa_id: str, manhwa_service: ManhwaService = Depends(get_manhwa_service)):
     success = await manhwa_service.delete(manhwa_id)
     if not success:
         raise HTTPException(status_code=404, detail="Manhwa not found")
     return {"message": "Manhwa deleted successfully"}
 
-@router.get("/{manhwa_id}/similar", response_model=List[ManhwaResponse])
-async def get_similar_manhwa(manhwa_id: str, limit: int = 5):
+@router.get("/{manhwa_id}/similar", response_model=List[ManhwaResponse], dependencies=[cache_control(SIMILAR_POLICY)])
+async def get_similar_manhwa(manhwa_id: str, limit: int = 5, manhwa_service: ManhwaService = Depends(get_manhwa_service)):
     """Get manhwa similar to the specified one using vector similarity search"""
     manhwa = await manhwa_service.get_by_id(manhwa_id)
     if not manhwa:
@@ -1,22 +1,23 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Query
+from typing import Dict, Any, Optional
 import logging
 import os
+import sys
 from services.manhwa_import_service import ManhwaImportService
-from services.manhwa_service import ManhwaService
 from services.background_scheduler import get_scheduler
-from dal.minio_client import get_minio_client
+from services.view_counter import get_view_counter
+from services.cache import get_cache
+from services.single_flight import get_single_flight_stats
+from services.search_metrics import get_search_latency
+from services.startup_report import get_startup_report
+from services.container import get_container
+from rest.dependencies import get_import_service, get_minio, get_services
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# Initialize services
-manhwa_service = ManhwaService()
-minio_client = get_minio_client()
-import_service = ManhwaImportService(manhwa_service, minio_client)
-
 @router.post("/import/scan", response_model=Dict[str, Any])
-async def manual_import_scan():
+async def manual_import_scan(import_service: ManhwaImportService = Depends(get_import_service)):
     """Manually trigger a scan and import of generated manhwa"""
     try:
         logger.info("Manual manhwa import triggered")
@@ -33,7 +34,7 @@ async def manual_import_scan():
         raise HTTPException(status_code=500, detail=f"Import failed: {str(e)}")
 
 @router.post("/import/background")
-async def background_import_scan(background_tasks: BackgroundTasks):
+async def background_import_scan(background_tasks: BackgroundTasks, import_service: ManhwaImportService = Depends(get_import_service)):
     """Trigger a background scan and import of generated manhwa"""
     try:
         background_tasks.add_task(import_service.scan_and_import)
@@ -48,7 +49,7 @@ async def background_import_scan(background_tasks: BackgroundTasks):
         raise HTTPException(status_code=500, detail=f"Failed to start background import: {str(e)}")
 
 @router.get("/import/status", response_model=Dict[str, Any])
-async def get_import_status():
+async def get_import_status(import_service: ManhwaImportService = Depends(get_import_service)):
     """Get current import status and statistics"""
     try:
         status = await import_service.get_import_status()
@@ -63,7 +64,7 @@ async def get_import_status():
         raise HTTPException(status_code=500, detail=f"Failed to get status: {str(e)}")
 
 @router.get("/import/files", response_model=Dict[str, Any])
-async def list_import_files():
+async def list_import_files(minio_client=Depends(get_minio)):
     """List files in both generated and imported folders for debugging"""
     try:
         if not minio_client:
@@ -138,8 +139,243 @@ async def trigger_scheduled_import():
         logger.error(f"Failed to trigger scheduled import: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to trigger import: {str(e)}")
 
+@router.get("/db/pool", response_model=Dict[str, Any])
+async def get_db_pool_status():
+    """Get Oracle session pool statistics"""
+    try:
+        return {
+            "status": "success",
+            "data": _pool_stats()
+        }
+    except Exception as e:
+        logger.error(f"Failed to get pool stats: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to get pool stats: {str(e)}")
+
+def _pool_stats() -> Dict[str, Any]:
+    # Not loaded means no pool was ever created (e.g. ORACLE_SKIP, where oracledb may be absent)
+    if "dal.oracle_client" not in sys.modules:
+        return {"initialized": False}
+    from dal.oracle_client import get_pool_stats
+    return get_pool_stats()
+
+@router.get("/startup/report", response_model=Dict[str, Any])
+async def get_startup_status():
+    """Get the cold start breakdown and which services have been initialized since"""
+    container = get_container()
+    return {
+        "status": "success",
+        "data": {
+            **get_startup_report().get_report(),
+            "services_initialized": container.initialized() if container else {}
+        }
+    }
+
+@router.get("/views/status", response_model=Dict[str, Any])
+async def get_view_counter_status():
+    """Get write-behind view counter metrics, including unflushed views"""
+    view_counter = get_view_counter()
+    if view_counter:
+        return {
+            "status": "success",
+            "data": view_counter.get_status()
+        }
+    return {
+        "status": "success",
+        "data": {"running": False, "message": "View counter not initialized"}
+    }
+
+@router.get("/cache/status", response_model=Dict[str, Any])
+async def get_cache_status():
+    """Get catalog read cache statistics"""
+    return {
+        "status": "success",
+        "data": get_cache().get_stats()
+    }
+
+@router.post("/cache/clear", response_model=Dict[str, Any])
+async def clear_cache():
+    """Drop every cached catalog read"""
+    await get_cache().clear()
+    return {
+        "status": "success",
+        "message": "Cache cleared"
+    }
+
+@router.get("/embeddings/status", response_model=Dict[str, Any])
+async def get_embeddings_status():
+    """Get the active embedding model and embedding cache statistics"""
+    # Imported here so the admin router doesn't pull numpy into startup
+    from services.embedding_provider import get_embedding_provider
+    provider = get_embedding_provider()
+    cache = getattr(provider, "cache", None)
+    return {
+        "status": "success",
+        "data": {
+            "model_id": provider.model_id,
+            "dimension": provider.dimension,
+            "cache": cache.get_stats() if cache else {"enabled": False}
+        }
+    }
+
+@router.post("/embeddings/reindex", response_model=Dict[str, Any])
+async def start_reindex(restart: bool = False, services=Depends(get_services)):
+    """Re-embed every manhwa with the current model in the background, resuming from the checkpoint unless `restart`"""
+    from services.reindex_job import get_reindex_job
+    if not services.oracle_client:
+        raise HTTPException(status_code=503, detail="Oracle not available")
+    
+    job = get_reindex_job(services.oracle_client)
+    if not job.start(restart=restart):
+        raise HTTPException(status_code=409, detail="Reindex already running in this or another worker")
+    return {
+        "status": "success",
+        "message": "Reindex started"
+    }
+
+@router.post("/embeddings/reindex/stop", response_model=Dict[str, Any])
+async def stop_reindex():
+    """Stop a running reindex; the next start resumes after the last written batch"""
+    from services.reindex_job import get_reindex_job
+    job = get_reindex_job()
+    stopped = job is not None and await job.stop()
+    return {
+        "status": "success",
+        "message": "Reindex stopped" if stopped else "Reindex not running"
+    }
+
+@router.get("/embeddings/reindex/status", response_model=Dict[str, Any])
+async def get_reindex_status():
+    """Get reindex progress: rows processed, rows/sec and ETA"""
+    from services.reindex_job import get_reindex_job
+    job = get_reindex_job()
+    if job:
+        return {
+            "status": "success",
+            "data": job.get_status()
+        }
+    return {
+        "status": "success",
+        "data": {"state": "idle", "running": False, "message": "No reindex has run since startup"}
+    }
+
+@router.get("/vector-index/status", response_model=Dict[str, Any])
+async def get_vector_index_status():
+    """Get in-process vector index size, warm state and query latency"""
+    from services.vector_index import get_vector_index
+    vector_index = get_vector_index()
+    if vector_index:
+        return {
+            "status": "success",
+            "data": vector_index.get_stats()
+        }
+    return {
+        "status": "success",
+        "data": {"ready": False, "message": "Vector index not enabled"}
+    }
+
+def _vector_index_lifecycle(services):
+    from services.vector_index_lifecycle import get_vector_index_lifecycle
+    if not services.oracle_client:
+        raise HTTPException(status_code=503, detail="Oracle not available")
+    return get_vector_index_lifecycle(services.oracle_client)
+
+@router.get("/oracle-vector-index/status", response_model=Dict[str, Any])
+async def get_oracle_vector_index_status(services=Depends(get_services)):
+    """Get Oracle's manhwa_vector_idx type, status and size, the search accuracy targets and the last rebuild"""
+    lifecycle = _vector_index_lifecycle(services)
+    return {
+        "status": "success",
+        "data": await lifecycle.get_status()
+    }
+
+@router.post("/oracle-vector-index/rebuild", response_model=Dict[str, Any])
+async def rebuild_oracle_vector_index(
+    index_type: str = Query("IVF", description="IVF (neighbor partitions) or HNSW (in-memory neighbor graph)"),
+    accuracy: int = Query(95, ge=1, le=100, description="Default target accuracy the index is built for"),
+    partitions: Optional[int] = Query(None, ge=1, description="IVF: number of neighbor partitions"),
+    neighbors: Optional[int] = Query(None, ge=2, description="HNSW: graph neighbors per vector"),
+    efconstruction: Optional[int] = Query(None, ge=1, description="HNSW: candidate list size while building"),
+    parallel: Optional[int] = Query(None, ge=1, description="Degree of parallelism for the build"),
+    services=Depends(get_services)
+):
+    """Build a replacement vector index in the background and swap it in, e.g. to switch between IVF and HNSW"""
+    lifecycle = _vector_index_lifecycle(services)
+    parameters = {
+        name: value for name, value in
+        (("partitions", partitions), ("neighbors", neighbors), ("efconstruction", efconstruction))
+        if value is not None
+    }
+    try:
+        started = lifecycle.start_rebuild(index_type, accuracy, parameters, parallel=parallel)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not started:
+        raise HTTPException(status_code=409, detail="Vector index rebuild already running")
+    return {
+        "status": "success",
+        "message": f"Vector index rebuild as {index_type.upper()} started"
+    }
+
+@router.post("/oracle-vector-index/accuracy", response_model=Dict[str, Any])
+async def set_oracle_vector_search_accuracy(
+    similar: Optional[int] = Query(None, ge=1, le=100, description="Target accuracy of unfiltered searches; 100 is exact"),
+    hybrid: Optional[int] = Query(None, ge=1, le=100, description="Target accuracy of genre/status filtered searches; 100 is exact")
+):
+    """Set the target accuracy of approximate vector searches for this worker process"""
+    from dal.oracle_client import get_vector_search_accuracy, set_vector_search_accuracy
+    for kind, value in (("similar", similar), ("hybrid", hybrid)):
+        if value is not None:
+            set_vector_search_accuracy(kind, value)
+    return {
+        "status": "success",
+        "data": get_vector_search_accuracy()
+    }
+
+@router.post("/oracle-vector-index/recall", response_model=Dict[str, Any])
+async def measure_oracle_vector_index_recall(
+    accuracy: int = Query(95, ge=1, le=99, description="Target accuracy to measure"),
+    k: int = Query(10, ge=1, le=100),
+    samples: int = Query(50, ge=1, le=1000, description="Stored manhwa vectors to use as queries"),
+    genre: Optional[str] = Query(None, description="Measure filtered (hybrid) searches for this genre"),
+    services=Depends(get_services)
+):
+    """Measure recall@k and latency of approximate searches at `accuracy` against exact searches"""
+    lifecycle = _vector_index_lifecycle(services)
+    return {
+        "status": "success",
+        "data": await lifecycle.measure_recall(accuracy, k=k, samples=samples, genre=genre)
+    }
+
+@router.get("/search/stats", response_model=Dict[str, Any])
+async def get_search_stats():
+    """Get per-stage search latency (embed, vector, lexical, fusion, total, batch.*) and lexical/suggest index state"""
+    from services.lexical_index import get_lexical_index
+    from services.suggest_index import get_suggest_index
+    lexical_index = get_lexical_index()
+    suggest_index = get_suggest_index()
+    return {
+        "status": "success",
+        "data": {
+            "stages": get_search_latency().get_stats(),
+            "lexical_index": lexical_index.get_stats() if lexical_index else {"ready": False, "message": "Lexical index not enabled"},
+            "suggest_index": suggest_index.get_stats() if suggest_index else {"ready": False, "message": "Suggest index not enabled"}
+        }
+    }
+
+@router.get("/coalescing/status", response_model=Dict[str, Any])
+async def get_coalescing_status():
+    """Get how many concurrent identical reads each single-flight group collapsed"""
+    return {
+        "status": "success",
+        "data": get_single_flight_stats()
+    }
+
 @router.get("/import/health")
-async def import_health_check():
+async def import_health_check(
+    import_service: ManhwaImportService = Depends(get_import_service),
+    minio_client=Depends(get_minio),
+    services=Depends(get_services)
+):
     """Health check for the import service"""
     try:
         scheduler = get_scheduler()
@@ -147,7 +383,7 @@ async def import_health_check():
         # Basic health checks
         checks = {
             "minio_available": minio_client is not None,
-            "manhwa_service_available": manhwa_service is not None,
+            "manhwa_service_available": services.manhwa_service is not None,
             "import_service_available": import_service is not None,
             "scheduler_available": scheduler is not None,
             "scheduler_running": scheduler.running if scheduler else False
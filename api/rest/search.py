@@ -1,26 +1,80 @@
-from fastapi import APIRouter, Query
-from typing import List, Optional
-from pydantic import BaseModel
+from fastapi import APIRouter, Query, Depends, HTTPException, Response
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
 from services.search_service import SearchService
+from rest.http_cache import cache_control, SEARCH_POLICY, SIMILAR_POLICY, SUGGEST_POLICY
+from rest.dependencies import get_search_service
 
 router = APIRouter()
-search_service = SearchService()
 
 class SearchResult(BaseModel):
     id: str
     title: str
     author: str
     genre: List[str]
+    # Higher is better: cosine similarity, or the RRF score when keyword results are fused in
     relevance_score: float
+    # Cosine distance from the query (lower is closer); None for keyword-only matches
+    similarity_score: Optional[float] = None
+    # Set when vector and keyword rankings were fused
+    rrf_score: Optional[float] = None
     snippet: str
 
-@router.get("/", response_model=List[SearchResult])
+@router.get("/", response_model=List[SearchResult], dependencies=[cache_control(SEARCH_POLICY)])
 async def search_manhwa(
     q: str = Query(..., description="Search query"),
-    limit: int = Query(10, le=50, description="Number of results to return")
+    limit: int = Query(10, le=50, description="Number of results to return"),
+    genre: Optional[str] = Query(None, description="Only manhwa with this genre"),
+    status: Optional[str] = Query(None, description="Only manhwa with this status"),
+    search_service: SearchService = Depends(get_search_service)
 ):
-    return await search_service.search(query=q, limit=limit)
+    return await search_service.search(query=q, limit=limit, genre=genre, status=status)
 
-@router.get("/similar/{manhwa_id}", response_model=List[SearchResult])
-async def find_similar(manhwa_id: str, limit: int = Query(5, le=20)):
+class BatchSearchItem(BaseModel):
+    id: str = Field(..., description="Key for this item's results in the response")
+    q: Optional[str] = Field(None, description="Search query")
+    similar_to: Optional[str] = Field(None, description="Manhwa id to find similar manhwa for")
+    limit: int = Field(10, ge=1, le=50)
+    genre: Optional[str] = None
+    status: Optional[str] = None
+
+class BatchSearchRequest(BaseModel):
+    searches: List[BatchSearchItem] = Field(..., min_length=1, max_length=20)
+
+@router.post("/batch", response_model=Dict[str, List[SearchResult]])
+async def search_batch(body: BatchSearchRequest, search_service: SearchService = Depends(get_search_service)):
+    """Several searches and similar-to lookups in one request, results keyed by item id"""
+    if len({item.id for item in body.searches}) != len(body.searches):
+        raise HTTPException(status_code=400, detail="Search ids must be unique")
+    for item in body.searches:
+        if (item.q is None) == (item.similar_to is None):
+            raise HTTPException(status_code=400, detail=f"Search {item.id!r} needs exactly one of q or similar_to")
+    
+    results = await search_service.search_batch([
+        {"query": item.q, "similar_to": item.similar_to, "limit": item.limit, "genre": item.genre, "status": item.status}
+        for item in body.searches
+    ])
+    return {item.id: item_results for item, item_results in zip(body.searches, results)}
+
+class Suggestion(BaseModel):
+    text: str
+    type: str
+    id: Optional[str] = None
+    score: float
+
+@router.get("/suggest", response_model=List[Suggestion], dependencies=[cache_control(SUGGEST_POLICY)])
+async def suggest(
+    response: Response,
+    q: str = Query(..., max_length=100, description="What has been typed so far"),
+    limit: int = Query(8, ge=1, le=20, description="Number of suggestions to return"),
+    search_service: SearchService = Depends(get_search_service)
+):
+    suggestions = search_service.suggest(prefix=q, limit=limit)
+    if not search_service.suggest_ready():
+        # Empty only because the index is warming or disabled; don't let caches keep that answer
+        response.headers["Cache-Control"] = "no-store"
+    return suggestions
+
+@router.get("/similar/{manhwa_id}", response_model=List[SearchResult], dependencies=[cache_control(SIMILAR_POLICY)])
+async def find_similar(manhwa_id: str, limit: int = Query(5, le=20), search_service: SearchService = Depends(get_search_service)):
     return await search_service.find_similar(manhwa_id=manhwa_id, limit=limit)
\ No newline at end of file
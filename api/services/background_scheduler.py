@@ -1,7 +1,7 @@
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 import os
 
 logger = logging.getLogger(__name__)
@@ -9,8 +9,9 @@ logger = logging.getLogger(__name__)
 class BackgroundScheduler:
     """Background task scheduler for periodic manhwa imports and other tasks"""
     
-    def __init__(self, import_service=None):
-        self.import_service = import_service
+    def __init__(self, import_service=None, import_service_provider: Optional[Callable[[], Any]] = None):
+        self._import_service = import_service
+        self._import_service_provider = import_service_provider
         self.running = False
         self.tasks = {}
         
@@ -20,6 +21,13 @@ class BackgroundScheduler:
         
         logger.info(f"BackgroundScheduler initialized - Auto import: {self.auto_import_enabled}, Interval: {self.import_interval_minutes}m")
     
+    @property
+    def import_service(self):
+        # Built on first use so MinIO and Oracle aren't touched until an import actually runs
+        if self._import_service is None and self._import_service_provider is not None:
+            self._import_service = self._import_service_provider()
+        return self._import_service
+    
     async def start(self):
         """Start the background scheduler"""
         if self.running:
@@ -30,7 +38,7 @@ class BackgroundScheduler:
         logger.info("Starting background scheduler")
         
         # Start periodic import task if enabled
-        if self.auto_import_enabled and self.import_service:
+        if self.auto_import_enabled and (self._import_service or self._import_service_provider):
             self.tasks["import"] = asyncio.create_task(self._periodic_import())
         
         # Add more scheduled tasks here as needed
@@ -145,12 +153,12 @@ def get_scheduler() -> Optional[BackgroundScheduler]:
     """Get the global scheduler instance"""
     return _scheduler
 
-async def initialize_scheduler(import_service=None):
+async def initialize_scheduler(import_service=None, import_service_provider: Optional[Callable[[], Any]] = None):
     """Initialize the global background scheduler"""
     global _scheduler
     
     if _scheduler is None:
-        _scheduler = BackgroundScheduler(import_service)
+        _scheduler = BackgroundScheduler(import_service, import_service_provider)
         await _scheduler.start()
         logger.info("Global background scheduler initialized")
     else:
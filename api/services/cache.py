@@ -0,0 +1,197 @@
+import copy
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Stored in place of a value to remember that a lookup found nothing
+NEGATIVE_ENTRY = {"__missing__": True}
+
+class MemoryCache:
+    """In-process cache with per-entry TTL and size-bounded LRU eviction
+    
+    Values are copied in and out, so a caller mutating what it got (or what it stored)
+    can't change what the next caller sees, the same as with RedisCache.
+    """
+    
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        # Counters live outside the LRU so eviction can never reset them
+        self._counters: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        expires_at, value = entry
+        if expires_at and expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(value)
+    
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl if ttl else 0, copy.deepcopy(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+    
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+    
+    async def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+    
+    async def clear(self) -> None:
+        self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+class RedisCache:
+    """Shared cache on a Redis-compatible server, so every API worker sees the same entries"""
+    
+    def __init__(self, url: str, namespace: str = "paimons"):
+        import redis.asyncio as redis
+        
+        self.url = url
+        self.namespace = namespace
+        self.client = redis.from_url(url)
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+    
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+    
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = await self.client.get(self._key(key))
+        except Exception as e:
+            # Treat an unreachable cache as a miss rather than failing the request
+            self.errors += 1
+            logger.warning(f"Cache get failed for {key}: {e}")
+            return None
+        
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw, object_hook=_decode_datetimes)
+    
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        try:
+            payload = json.dumps(value, default=_encode_datetime)
+            await self.client.set(self._key(key), payload, px=int(ttl * 1000) if ttl else None)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache set failed for {key}: {e}")
+    
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            await self.client.delete(*[self._key(key) for key in keys])
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache delete failed for {keys}: {e}")
+    
+    async def incr(self, key: str) -> int:
+        try:
+            return await self.client.incr(self._key(key))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache incr failed for {key}: {e}")
+            return int(time.time() * 1000)
+    
+    async def get_counter(self, key: str) -> int:
+        try:
+            return int(await self.client.get(self._key(key)) or 0)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache counter read failed for {key}: {e}")
+            # An unknown generation never matches cached keys, so this degrades to a miss
+            return -int(time.time() * 1000)
+    
+    async def clear(self) -> None:
+        try:
+            async for key in self.client.scan_iter(match=self._key("*")):
+                await self.client.delete(key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache clear failed: {e}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "redis",
+            "url": self.url.split("@")[-1],
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors
+        }
+
+def _encode_datetime(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _decode_datetimes(obj: Dict[str, Any]) -> Any:
+    if "__datetime__" in obj and len(obj) == 1:
+        return datetime.fromisoformat(obj["__datetime__"])
+    return obj
+
+def cache_ttl() -> float:
+    return float(os.getenv("CACHE_TTL_SECONDS", "60"))
+
+def negative_cache_ttl() -> float:
+    return float(os.getenv("CACHE_NEGATIVE_TTL_SECONDS", "15"))
+
+def cache_enabled() -> bool:
+    return os.getenv("CACHE_ENABLED", "true").lower() == "true"
+
+# Global cache instance
+_cache = None
+
+def get_cache():
+    """Get the global cache, shared via Redis when CACHE_REDIS_URL is set, in-process otherwise"""
+    global _cache
+    
+    if _cache is None:
+        redis_url = os.getenv("CACHE_REDIS_URL")
+        if redis_url:
+            try:
+                _cache = RedisCache(redis_url)
+                logger.info(f"Using shared Redis cache at {redis_url.split('@')[-1]}")
+            except Exception as e:
+                logger.warning(f"Redis cache unavailable, falling back to in-memory cache: {e}")
+        if _cache is None:
+            _cache = MemoryCache(max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "10000")))
+    
+    return _cache
@@ -0,0 +1,117 @@
+import logging
+import os
+from typing import Any, Callable, Dict, Optional
+
+from services.startup_report import get_startup_report
+
+logger = logging.getLogger(__name__)
+
+class ServiceContainer:
+    """App-scoped services, built on first use and shared by every router
+    
+    One OracleClient (and so one Instant Client init and one session pool) and one
+    MinIO client back every service, instead of each router building its own at import.
+    Nothing is constructed until something asks for it, so a cold start only pays for
+    what the first request needs; each init is timed into the startup report.
+    """
+    
+    def __init__(self):
+        self._instances: Dict[str, Any] = {}
+    
+    def _resolve(self, name: str, factory: Callable[[], Any]) -> Any:
+        if name not in self._instances:
+            with get_startup_report().measure(name, "init"):
+                self._instances[name] = factory()
+        return self._instances[name]
+    
+    @property
+    def oracle_client(self):
+        return self._resolve("oracle_client", self._create_oracle_client)
+    
+    @property
+    def minio_client(self):
+        def create():
+            from dal.minio_client import get_minio_client
+            return get_minio_client()
+        return self._resolve("minio_client", create)
+    
+    @property
+    def manhwa_service(self):
+        def create():
+            from services.manhwa_service import ManhwaService
+            return ManhwaService(oracle_client=self.oracle_client)
+        return self._resolve("manhwa_service", create)
+    
+    @property
+    def search_service(self):
+        def create():
+            from services.search_service import SearchService
+            return SearchService(oracle_client=self.oracle_client)
+        return self._resolve("search_service", create)
+    
+    @property
+    def import_service(self):
+        def create():
+            from services.manhwa_import_service import ManhwaImportService
+            return ManhwaImportService(self.manhwa_service, self.minio_client)
+        return self._resolve("import_service", create)
+    
+    @property
+    def llama_service(self):
+        def create():
+            from llm.llama_service import LlamaService
+            return LlamaService()
+        return self._resolve("llama_service", create)
+    
+    @property
+    def image_service(self):
+        def create():
+            from services.image_generation_service import ImageGenerationService
+            return ImageGenerationService()
+        return self._resolve("image_service", create)
+    
+    @property
+    def storage_service(self):
+        def create():
+            from services.manhwa_storage_service import ManhwaStorageService
+            return ManhwaStorageService()
+        return self._resolve("storage_service", create)
+    
+    def initialized(self) -> Dict[str, bool]:
+        """Which services have been built so far"""
+        names = ["oracle_client", "minio_client", "manhwa_service", "search_service",
+                 "import_service", "llama_service", "image_service", "storage_service"]
+        return {name: name in self._instances for name in names}
+    
+    @staticmethod
+    def _create_oracle_client():
+        if os.getenv('ORACLE_SKIP'):
+            return None
+        try:
+            from dal.oracle_client import OracleClient
+            return OracleClient()
+        except Exception as e:
+            logger.warning(f"Oracle initialization failed, services will use in-memory fallback: {e}")
+            return None
+
+# Global container instance, also stored on app.state for request dependencies
+_container: Optional[ServiceContainer] = None
+
+def get_container() -> Optional[ServiceContainer]:
+    """Get the global service container"""
+    return _container
+
+def initialize_container() -> ServiceContainer:
+    """Create the global service container once"""
+    global _container
+    
+    if _container is None:
+        _container = ServiceContainer()
+    else:
+        logger.warning("Service container already initialized")
+    return _container
+
+def shutdown_container():
+    """Drop the global service container"""
+    global _container
+    _container = None
@@ -0,0 +1,166 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+def normalize_text(text: str, fold_case: bool = False) -> str:
+    """Fold the differences that don't change meaning: Unicode forms and whitespace, plus case if `fold_case`
+    
+    Case is only folded for models that lowercase their input themselves; for the rest
+    "Apple" and "apple" embed differently and must not share a cache entry.
+    """
+    text = " ".join(unicodedata.normalize("NFKC", text or "").split())
+    return text.lower() if fold_case else text
+
+def embedding_key(model_id: str, text: str, fold_case: bool = False) -> str:
+    """Cache key for `text` under `model_id`; a new model never reads another model's vectors"""
+    digest = hashlib.blake2b(normalize_text(text, fold_case).encode("utf-8"), digest_size=16).hexdigest()
+    return f"{model_id}:{digest}"
+
+class EmbeddingCache:
+    """Embeddings keyed by model id plus normalized-text hash
+    
+    An in-process LRU serves repeat queries; the optional SQLite store at `path` keeps
+    vectors across restarts so a redeploy doesn't start cold. Vectors are stored as
+    float32 blobs. Callers run on worker threads (see CachingEmbeddingProvider), so
+    every access goes through one lock.
+    """
+    
+    def __init__(self, max_entries: int = 10000, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.path = path
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+        
+        if path:
+            try:
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding disk cache unavailable at {path}, using memory only: {e}")
+                self._db = None
+    
+    def get_many(self, keys: Sequence[str], memory_only: bool = False) -> List[Optional[List[float]]]:
+        """Look up each key, memory first, then disk; None where it's not cached"""
+        with self._lock:
+            found: List[Optional[List[float]]] = []
+            disk_keys = []
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                else:
+                    disk_keys.append(key)
+                found.append(vector)
+            
+            if memory_only or not disk_keys:
+                return found
+            
+            from_disk = self._read_disk(disk_keys)
+            for index, key in enumerate(keys):
+                if found[index] is not None:
+                    continue
+                vector = from_disk.get(key)
+                if vector is None:
+                    self.misses += 1
+                    continue
+                self.disk_hits += 1
+                found[index] = vector
+                self._remember(key, vector)
+            return found
+    
+    def put_many(self, items: Dict[str, List[float]]) -> None:
+        if not items:
+            return
+        with self._lock:
+            for key, vector in items.items():
+                self._remember(key, vector)
+            self._write_disk(items)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def _remember(self, key: str, vector: List[float]) -> None:
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def _read_disk(self, keys: List[str]) -> Dict[str, List[float]]:
+        if self._db is None:
+            return {}
+        try:
+            # Stay under SQLite's bound-parameter limit
+            found = {}
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array('f', blob).tolist()
+            return found
+        except sqlite3.Error as e:
+            # A broken disk store degrades to misses; the embedding is just recomputed
+            self.errors += 1
+            logger.warning(f"Embedding disk cache read failed: {e}")
+            return {}
+    
+    def _write_disk(self, items: Dict[str, List[float]]) -> None:
+        if self._db is None:
+            return
+        try:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, array('f', vector).tobytes()) for key, vector in items.items()]
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning(f"Embedding disk cache write failed: {e}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        stats = {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "disk_path": self.path if self._db is not None else None
+        }
+        if self._db is not None:
+            try:
+                with self._lock:
+                    stats["disk_entries"] = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            except sqlite3.Error:
+                stats["disk_entries"] = None
+        return stats
+
+def embedding_cache_enabled() -> bool:
+    return os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+
+def create_embedding_cache() -> EmbeddingCache:
+    return EmbeddingCache(
+        max_entries=int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "10000")),
+        path=os.getenv("EMBEDDING_CACHE_PATH") or None
+    )
@@ -0,0 +1,304 @@
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import zlib
+from abc import ABC, abstractmethod
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Must match the manhwa.embedding VECTOR(384, FLOAT32) column
+VECTOR_DIMENSION = 384
+
+_WORD_RE = re.compile(r"\w+")
+
+def manhwa_text(title: str, description: str, genres: Sequence[str]) -> str:
+    """Text a manhwa is embedded from; the title is repeated so it outweighs a long description"""
+    return f"{title}. {title}. {description or ''} {' '.join(genres or [])}"
+
+class EmbeddingProvider(ABC):
+    """Turns text into fixed-size, L2-normalized vectors for Oracle vector search"""
+    
+    model_id: str
+    dimension: int
+    # False when the model lowercases its input, so texts differing only in case embed the same
+    case_sensitive: bool = True
+    
+    @abstractmethod
+    def encode(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed a batch of texts, one vector per text"""
+    
+    def encode_one(self, text: str) -> List[float]:
+        return self.encode([text])[0]
+    
+    async def encode_async(self, texts: Sequence[str]) -> List[List[float]]:
+        """`encode` on a worker thread, so model inference doesn't stall the event loop"""
+        return await asyncio.to_thread(self.encode, texts)
+    
+    def encode_manhwa(self, title: str, description: str, genres: Sequence[str]) -> List[float]:
+        return self.encode_one(manhwa_text(title, description, genres))
+
+@lru_cache(maxsize=1 << 16)
+def _hash_feature(feature: str, dimension: int) -> Tuple[int, float]:
+    # crc32 is stable across processes (unlike hash()), so stored vectors stay comparable
+    h = zlib.crc32(feature.encode("utf-8"))
+    return h % dimension, (1.0 if h & 0x80000000 else -1.0)
+
+@lru_cache(maxsize=1 << 16)
+def _word_features(word: str, dimension: int, ngram_range: Tuple[int, int],
+                   word_weight: float, char_weight: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Signed bucket contributions of one word: the word itself plus its character n-grams
+    
+    Vocabulary is small next to corpus size, so caching per word turns most of the
+    hashing work into a lookup.
+    """
+    buckets, values = [], []
+    bucket, sign = _hash_feature("w:" + word, dimension)
+    buckets.append(bucket)
+    values.append(sign * word_weight)
+    
+    padded = f" {word} "
+    for n in range(ngram_range[0], ngram_range[1] + 1):
+        for i in range(len(padded) - n + 1):
+            bucket, sign = _hash_feature("c:" + padded[i:i + n], dimension)
+            buckets.append(bucket)
+            values.append(sign * char_weight)
+    
+    return np.asarray(buckets, dtype=np.int64), np.asarray(values, dtype=np.float64)
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """CPU-only feature-hashed vectorizer over words, word bigrams and character n-grams
+    
+    Character n-grams make "regression" and "regressor" or "hunter" and "hunters" land
+    close together; words and bigrams carry exact-term matches. Each feature is hashed
+    into one of `dimension` signed buckets, weighted by sublinear term frequency, and the
+    vector is L2-normalized, so cosine distance behaves like a lightweight TF similarity.
+    No model files or network access are needed.
+    """
+    
+    def __init__(self, dimension: int = VECTOR_DIMENSION, ngram_range: Tuple[int, int] = (3, 5),
+                 word_weight: float = 1.0, bigram_weight: float = 0.5, char_weight: float = 0.35):
+        self.dimension = dimension
+        self.ngram_range = ngram_range
+        self.word_weight = word_weight
+        self.bigram_weight = bigram_weight
+        self.char_weight = char_weight
+        self.model_id = f"hashing-v1-{dimension}-c{ngram_range[0]}{ngram_range[1]}"
+        # encode() lowercases every text
+        self.case_sensitive = False
+    
+    def encode(self, texts: Sequence[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        
+        index_parts: List[np.ndarray] = []
+        value_parts: List[np.ndarray] = []
+        bigram_indexes: List[int] = []
+        bigram_values: List[float] = []
+        
+        # Flatten every document into (row * dimension + bucket, value) pairs and
+        # accumulate the whole batch with a single bincount
+        for row, text in enumerate(texts):
+            offset = row * self.dimension
+            words = _WORD_RE.findall(text.lower())
+            
+            for word, count in Counter(words).items():
+                buckets, values = _word_features(word, self.dimension, self.ngram_range, self.word_weight, self.char_weight)
+                index_parts.append(buckets + offset)
+                value_parts.append(values * (1.0 + math.log(count)))
+            
+            for (first, second), count in Counter(zip(words, words[1:])).items():
+                bucket, sign = _hash_feature(f"b:{first} {second}", self.dimension)
+                bigram_indexes.append(offset + bucket)
+                bigram_values.append(sign * self.bigram_weight * (1.0 + math.log(count)))
+        
+        index_parts.append(np.asarray(bigram_indexes, dtype=np.int64))
+        value_parts.append(np.asarray(bigram_values, dtype=np.float64))
+        
+        matrix = np.bincount(
+            np.concatenate(index_parts),
+            weights=np.concatenate(value_parts),
+            minlength=len(texts) * self.dimension
+        ).reshape(len(texts), self.dimension)
+        
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (matrix / norms).astype(np.float32).tolist()
+
+def _model_digest(model_path: str) -> str:
+    """Short content hash of an ONNX export's model and tokenizer files"""
+    digest = hashlib.blake2b(digest_size=8)
+    for name in ("model.onnx", "tokenizer.json"):
+        with open(os.path.join(model_path, name), "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+def _tokenizer_lowercases(tokenizer_path: str) -> bool:
+    """Whether a Hugging Face tokenizer.json lowercases text before tokenizing (uncased models)"""
+    try:
+        with open(tokenizer_path, encoding="utf-8") as f:
+            normalizer = json.load(f).get("normalizer")
+    except (OSError, ValueError):
+        return False
+    
+    pending = [normalizer]
+    while pending:
+        node = pending.pop()
+        if not isinstance(node, dict):
+            continue
+        if node.get("type") == "Lowercase" or node.get("lowercase") is True:
+            return True
+        pending.extend(node.get("normalizers") or [])
+    return False
+
+class OnnxEmbeddingProvider(EmbeddingProvider):
+    """Sentence-transformer exported to ONNX (e.g. all-MiniLM-L6-v2), run on CPU
+    
+    `model_path` is a directory holding `model.onnx` and the matching `tokenizer.json`.
+    Token embeddings are mean-pooled over the attention mask and L2-normalized, the
+    same as sentence-transformers does. Needs the optional `onnxruntime` and `tokenizers`.
+    """
+    
+    def __init__(self, model_path: str, batch_size: int = 32, max_length: int = 256):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+        
+        self.batch_size = batch_size
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_path, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+        
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = int(os.getenv("EMBEDDING_THREADS", "0"))
+        self.session = ort.InferenceSession(
+            os.path.join(model_path, "model.onnx"), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+        self.dimension = self.session.get_outputs()[0].shape[-1]
+        # The directory name alone would let two different exports saved as model.onnx share
+        # cache entries and reindex checkpoints; the content hash tells them apart
+        self.model_id = f"onnx:{os.path.basename(os.path.normpath(model_path))}:{_model_digest(model_path)}"
+        self.case_sensitive = not _tokenizer_lowercases(os.path.join(model_path, "tokenizer.json"))
+    
+    def encode(self, texts: Sequence[str]) -> List[List[float]]:
+        vectors: List[List[float]] = []
+        for start in range(0, len(texts), self.batch_size):
+            vectors.extend(self._encode_batch(texts[start:start + self.batch_size]))
+        return vectors
+    
+    def _encode_batch(self, texts: Sequence[str]) -> List[List[float]]:
+        encodings = self.tokenizer.encode_batch(list(texts))
+        inputs = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        token_embeddings = self.session.run(None, {k: v for k, v in inputs.items() if k in self.input_names})[0]
+        
+        mask = inputs["attention_mask"][:, :, None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.astype(np.float32).tolist()
+
+class CachingEmbeddingProvider(EmbeddingProvider):
+    """Wraps a provider with an EmbeddingCache so repeated texts are embedded once
+    
+    Only cache misses reach the wrapped provider, deduplicated and in one batch.
+    `encode_async` answers from the in-memory LRU on the event loop and goes to a
+    worker thread only when something has to be read from disk or computed.
+    """
+    
+    def __init__(self, inner: EmbeddingProvider, cache):
+        self.inner = inner
+        self.cache = cache
+        self.model_id = inner.model_id
+        self.dimension = inner.dimension
+        self.case_sensitive = inner.case_sensitive
+    
+    def encode(self, texts: Sequence[str]) -> List[List[float]]:
+        from services.embedding_cache import embedding_key
+        
+        keys = [embedding_key(self.model_id, text, fold_case=not self.case_sensitive) for text in texts]
+        return self._fill(texts, keys, [None] * len(keys))
+    
+    async def encode_async(self, texts: Sequence[str]) -> List[List[float]]:
+        from services.embedding_cache import embedding_key
+        
+        keys = [embedding_key(self.model_id, text, fold_case=not self.case_sensitive) for text in texts]
+        found = self.cache.get_many(keys, memory_only=True)
+        if all(vector is not None for vector in found):
+            return found
+        return await asyncio.to_thread(self._fill, texts, keys, found)
+    
+    def _fill(self, texts: Sequence[str], keys: List[str], found: List[Optional[List[float]]]) -> List[List[float]]:
+        """Complete `found` from the cache, then the wrapped provider"""
+        missing = [index for index, vector in enumerate(found) if vector is None]
+        if not missing:
+            return found
+        
+        for index, vector in zip(missing, self.cache.get_many([keys[index] for index in missing])):
+            found[index] = vector
+        
+        # Texts that normalize to the same key are embedded once
+        pending: Dict[str, str] = {}
+        for index, vector in enumerate(found):
+            if vector is None:
+                pending.setdefault(keys[index], texts[index])
+        if pending:
+            computed = dict(zip(pending, self.inner.encode(list(pending.values()))))
+            self.cache.put_many(computed)
+            found = [vector if vector is not None else computed[keys[index]] for index, vector in enumerate(found)]
+        
+        return found
+
+def create_embedding_provider(name: Optional[str] = None) -> EmbeddingProvider:
+    """Build the provider named by `name` (or EMBEDDING_PROVIDER) and check its dimension"""
+    name = (name or os.getenv("EMBEDDING_PROVIDER", "hashing")).lower()
+    
+    if name == "onnx":
+        model_path = os.getenv("EMBEDDING_MODEL_PATH", "")
+        provider: EmbeddingProvider = OnnxEmbeddingProvider(
+            model_path, batch_size=int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+        )
+    elif name == "hashing":
+        provider = HashingEmbeddingProvider()
+    else:
+        raise ValueError(f"Unknown embedding provider: {name}")
+    
+    if provider.dimension != VECTOR_DIMENSION:
+        raise ValueError(
+            f"Embedding provider {provider.model_id} produces {provider.dimension}-dim vectors, "
+            f"but manhwa.embedding is VECTOR({VECTOR_DIMENSION})"
+        )
+    return provider
+
+# Global provider, shared so model weights are loaded once per process
+_provider: Optional[EmbeddingProvider] = None
+
+def get_embedding_provider() -> EmbeddingProvider:
+    """Get the global embedding provider, falling back to the hashing vectorizer if the configured one can't load"""
+    global _provider
+    
+    if _provider is None:
+        try:
+            _provider = create_embedding_provider()
+        except Exception as e:
+            # A different model means a different vector space; stored embeddings need a reindex
+            logger.error(f"Embedding provider unavailable, using hashing vectorizer (reindex if this persists): {e}")
+            _provider = HashingEmbeddingProvider()
+        
+        from services.embedding_cache import create_embedding_cache, embedding_cache_enabled
+        if embedding_cache_enabled():
+            _provider = CachingEmbeddingProvider(_provider, create_embedding_cache())
+        logger.info(f"Embedding provider: {_provider.model_id}")
+    
+    return _provider
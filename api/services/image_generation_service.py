@@ -4,7 +4,6 @@ import base64
 from typing import Dict, Any, List, Optional, Tuple
 import logging
 import asyncio
-from PIL import Image, ImageDraw, ImageFont
 from .sd_client import get_sd_client
 # Import shared prompt builder (fallback if not available)
 try:
@@ -32,6 +31,8 @@ class ImageGenerationService:
     # ----------------------------- Utilities ---------------------------------
     def _create_placeholder_image(self, width: int, height: int, text: str) -> str:
         try:
+            # Pillow is only needed for this fallback path, so keep it off the import path
+            from PIL import Image, ImageDraw, ImageFont
             img = Image.new('RGB', (width, height), color='lightgray')
             draw = ImageDraw.Draw(img)
             try:
@@ -0,0 +1,49 @@
+import asyncio
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class IndexRefresher:
+    """Warms an in-process catalog index at startup and rebuilds it periodically
+    
+    `index` is anything with `async warm(oracle_client)` and a `ready` flag. Writes
+    through this worker's ManhwaService update the index immediately; the periodic
+    rebuild picks up writes made by other workers, seed scripts and imports.
+    """
+    
+    def __init__(self, name: str, index, oracle_client, refresh_interval_seconds: float = 300):
+        self.name = name
+        self.index = index
+        self.oracle_client = oracle_client
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.failed_refreshes = 0
+        self._task: Optional[asyncio.Task] = None
+    
+    async def start(self) -> None:
+        # Warm in the background so startup isn't held up; readers fall back to Oracle until it's ready
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.index.warm(self.oracle_client)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed_refreshes += 1
+                logger.error(f"{self.name} index refresh failed: {e}")
+            
+            if self.refresh_interval_seconds <= 0 and self.index.ready:
+                return
+            # Retry a failed first warm sooner than a routine refresh
+            await asyncio.sleep(self.refresh_interval_seconds if self.index.ready else 30)
@@ -0,0 +1,201 @@
+import heapq
+import logging
+import math
+import os
+import re
+import time
+import unicodedata
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from services.index_refresher import IndexRefresher
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Row fields kept for each document so keyword hits don't need an Oracle read
+RESULT_FIELDS = ("id", "title", "author", "genre", "status", "description", "cover_image", "rating", "view_count")
+
+# A title or author match says more about a manhwa than the same word in its description
+FIELD_WEIGHTS = {"title": 3.0, "author": 2.0, "description": 1.0}
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(unicodedata.normalize("NFKC", text or "").casefold())
+
+class LexicalIndex:
+    """In-process inverted index over title, author and description, ranked with BM25
+    
+    Term frequencies are summed across fields with FIELD_WEIGHTS (a simple BM25F), and
+    document length is the weighted token count. Postings are plain dicts, so adding,
+    replacing or removing one manhwa only touches that manhwa's terms.
+    """
+    
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._doc_terms: Dict[str, Dict[str, float]] = {}
+        self._doc_lengths: Dict[str, float] = {}
+        self._total_length = 0.0
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        
+        self.ready = False
+        self.warmed_at: Optional[str] = None
+        self.warm_ms = 0.0
+        
+        # Writes that land while a rebuild is streaming, replayed onto the new data before the swap
+        self._replay: Optional[List[tuple]] = None
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def upsert(self, manhwa: Dict[str, Any]) -> None:
+        if self._replay is not None:
+            self._replay.append(("upsert", manhwa))
+        self._upsert(manhwa)
+    
+    def remove(self, manhwa_id: str) -> bool:
+        if self._replay is not None:
+            self._replay.append(("remove", manhwa_id))
+        return self._remove(manhwa_id)
+    
+    def search(self, query: str, limit: int = 10, genre: Optional[str] = None,
+               status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Best BM25 matches for `query`, highest `bm25_score` first"""
+        terms = set(tokenize(query))
+        if not terms or not self._rows:
+            return []
+        
+        doc_count = len(self._rows)
+        # Zero when every document is empty; float drift from removals can also leave it at or below zero
+        average_length = self._total_length / doc_count
+        if average_length <= 0:
+            average_length = 1.0
+        scores: Dict[str, float] = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for manhwa_id, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[manhwa_id] / average_length)
+                scores[manhwa_id] = scores.get(manhwa_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        
+        if genre or status:
+            ranked = sorted(scores, key=scores.get, reverse=True)
+        else:
+            ranked = heapq.nlargest(limit, scores, key=scores.get)
+        
+        results = []
+        for manhwa_id in ranked:
+            row = self._rows[manhwa_id]
+            if genre and genre not in (row.get("genre") or []):
+                continue
+            if status and row.get("status") != status:
+                continue
+            results.append({**row, "bm25_score": scores[manhwa_id]})
+            if len(results) == limit:
+                break
+        return results
+    
+    async def warm(self, oracle_client) -> int:
+        """Rebuild from Oracle without blocking queries; the current data serves until the swap"""
+        start = time.perf_counter()
+        fresh = LexicalIndex(self.k1, self.b)
+        self._replay = []
+        try:
+            async for manhwa in oracle_client.iter_all_manhwa():
+                fresh._upsert(manhwa)
+            
+            # No await between replay and swap, so no write can slip in between
+            for op in self._replay:
+                if op[0] == "upsert":
+                    fresh._upsert(op[1])
+                else:
+                    fresh._remove(op[1])
+        finally:
+            self._replay = None
+        
+        self._postings, self._doc_terms, self._rows = fresh._postings, fresh._doc_terms, fresh._rows
+        self._doc_lengths, self._total_length = fresh._doc_lengths, fresh._total_length
+        self.ready = True
+        self.warmed_at = datetime.now().isoformat()
+        self.warm_ms = round((time.perf_counter() - start) * 1000, 2)
+        logger.info(f"Lexical index warmed with {len(self)} manhwa in {self.warm_ms} ms")
+        return len(self)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "entries": len(self),
+            "terms": len(self._postings),
+            "postings": sum(len(terms) for terms in self._doc_terms.values()),
+            "warmed_at": self.warmed_at,
+            "warm_ms": self.warm_ms
+        }
+    
+    def _upsert(self, manhwa: Dict[str, Any]) -> None:
+        manhwa_id = manhwa["id"]
+        self._remove(manhwa_id)
+        
+        weighted: Counter = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(manhwa.get(field)):
+                weighted[token] += weight
+        
+        self._doc_terms[manhwa_id] = dict(weighted)
+        self._doc_lengths[manhwa_id] = sum(weighted.values())
+        self._total_length += self._doc_lengths[manhwa_id]
+        self._rows[manhwa_id] = {field: manhwa.get(field) for field in RESULT_FIELDS}
+        for term, tf in weighted.items():
+            self._postings.setdefault(term, {})[manhwa_id] = tf
+    
+    def _remove(self, manhwa_id: str) -> bool:
+        terms = self._doc_terms.pop(manhwa_id, None)
+        if terms is None:
+            return False
+        
+        for term in terms:
+            postings = self._postings[term]
+            del postings[manhwa_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(manhwa_id)
+        del self._rows[manhwa_id]
+        return True
+
+def lexical_index_enabled() -> bool:
+    return os.getenv("LEXICAL_INDEX_ENABLED", "true").lower() == "true"
+
+# Global index and its refresher
+_lexical_index: Optional[LexicalIndex] = None
+_refresher: Optional[IndexRefresher] = None
+
+def get_lexical_index() -> Optional[LexicalIndex]:
+    """Get the global lexical index, or None if it's disabled or not started"""
+    return _lexical_index
+
+async def initialize_lexical_index(oracle_client) -> None:
+    """Create the global lexical index and start warming it from Oracle"""
+    global _lexical_index, _refresher
+    
+    if _lexical_index is None:
+        _lexical_index = LexicalIndex()
+        _refresher = IndexRefresher(
+            "lexical", _lexical_index, oracle_client,
+            refresh_interval_seconds=float(os.getenv("LEXICAL_INDEX_REFRESH_SECONDS", "300"))
+        )
+        await _refresher.start()
+        logger.info("Global lexical index initialized")
+    else:
+        logger.warning("Lexical index already initialized")
+
+async def shutdown_lexical_index() -> None:
+    global _lexical_index, _refresher
+    
+    if _refresher:
+        await _refresher.stop()
+    _lexical_index = None
+    _refresher = None
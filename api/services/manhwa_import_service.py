@@ -1,19 +1,20 @@
 import json
 import logging
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 from datetime import datetime
-from minio import Minio
-from minio.error import S3Error
 import os
 import hashlib
 
+if TYPE_CHECKING:
+    from minio import Minio
+
 logger = logging.getLogger(__name__)
 
 class ManhwaImportService:
     """Service to import generated manhwa from MinIO bucket into the manhwa database"""
     
-    def __init__(self, manhwa_service, minio_client: Optional[Minio] = None):
+    def __init__(self, manhwa_service, minio_client: Optional["Minio"] = None):
         self.manhwa_service = manhwa_service
         self.minio_client = minio_client
         
@@ -1,17 +1,35 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime
 import os
-import hashlib
+import base64
 import json
+from services.cache import get_cache, cache_enabled, cache_ttl, negative_cache_ttl, NEGATIVE_ENTRY
+from services.single_flight import get_single_flight
+from services.memory_repository import get_memory_repository
+
+LIST_GENERATION_KEY = "manhwa:list:generation"
+
+def _id_generation_key(manhwa_id: str) -> str:
+    """Counter bumped on every write to `manhwa_id`, so a detail read can tell it raced one"""
+    return f"manhwa:id:{manhwa_id}:generation"
 
 class ManhwaService:
-    def __init__(self):
-        self.oracle_client = None
+    def __init__(self, oracle_client=None):
+        # Shared client from the service container; built here only when none is given
+        self.oracle_client = oracle_client
+        
+        # Read-through cache for detail and list reads, shared by every ManhwaService
+        self.cache = get_cache() if cache_enabled() else None
         
-        # In-memory storage for fallback mode (when Oracle is not available)
-        self._memory_storage = []
+        # Text embedding model, loaded once per process and shared
+        from services.embedding_provider import get_embedding_provider
+        self.embedder = get_embedding_provider()
+        
+        # Indexed in-memory store for fallback mode (when Oracle is not available)
+        self.memory_repository = get_memory_repository(seed=self._get_sample_data())
         
         # Only initialize Oracle if not skipped
-        if not os.getenv('ORACLE_SKIP'):
+        if self.oracle_client is None and not os.getenv('ORACLE_SKIP'):
             try:
                 from dal.oracle_client import OracleClient
                 self.oracle_client = OracleClient()
@@ -27,127 +45,246 @@ class ManhwaService:
                 print(f"Oracle query failed: {e}")
                 print("Falling back to sample data")
                 # Fallback: return sample data + memory storage for development
-                all_data = self._get_sample_data() + self._memory_storage
-                return all_data[skip:skip+limit]
+                return self.memory_repository.list(skip=skip, limit=limit)
         else:
             # Fallback: return sample data + memory storage for development
-            all_data = self._get_sample_data() + self._memory_storage
-            return all_data[skip:skip+limit]
+            return self.memory_repository.list(skip=skip, limit=limit)
+    
+    async def get_page(self, skip: int = 0, limit: int = 20, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Get a page of manhwa plus an opaque cursor for the next page
+        
+        With a cursor the page is read by keyset on (created_at, id), so deep pages cost the
+        same as the first one; without one `skip` is used as a plain offset.
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        after = self._decode_cursor(cursor) if cursor else None
+        
+        cache_key = None
+        if self.cache:
+            # Writes bump the list generation, which retires every cached page at once
+            generation = await self.cache.get_counter(LIST_GENERATION_KEY)
+            cache_key = f"manhwa:list:{generation}:{skip if not cursor else 0}:{limit}:{cursor or ''}"
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        items = None
+        degraded = False
+        if self.oracle_client:
+            try:
+                if after:
+                    items = await self.oracle_client.get_manhwa_list_after(after=after, limit=limit)
+                else:
+                    items = await self.oracle_client.get_manhwa_list(skip=skip, limit=limit)
+            except Exception as e:
+                print(f"Oracle query failed: {e}")
+                print("Falling back to sample data")
+                degraded = True
+        
+        if items is None:
+            if after:
+                items = self.memory_repository.list_after(after[1], limit=limit)
+            else:
+                items = self.memory_repository.list(skip=skip, limit=limit)
+        
+        next_cursor = None
+        if items and len(items) == limit:
+            last = items[-1]
+            next_cursor = self._encode_cursor(last.get("created_at"), last["id"])
+        
+        page = {"items": items, "next_cursor": next_cursor}
+        # Don't let a transient Oracle failure pin fallback data in the cache
+        if cache_key and not degraded:
+            await self.cache.set(cache_key, page, ttl=cache_ttl())
+        return page
+    
+    def _encode_cursor(self, created_at: Optional[datetime], manhwa_id: str) -> str:
+        payload = json.dumps({"c": created_at.isoformat() if created_at else None, "i": manhwa_id})
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+    
+    def _decode_cursor(self, cursor: str) -> Tuple[Optional[datetime], str]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            created_at = datetime.fromisoformat(payload["c"]) if payload["c"] else None
+            return created_at, str(payload["i"])
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
     
     async def get_by_id(self, manhwa_id: str) -> Optional[Dict[str, Any]]:
+        if not self.cache:
+            return await get_single_flight("manhwa.get_by_id").do(
+                manhwa_id, lambda: self._load_by_id(manhwa_id)
+            )
+        
+        cache_key = f"manhwa:id:{manhwa_id}"
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            return None if cached == NEGATIVE_ENTRY else cached
+        
+        # Concurrent misses for the same id share one Oracle read
+        return await get_single_flight("manhwa.get_by_id").do(
+            manhwa_id, lambda: self._load_and_cache(manhwa_id, cache_key)
+        )
+    
+    async def _load_and_cache(self, manhwa_id: str, cache_key: str) -> Optional[Dict[str, Any]]:
+        # A write landing while Oracle is read bumps this; the row read may predate it
+        generation = await self.cache.get_counter(_id_generation_key(manhwa_id))
+        manhwa = await self._load_by_id(manhwa_id)
+        if await self.cache.get_counter(_id_generation_key(manhwa_id)) != generation:
+            return manhwa
+        if manhwa:
+            await self.cache.set(cache_key, manhwa, ttl=cache_ttl())
+        else:
+            # Negative entry so repeated lookups of unknown ids skip Oracle too
+            await self.cache.set(cache_key, NEGATIVE_ENTRY, ttl=negative_cache_ttl())
+        return manhwa
+    
+    async def invalidate_cache(self, manhwa_id: str) -> None:
+        """Drop cached reads affected by a write to `manhwa_id`"""
+        if self.cache:
+            await self.cache.incr(_id_generation_key(manhwa_id))
+            await self.cache.delete(f"manhwa:id:{manhwa_id}")
+            await self.cache.incr(LIST_GENERATION_KEY)
+            get_single_flight("manhwa.get_by_id").forget(manhwa_id)
+    
+    async def _load_by_id(self, manhwa_id: str) -> Optional[Dict[str, Any]]:
         if self.oracle_client:
             return await self.oracle_client.get_manhwa_by_id(manhwa_id)
         else:
             # Fallback: search in sample data + memory storage
-            all_data = self._get_sample_data() + self._memory_storage
-            return next((item for item in all_data if item["id"] == manhwa_id), None)
+            return self.memory_repository.get(manhwa_id)
     
     async def create(self, manhwa_data: Dict[str, Any]) -> Dict[str, Any]:
         if self.oracle_client:
-            manhwa = await self.oracle_client.create_manhwa(manhwa_data)
-            # Generate and store embedding
-            await self.generate_and_update_embedding(
-                manhwa["id"],
-                manhwa["title"],
-                manhwa["description"],
-                manhwa["genre"]
+            # Insert the row and its embedding in one transaction
+            embedding = await self._embed_manhwa(
+                manhwa_data["title"],
+                manhwa_data.get("description", ""),
+                manhwa_data.get("genre", [])
             )
+            manhwa = await self.oracle_client.create_manhwa_with_embedding(manhwa_data, embedding)
+            self._index_upsert(manhwa, embedding)
         else:
             # Fallback: create in memory storage
-            next_id = len(self._get_sample_data()) + len(self._memory_storage) + 1
-            manhwa = {
-                **manhwa_data, 
-                "id": manhwa_data.get("id", f"manhwa_{next_id}")
-            }
-            # Add to memory storage for persistence across requests
-            self._memory_storage.append(manhwa)
+            manhwa = self.memory_repository.add(manhwa_data)
             print(f"Created manhwa in memory: {manhwa['title']} (ID: {manhwa['id']})")
         
+        await self.invalidate_cache(manhwa["id"])
         return manhwa
     
-    async def update(self, manhwa_id: str, manhwa_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def update(self, manhwa_id: str, manhwa_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         if self.oracle_client:
-            manhwa = await self.oracle_client.update_manhwa(manhwa_id, manhwa_data)
-            # Update embedding if content changed
-            await self.generate_and_update_embedding(
-                manhwa["id"],
-                manhwa["title"],
-                manhwa["description"],
-                manhwa["genre"]
+            # Update the row and its embedding in one transaction
+            embedding = await self._embed_manhwa(
+                manhwa_data.get("title") or "",
+                manhwa_data.get("description") or "",
+                manhwa_data.get("genre", [])
             )
+            manhwa = await self.oracle_client.update_manhwa_with_embedding(manhwa_id, manhwa_data, embedding)
+            if manhwa:
+                self._index_upsert(manhwa, embedding)
         else:
             # Fallback: update in memory storage
-            for i, item in enumerate(self._memory_storage):
-                if item["id"] == manhwa_id:
-                    self._memory_storage[i] = {**manhwa_data, "id": manhwa_id}
-                    break
-            manhwa = {**manhwa_data, "id": manhwa_id}
+            manhwa = self.memory_repository.update(manhwa_id, manhwa_data)
         
+        await self.invalidate_cache(manhwa_id)
         return manhwa
     
     async def delete(self, manhwa_id: str) -> bool:
         if self.oracle_client:
             success = await self.oracle_client.delete_manhwa(manhwa_id)
+            if success:
+                self._index_remove(manhwa_id)
         else:
             # Fallback: remove from memory storage
-            initial_count = len(self._memory_storage)
-            self._memory_storage = [item for item in self._memory_storage if item["id"] != manhwa_id]
-            success = len(self._memory_storage) < initial_count
+            success = self.memory_repository.delete(manhwa_id)
             if success:
                 print(f"Deleted manhwa from memory: {manhwa_id}")
         
+        await self.invalidate_cache(manhwa_id)
         return success
     
-    def _generate_simple_embedding(self, title: str, description: str, genres: List[str]) -> List[float]:
-        """Generate a simple deterministic embedding for development/fallback"""
-        # Combine text for embedding
-        text = f"{title} {description} {' '.join(genres)}".lower()
-        
-        # Create a hash-based embedding (384 dimensions)
-        hash_obj = hashlib.md5(text.encode())
-        hash_hex = hash_obj.hexdigest()
-        
-        # Convert hex to normalized float values
-        embedding = []
-        for i in range(0, min(len(hash_hex), 96), 2):  # 96 hex chars = 48 bytes = 384 bits
-            hex_pair = hash_hex[i:i+2]
-            # Convert hex to float between -1 and 1
-            val = (int(hex_pair, 16) - 127.5) / 127.5
-            embedding.extend([val] * 8)  # Repeat to get to 384 dimensions
-        
-        # Pad or truncate to exactly 384 dimensions
-        while len(embedding) < 384:
-            embedding.append(0.0)
-        embedding = embedding[:384]
+    def record_view(self, manhwa_id: str) -> None:
+        """Count a page view through the write-behind buffer (no-op without Oracle)"""
+        from services.view_counter import get_view_counter
         
-        return embedding
+        view_counter = get_view_counter()
+        if self.oracle_client and view_counter:
+            view_counter.record(manhwa_id)
+    
+    async def _embed_manhwa(self, title: str, description: str, genres: List[str]) -> List[float]:
+        """Embed a manhwa with the configured provider (see services.embedding_provider)"""
+        from services.embedding_provider import manhwa_text
+        return (await self.embedder.encode_async([manhwa_text(title, description, genres)]))[0]
     
     async def generate_and_update_embedding(self, manhwa_id: str, title: str, description: str, genres: List[str]) -> None:
         """Generate and update embedding for a manhwa"""
         if self.oracle_client:
-            # Generate embedding (in a real app, you'd use a proper embedding model)
-            embedding = self._generate_simple_embedding(title, description, genres)
+            embedding = await self._embed_manhwa(title, description, genres)
             await self.oracle_client.update_manhwa_embedding(manhwa_id, embedding)
+            vector_index = self._vector_index()
+            if vector_index is not None:
+                vector_index.update_vector(manhwa_id, embedding)
     
     async def search_similar_manhwa(self, manhwa_id: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Find similar manhwa to the given one"""
         if not self.oracle_client:
             return []  # No similarity search in fallback mode
         
-        # Get the manhwa to find similar ones
-        manhwa = await self.get_by_id(manhwa_id)
-        if not manhwa:
-            return []
-        
-        # Generate embedding for search
-        embedding = self._generate_simple_embedding(
-            manhwa['title'], 
-            manhwa['description'], 
-            manhwa['genre']
+        return await get_single_flight("manhwa.search_similar").do(
+            (manhwa_id, limit), lambda: self._search_similar_manhwa(manhwa_id, limit)
         )
+    
+    async def _search_similar_manhwa(self, manhwa_id: str, limit: int) -> List[Dict[str, Any]]:
+        # Served from the in-process index once it has warmed; Oracle otherwise
+        vector_index = self._vector_index()
+        embedding = vector_index.get_vector(manhwa_id) if vector_index and vector_index.ready else None
+        if embedding is not None:
+            return vector_index.search(embedding, limit, exclude_id=manhwa_id)
+        
+        # Search from the stored embedding; only embed rows that don't have one yet
+        embedding = await self.oracle_client.get_manhwa_embedding(manhwa_id)
+        if embedding is None:
+            manhwa = await self.get_by_id(manhwa_id)
+            if not manhwa:
+                return []
+            
+            embedding = await self._embed_manhwa(
+                manhwa['title'], 
+                manhwa['description'], 
+                manhwa['genre']
+            )
         
         return await self.oracle_client.search_similar_manhwa(embedding, limit, exclude_id=manhwa_id)
     
+    def _vector_index(self):
+        """The in-process vector index, if enabled; writes keep it in step with Oracle even while it warms"""
+        from services.vector_index import get_vector_index
+        return get_vector_index()
+    
+    def _index_upsert(self, manhwa: Dict[str, Any], embedding: List[float]) -> None:
+        """Apply a write to the in-process search indexes that are enabled"""
+        from services.lexical_index import get_lexical_index
+        from services.suggest_index import get_suggest_index
+        
+        vector_index = self._vector_index()
+        if vector_index is not None:
+            vector_index.upsert(manhwa, embedding)
+        for text_index in (get_lexical_index(), get_suggest_index()):
+            if text_index is not None:
+                text_index.upsert(manhwa)
+    
+    def _index_remove(self, manhwa_id: str) -> None:
+        from services.lexical_index import get_lexical_index
+        from services.suggest_index import get_suggest_index
+        
+        for index in (self._vector_index(), get_lexical_index(), get_suggest_index()):
+            if index is not None:
+                index.remove(manhwa_id)
+    
     def _get_sample_data(self) -> List[Dict[str, Any]]:
         """Sample data for development when Oracle is not available"""
         return [
@@ -4,14 +4,15 @@ import uuid
 import base64
 from io import BytesIO
 from typing import Dict, Any, List, Optional
-from minio import Minio
-from minio.error import S3Error
 import logging
 
 logger = logging.getLogger(__name__)
 
 class ManhwaStorageService:
     def __init__(self):
+        # The minio SDK is imported on first construction to keep it off the API import path
+        from minio import Minio
+        
         self.minio_endpoint = os.getenv("MINIO_ENDPOINT", "localhost:9000")
         self.access_key = os.getenv("MINIO_ACCESS_KEY", "paimons")
         self.secret_key = os.getenv("MINIO_SECRET_KEY", "paimons123")
@@ -37,6 +38,8 @@ class ManhwaStorageService:
     
     def ensure_bucket_exists(self):
         """Ensure the bucket exists"""
+        from minio.error import S3Error
+        
         try:
             if not self.client.bucket_exists(self.bucket_name):
                 self.client.make_bucket(self.bucket_name)
@@ -0,0 +1,155 @@
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class InMemoryManhwaRepository:
+    """Indexed in-memory manhwa store used when Oracle is skipped or unavailable
+    
+    Records are kept in an id -> record dict with an insertion-ordered id list for
+    paging, so lookups are O(1) and pages are O(limit) instead of rebuilding and
+    scanning the whole catalog per call. Deletes leave a tombstone in the id list
+    rather than renumbering it, and the list is compacted once tombstones make up
+    half of it.
+    """
+    
+    def __init__(self, seed: Iterable[Dict[str, Any]] = (), snapshot_path: Optional[str] = None):
+        self.snapshot_path = snapshot_path
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._order: List[Optional[str]] = []
+        self._positions: Dict[str, int] = {}
+        self._tombstones = 0
+        self._next_id = 1
+        self._dirty = False
+        
+        if snapshot_path and os.path.exists(snapshot_path):
+            self.load_snapshot()
+        else:
+            for record in seed:
+                self.add(record)
+            self._dirty = False
+    
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    def __contains__(self, manhwa_id: str) -> bool:
+        return manhwa_id in self._records
+    
+    def get(self, manhwa_id: str) -> Optional[Dict[str, Any]]:
+        return self._records.get(manhwa_id)
+    
+    def list(self, skip: int = 0, limit: int = 20) -> List[Dict[str, Any]]:
+        if not self._tombstones:
+            return [self._records[manhwa_id] for manhwa_id in self._order[skip:skip + limit]]
+        return self._live_from(0, skip, limit)
+    
+    def list_after(self, manhwa_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Page that starts right after `manhwa_id` in listing order (empty if it's unknown)"""
+        position = self._positions.get(manhwa_id)
+        if position is None:
+            return []
+        return self._live_from(position + 1, 0, limit)
+    
+    def _live_from(self, start: int, skip: int, limit: int) -> List[Dict[str, Any]]:
+        # Walk by index; slicing would copy the whole tail of the id list
+        page: List[Dict[str, Any]] = []
+        for position in range(start, len(self._order)):
+            if len(page) >= limit:
+                break
+            manhwa_id = self._order[position]
+            if manhwa_id is None:
+                continue
+            if skip:
+                skip -= 1
+                continue
+            page.append(self._records[manhwa_id])
+        return page
+    
+    def next_id(self) -> str:
+        while f"manhwa_{self._next_id}" in self._records:
+            self._next_id += 1
+        return f"manhwa_{self._next_id}"
+    
+    def add(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        manhwa_id = record.get("id") or self.next_id()
+        record = {**record, "id": manhwa_id}
+        
+        if manhwa_id not in self._records:
+            self._positions[manhwa_id] = len(self._order)
+            self._order.append(manhwa_id)
+        
+        self._records[manhwa_id] = record
+        self._dirty = True
+        return record
+    
+    def update(self, manhwa_id: str, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if manhwa_id not in self._records:
+            return None
+        return self.add({**record, "id": manhwa_id})
+    
+    def delete(self, manhwa_id: str) -> bool:
+        if self._records.pop(manhwa_id, None) is None:
+            return False
+        
+        self._order[self._positions.pop(manhwa_id)] = None
+        self._tombstones += 1
+        if self._tombstones * 2 >= len(self._order):
+            self._compact()
+        self._dirty = True
+        return True
+    
+    def _compact(self) -> None:
+        self._order = [manhwa_id for manhwa_id in self._order if manhwa_id is not None]
+        self._positions = {manhwa_id: position for position, manhwa_id in enumerate(self._order)}
+        self._tombstones = 0
+    
+    def save_snapshot(self) -> bool:
+        """Write all records to `snapshot_path` if it is set and there are unsaved changes"""
+        if not self.snapshot_path or not self._dirty:
+            return False
+        
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.list(skip=0, limit=len(self._records)), f, default=str)
+        os.replace(tmp_path, self.snapshot_path)
+        self._dirty = False
+        logger.info(f"Saved {len(self._records)} manhwa to {self.snapshot_path}")
+        return True
+    
+    def load_snapshot(self) -> None:
+        with open(self.snapshot_path, encoding="utf-8") as f:
+            records = json.load(f)
+        for record in records:
+            self.add(record)
+        self._dirty = False
+        logger.info(f"Loaded {len(records)} manhwa from {self.snapshot_path}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "records": len(self._records),
+            "tombstones": self._tombstones,
+            "snapshot_path": self.snapshot_path,
+            "unsaved_changes": self._dirty
+        }
+
+# Global repository instance, shared by every ManhwaService
+_repository: Optional[InMemoryManhwaRepository] = None
+
+def get_memory_repository(seed: Iterable[Dict[str, Any]] = ()) -> InMemoryManhwaRepository:
+    """Get the global in-memory repository, seeding it on first use"""
+    global _repository
+    
+    if _repository is None:
+        _repository = InMemoryManhwaRepository(
+            seed=seed,
+            snapshot_path=os.getenv("MEMORY_STORE_SNAPSHOT_PATH") or None
+        )
+    return _repository
+
+def save_memory_snapshot() -> bool:
+    """Persist the global repository if snapshots are enabled"""
+    if _repository is None:
+        return False
+    return _repository.save_snapshot()
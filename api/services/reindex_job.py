@@ -0,0 +1,263 @@
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class ReindexJob:
+    """Re-embed the whole catalog with the current embedding provider, resumable across restarts
+    
+    Manhwa are read in id order one page at a time and embedded on a thread pool while
+    the next page is read; vectors are written back with array DML. After each batch
+    commits, its last id goes to a checkpoint file, so a restarted job carries on after
+    it. A checkpoint left by a different model is ignored and the job starts over. An
+    exclusive lock on `<checkpoint>.lock` keeps worker processes sharing the checkpoint
+    from running the job twice.
+    """
+    
+    def __init__(self, oracle_client, checkpoint_path: str, batch_size: int = 256, workers: int = 2):
+        self.oracle_client = oracle_client
+        self.checkpoint_path = checkpoint_path
+        self.batch_size = batch_size
+        self.workers = workers
+        self._task: Optional[asyncio.Task] = None
+        self._lock_file = None
+        
+        # Progress of the current (or last) run
+        self.state = "idle"
+        self.model_id: Optional[str] = None
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.resumed_after: Optional[str] = None
+        self.last_id: Optional[str] = None
+        self.total = 0
+        self.processed = 0
+        self.updated = 0
+        self.skipped = 0
+        self.failed = 0
+        self.errors: Deque[Dict[str, Any]] = deque(maxlen=20)
+        self.error: Optional[str] = None
+        self._started = 0.0
+        self._finished: Optional[float] = None
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def start(self, restart: bool = False) -> bool:
+        """Start in the background, resuming from the checkpoint unless `restart`; False if already running here or in another worker"""
+        if self.running or not self._acquire_lock():
+            return False
+        self._task = asyncio.create_task(self._run(restart))
+        return True
+    
+    def _acquire_lock(self) -> bool:
+        lock_file = open(f"{self.checkpoint_path}.lock", "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+    
+    def _release_lock(self) -> None:
+        if self._lock_file:
+            # Closing the file drops the lock
+            self._lock_file.close()
+            self._lock_file = None
+    
+    async def stop(self) -> bool:
+        """Cancel a running job; the checkpoint is kept so the next start resumes"""
+        if not self.running:
+            return False
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        return True
+    
+    async def _run(self, restart: bool) -> None:
+        # Imported here so the admin router doesn't pull numpy into startup
+        from services.embedding_provider import get_embedding_provider, manhwa_text
+        
+        provider = get_embedding_provider()
+        # Skip the embedding cache: every text is new to it and would evict hot query vectors
+        encoder = getattr(provider, "inner", provider)
+        
+        checkpoint = None if restart else self._load_checkpoint()
+        after_id = checkpoint["last_id"] if checkpoint and checkpoint.get("model_id") == provider.model_id else None
+        
+        self._reset(provider.model_id, after_id)
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="reindex")
+        loop = asyncio.get_running_loop()
+        try:
+            self.total = await self.oracle_client.count_manhwa(after_id)
+            logger.info(f"Re-embedding {self.total} manhwa with {self.model_id}" + (f", resuming after {after_id}" if after_id else ""))
+            
+            pending: Deque[Tuple[List[Dict[str, Any]], asyncio.Future]] = deque()
+            exhausted = False
+            while True:
+                # Keep every worker busy; the next page is read while earlier ones embed
+                while not exhausted and len(pending) < self.workers:
+                    rows = await self.oracle_client.get_manhwa_after_id(after_id, self.batch_size)
+                    if not rows:
+                        exhausted = True
+                        break
+                    after_id = rows[-1]["id"]
+                    texts = [manhwa_text(row["title"], row["description"], row["genre"]) for row in rows]
+                    pending.append((rows, loop.run_in_executor(executor, encoder.encode, texts)))
+                
+                if not pending:
+                    break
+                rows, embedding = pending.popleft()
+                await self._write(rows, await embedding)
+            
+            self.state = "completed"
+            self._clear_checkpoint()
+            logger.info(f"Re-embedding finished: {self.updated} updated, {self.skipped} skipped, {self.failed} failed")
+        except asyncio.CancelledError:
+            self.state = "stopped"
+            logger.info(f"Re-embedding stopped after {self.last_id}")
+            raise
+        except Exception as e:
+            self.state = "failed"
+            self.error = str(e)
+            logger.error(f"Re-embedding failed after {self.last_id}: {e}")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._release_lock()
+            self._finished = time.monotonic()
+            self.finished_at = datetime.now().isoformat()
+    
+    async def _write(self, rows: List[Dict[str, Any]], embeddings: List[List[float]]) -> None:
+        result = await self.oracle_client.update_manhwa_embeddings([
+            {"id": row["id"], "embedding": embedding, "updated_at": row["updated_at"]}
+            for row, embedding in zip(rows, embeddings)
+        ])
+        updated = set(result["updated_ids"])
+        
+        # Keep the in-process index in step, so searches don't mix vector spaces until its next refresh
+        from services.vector_index import get_vector_index
+        vector_index = get_vector_index()
+        if vector_index:
+            for row, embedding in zip(rows, embeddings):
+                if row["id"] in updated:
+                    vector_index.update_vector(row["id"], embedding)
+        
+        self.processed += len(rows)
+        self.updated += len(updated)
+        self.failed += len(result["errors"])
+        # Rows edited since they were read already got a fresh embedding from that edit
+        self.skipped += len(rows) - len(updated) - len(result["errors"])
+        self.errors.extend(result["errors"])
+        self.last_id = rows[-1]["id"]
+        self._save_checkpoint()
+    
+    def _reset(self, model_id: str, after_id: Optional[str]) -> None:
+        self.state = "running"
+        self.model_id = model_id
+        self.started_at = datetime.now().isoformat()
+        self.finished_at = None
+        self.resumed_after = after_id
+        self.last_id = after_id
+        self.total = self.processed = self.updated = self.skipped = self.failed = 0
+        self.errors.clear()
+        self.error = None
+        self._started = time.monotonic()
+        self._finished = None
+    
+    def _load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable reindex checkpoint {self.checkpoint_path}: {e}")
+            return None
+    
+    def _save_checkpoint(self) -> None:
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"model_id": self.model_id, "last_id": self.last_id, "saved_at": datetime.now().isoformat()}, f)
+        os.replace(tmp_path, self.checkpoint_path)
+    
+    def _clear_checkpoint(self) -> None:
+        try:
+            os.remove(self.checkpoint_path)
+        except FileNotFoundError:
+            pass
+    
+    def get_status(self) -> Dict[str, Any]:
+        elapsed = ((self._finished or time.monotonic()) - self._started) if self.started_at else 0.0
+        rows_per_second = self.processed / elapsed if elapsed > 0 else 0.0
+        remaining = max(0, self.total - self.processed)
+        return {
+            "state": self.state,
+            "running": self.running,
+            "model_id": self.model_id,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "resumed_after": self.resumed_after,
+            "last_id": self.last_id,
+            "total": self.total,
+            "processed": self.processed,
+            "updated": self.updated,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "rows_per_second": round(rows_per_second, 1),
+            "eta_seconds": round(remaining / rows_per_second, 1) if self.running and rows_per_second else None,
+            "elapsed_seconds": round(elapsed, 1),
+            "batch_size": self.batch_size,
+            "workers": self.workers,
+            "checkpoint": self._load_checkpoint(),
+            "recent_errors": list(self.errors),
+            "error": self.error
+        }
+
+def reindex_checkpoint_path() -> str:
+    """REINDEX_CHECKPOINT_PATH, or reindex_checkpoint.json under API_DATA_DIR (api/data by default)"""
+    path = os.getenv("REINDEX_CHECKPOINT_PATH")
+    if path:
+        return path
+    data_dir = os.getenv("API_DATA_DIR") or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+    os.makedirs(data_dir, exist_ok=True)
+    return os.path.join(data_dir, "reindex_checkpoint.json")
+
+# Global reindex job, created on first use
+_reindex_job: Optional[ReindexJob] = None
+
+def get_reindex_job(oracle_client=None) -> Optional[ReindexJob]:
+    """Get the global reindex job, creating it if an Oracle client is given; None if never created"""
+    global _reindex_job
+    
+    if _reindex_job is None and oracle_client is not None:
+        _reindex_job = ReindexJob(
+            oracle_client,
+            checkpoint_path=reindex_checkpoint_path(),
+            batch_size=int(os.getenv("REINDEX_BATCH_SIZE", "256")),
+            workers=int(os.getenv("REINDEX_WORKERS", "2"))
+        )
+    return _reindex_job
+
+def resume_reindex_job(oracle_client) -> bool:
+    """Resume a re-embedding that was interrupted and left a checkpoint; False if there is none"""
+    if os.getenv("REINDEX_RESUME_ON_STARTUP", "true").lower() != "true" or not os.path.exists(reindex_checkpoint_path()):
+        return False
+    return get_reindex_job(oracle_client).start()
+
+async def shutdown_reindex_job() -> None:
+    global _reindex_job
+    
+    if _reindex_job:
+        await _reindex_job.stop()
+    _reindex_job = None
@@ -0,0 +1,46 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict
+
+class StageLatency:
+    """Rolling per-stage latency of the search pipeline (embed, vector, lexical, fusion, total)"""
+    
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+    
+    @contextmanager
+    def measure(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+    
+    def record(self, stage: str, seconds: float) -> None:
+        if stage not in self._samples:
+            self._samples[stage] = deque(maxlen=self.window)
+            self._counts[stage] = 0
+        self._samples[stage].append(seconds * 1000)
+        self._counts[stage] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        stats = {}
+        for stage, samples in self._samples.items():
+            ordered = sorted(samples)
+            stats[stage] = {
+                "count": self._counts[stage],
+                "avg_ms": round(sum(ordered) / len(ordered), 3),
+                "p50_ms": round(ordered[len(ordered) // 2], 3),
+                "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 3)
+            }
+        return stats
+
+# Global search latency, shared by every SearchService
+_search_latency = StageLatency()
+
+def get_search_latency() -> StageLatency:
+    """Get the process-wide search stage latency"""
+    return _search_latency
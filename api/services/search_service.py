@@ -1,77 +1,265 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import os
-import hashlib
-from dal.oracle_client import OracleClient
+from services.single_flight import get_single_flight
+from services.search_metrics import get_search_latency
+
+# How many candidates each ranking contributes to fusion, per result returned
+SEARCH_CANDIDATE_MULTIPLIER = int(os.getenv("SEARCH_CANDIDATE_MULTIPLIER", "4"))
+
+# RRF smoothing constant; 60 is the value from the original paper and rarely needs tuning
+RRF_K = int(os.getenv("SEARCH_RRF_K", "60"))
+
+def reciprocal_rank_fusion(rankings: List[List[Dict[str, Any]]], k: int = RRF_K) -> List[Dict[str, Any]]:
+    """Merge ranked result lists by summing 1 / (k + rank) per manhwa
+    
+    Only ranks are used, so cosine distances and BM25 scores never need to be on the
+    same scale. Each merged row gets `rrf_score`; higher is better.
+    """
+    rows: Dict[str, Dict[str, Any]] = {}
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, result in enumerate(ranking, start=1):
+            manhwa_id = result["id"]
+            rows.setdefault(manhwa_id, result)
+            scores[manhwa_id] = scores.get(manhwa_id, 0.0) + 1.0 / (k + rank)
+    
+    ordered = sorted(scores, key=scores.get, reverse=True)
+    return [{**rows[manhwa_id], "rrf_score": scores[manhwa_id]} for manhwa_id in ordered]
+
+def vector_relevance(result: Dict[str, Any]) -> float:
+    """Cosine similarity from a vector result's `similarity_score` (a distance), so higher is better
+    
+    Keeps `relevance_score` pointing the same way as the RRF score used once keyword
+    search is warm, so the same query doesn't flip meaning right after startup.
+    """
+    distance = result.get("similarity_score")
+    return 1.0 - distance if distance is not None else 0.0
 
 class SearchService:
-    def __init__(self):
-        self.oracle_client = None
+    def __init__(self, oracle_client=None):
+        # Shared client from the service container; built here only when none is given
+        self.oracle_client = oracle_client
         
         # Only initialize Oracle if not skipped
-        if not os.getenv('ORACLE_SKIP'):
+        if self.oracle_client is None and not os.getenv('ORACLE_SKIP'):
             try:
+                from dal.oracle_client import OracleClient
                 self.oracle_client = OracleClient()
             except Exception as e:
                 print(f"Oracle initialization failed in SearchService: {e}")
                 print("Search functionality will be limited")
-    
-    def _generate_simple_embedding(self, text: str) -> List[float]:
-        """Generate a simple deterministic embedding for search"""
-        text = text.lower()
-        
-        # Create a hash-based embedding (384 dimensions)
-        hash_obj = hashlib.md5(text.encode())
-        hash_hex = hash_obj.hexdigest()
         
-        # Convert hex to normalized float values
-        embedding = []
-        for i in range(0, min(len(hash_hex), 96), 2):
-            hex_pair = hash_hex[i:i+2]
-            val = (int(hex_pair, 16) - 127.5) / 127.5
-            embedding.extend([val] * 8)
+        # Imported here so loading the search router doesn't pull in numpy
+        from services.embedding_provider import get_embedding_provider
+        self.embedder = get_embedding_provider()
+    
+    async def _embed(self, text: str) -> List[float]:
+        return (await self.embedder.encode_async([text]))[0]
+    
+    def _vector_index(self):
+        """The in-process vector index once it has warmed, else None (search Oracle)"""
+        from services.vector_index import get_vector_index
         
-        # Pad or truncate to exactly 384 dimensions
-        while len(embedding) < 384:
-            embedding.append(0.0)
-        embedding = embedding[:384]
+        vector_index = get_vector_index()
+        return vector_index if vector_index is not None and vector_index.ready else None
+    
+    def _lexical_index(self):
+        """The in-process BM25 index once it has warmed, else None (vector search only)"""
+        from services.lexical_index import get_lexical_index
         
-        return embedding
-
-    async def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        lexical_index = get_lexical_index()
+        return lexical_index if lexical_index is not None and lexical_index.ready else None
+    
+    async def search(self, query: str, limit: int = 10, genre: Optional[str] = None, status: Optional[str] = None) -> List[Dict[str, Any]]:
         if not self.oracle_client:
             return []
         
-        # Generate embedding for the search query
-        query_embedding = self._generate_simple_embedding(query)
+        return await get_single_flight("search.search").do(
+            (query, limit, genre, status), lambda: self._search(query, limit, genre, status)
+        )
+    
+    async def _search(self, query: str, limit: int, genre: Optional[str] = None, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        latency = get_search_latency()
+        lexical_index = self._lexical_index()
+        # Fusion re-ranks, so each stage contributes a deeper candidate list than the page
+        candidates = limit * SEARCH_CANDIDATE_MULTIPLIER if lexical_index else limit
         
+        with latency.measure("total"):
+            # Generate embedding for the search query
+            with latency.measure("embed"):
+                query_embedding = await self._embed(query)
+            
+            with latency.measure("vector"):
+                vector_results = await self._vector_search(query_embedding, candidates, genre, status)
+            
+            if not lexical_index:
+                return [
+                    self._to_result(result, vector_relevance(result))
+                    for result in vector_results
+                ]
+            
+            with latency.measure("lexical"):
+                lexical_results = lexical_index.search(query, candidates, genre=genre, status=status)
+            
+            with latency.measure("fusion"):
+                fused = reciprocal_rank_fusion([vector_results, lexical_results])[:limit]
+            
+            return [self._to_result(result, result["rrf_score"]) for result in fused]
+    
+    async def _vector_search(self, query_embedding: List[float], limit: int, genre: Optional[str], status: Optional[str]) -> List[Dict[str, Any]]:
+        vector_index = self._vector_index()
+        if vector_index:
+            return vector_index.search(query_embedding, limit, genre=genre, status=status)
+        if genre or status:
+            return await self.oracle_client.search_manhwa_hybrid(
+                query_embedding,
+                genre_filter=genre,
+                status_filter=status,
+                limit=limit
+            )
         # Use Oracle's vector search
-        vector_results = await self.oracle_client.search_similar_manhwa(
+        return await self.oracle_client.search_similar_manhwa(
             query_embedding, 
             limit=limit
         )
+    
+    def _to_result(self, result: Dict[str, Any], relevance_score: float) -> Dict[str, Any]:
+        return {
+            **result,
+            "relevance_score": relevance_score,
+            "snippet": f"{result['title']} - {(result.get('description') or '')[:100]}..."
+        }
+    
+    async def search_batch(self, requests: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Run several searches and similar-to lookups together, results in request order
         
-        # Results already contain manhwa details from Oracle
-        results = []
-        for result in vector_results:
-            results.append({
-                **result,
-                "relevance_score": result.get("similarity_score", 0.0),
-                "snippet": f"{result['title']} - {result['description'][:100]}..."
-            })
+        Each request has either `query` (with optional `genre` and `status`) or `similar_to`
+        (a manhwa id), plus `limit`. Every text that needs embedding goes through one
+        encode call, and all vector searches run in one index pass or one Oracle round trip.
+        """
+        if not self.oracle_client or not requests:
+            return [[] for _ in requests]
+        
+        latency = get_search_latency()
+        vector_index = self._vector_index()
+        lexical_index = self._lexical_index()
+        
+        with latency.measure("batch"):
+            with latency.measure("batch.embed"):
+                embeddings = await self._batch_embeddings(requests, vector_index)
+            
+            searches = []
+            for request, embedding in zip(requests, embeddings):
+                if embedding is None:
+                    continue
+                # Fusion re-ranks, so hybrid queries take a deeper candidate list than the page
+                hybrid = lexical_index and request.get("query")
+                searches.append({
+                    "embedding": embedding,
+                    "limit": request["limit"] * SEARCH_CANDIDATE_MULTIPLIER if hybrid else request["limit"],
+                    "exclude_id": request.get("similar_to"),
+                    "genre": request.get("genre"),
+                    "status": request.get("status")
+                })
+            
+            with latency.measure("batch.vector"):
+                if vector_index:
+                    ranked = iter(vector_index.search_many(searches))
+                else:
+                    ranked = iter(await self.oracle_client.search_similar_manhwa_many(searches))
+            
+            results = []
+            for request, embedding in zip(requests, embeddings):
+                if embedding is None:
+                    results.append([])
+                    continue
+                
+                vector_results = next(ranked)
+                if not (lexical_index and request.get("query")):
+                    results.append([self._to_result(result, vector_relevance(result)) for result in vector_results])
+                    continue
+                
+                lexical_results = lexical_index.search(
+                    request["query"], request["limit"] * SEARCH_CANDIDATE_MULTIPLIER,
+                    genre=request.get("genre"), status=request.get("status")
+                )
+                fused = reciprocal_rank_fusion([vector_results, lexical_results])[:request["limit"]]
+                results.append([self._to_result(result, result["rrf_score"]) for result in fused])
+            return results
+    
+    async def _batch_embeddings(self, requests: List[Dict[str, Any]], vector_index) -> List[Optional[Any]]:
+        """Query vector per request: indexed or stored vectors for similar-to ids, one encode for the rest"""
+        embeddings: List[Optional[Any]] = [None] * len(requests)
+        texts: Dict[int, str] = {}
+        
+        similar = [i for i, request in enumerate(requests) if request.get("similar_to")]
+        if vector_index:
+            for i in similar:
+                embeddings[i] = vector_index.get_vector(requests[i]["similar_to"])
+        
+        unresolved = [i for i in similar if embeddings[i] is None]
+        if unresolved:
+            stored = await self.oracle_client.get_manhwa_embeddings(list({requests[i]["similar_to"] for i in unresolved}))
+            for i in unresolved:
+                embeddings[i] = stored.get(requests[i]["similar_to"])
+            
+            # Not embedded yet: embed them the same way they will be when stored
+            from services.embedding_provider import manhwa_text
+            for i in unresolved:
+                if embeddings[i] is None:
+                    manhwa = await self.oracle_client.get_manhwa_by_id(requests[i]["similar_to"])
+                    if manhwa:
+                        texts[i] = manhwa_text(manhwa['title'], manhwa['description'], manhwa.get('genre', []))
+        
+        for i, request in enumerate(requests):
+            if request.get("query"):
+                texts[i] = request["query"]
+        
+        if texts:
+            for i, embedding in zip(texts, await self.embedder.encode_async(list(texts.values()))):
+                embeddings[i] = embedding
+        return embeddings
+    
+    def _suggest_index(self):
+        """The in-memory prefix index once it has warmed, else None"""
+        from services.suggest_index import get_suggest_index
         
-        return results
+        suggest_index = get_suggest_index()
+        return suggest_index if suggest_index is not None and suggest_index.ready else None
+    
+    def suggest_ready(self) -> bool:
+        return self._suggest_index() is not None
+    
+    def suggest(self, prefix: str, limit: int = 8) -> List[Dict[str, Any]]:
+        """Typeahead suggestions from the in-memory prefix index; empty until it has warmed"""
+        suggest_index = self._suggest_index()
+        return suggest_index.suggest(prefix, limit) if suggest_index else []
     
     async def find_similar(self, manhwa_id: str, limit: int = 5) -> List[Dict[str, Any]]:
         if not self.oracle_client:
             return []
-            
-        manhwa = await self.oracle_client.get_manhwa_by_id(manhwa_id)
-        if not manhwa:
-            return []
         
-        # Generate embedding for the manhwa
-        search_text = f"{manhwa['title']} {manhwa['description']} {' '.join(manhwa.get('genre', []))}"
-        query_embedding = self._generate_simple_embedding(search_text)
+        return await get_single_flight("search.find_similar").do(
+            (manhwa_id, limit), lambda: self._find_similar(manhwa_id, limit)
+        )
+    
+    async def _find_similar(self, manhwa_id: str, limit: int) -> List[Dict[str, Any]]:
+        vector_index = self._vector_index()
+        query_embedding = vector_index.get_vector(manhwa_id) if vector_index else None
+        if query_embedding is not None:
+            similar_results = vector_index.search(query_embedding, limit, exclude_id=manhwa_id)
+            return [{**result, "relevance_score": vector_relevance(result)} for result in similar_results]
+        
+        # The stored vector is what the neighbours were ranked against; no need to re-embed
+        query_embedding = await self.oracle_client.get_manhwa_embedding(manhwa_id)
+        if query_embedding is None:
+            manhwa = await self.oracle_client.get_manhwa_by_id(manhwa_id)
+            if not manhwa:
+                return []
+            
+            # Not embedded yet: embed it the same way it will be when stored
+            from services.embedding_provider import manhwa_text
+            query_embedding = await self._embed(manhwa_text(manhwa['title'], manhwa['description'], manhwa.get('genre', [])))
         
         # Use Oracle's vector search with exclusion of the source manhwa
         similar_results = await self.oracle_client.search_similar_manhwa(
@@ -84,7 +272,7 @@ class SearchService:
         for result in similar_results:
             results.append({
                 **result,
-                "relevance_score": result.get("similarity_score", 0.0)
+                "relevance_score": vector_relevance(result)
             })
         
         return results
\ No newline at end of file
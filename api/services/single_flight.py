@@ -0,0 +1,68 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+class SingleFlight:
+    """Collapse concurrent identical reads into one in-flight call
+    
+    The first caller for a key starts the work; callers arriving while it is still
+    running await the same task and share its result (or exception).
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.executed = 0
+        self.collapsed = 0
+    
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+        
+        task = self._inflight.get(key)
+        if task is not None:
+            self.collapsed += 1
+        else:
+            self.executed += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._discard(key, done))
+        
+        # Shield so one caller giving up doesn't cancel the work for everyone else
+        return await asyncio.shield(task)
+    
+    def forget(self, key: Hashable) -> None:
+        """Stop sharing the in-flight call for `key`; later callers start a fresh one
+        
+        Callers already waiting still get its result. Used after a write, so reads that
+        arrive later don't join one that may have read the old row.
+        """
+        self._inflight.pop(key, None)
+    
+    def _discard(self, key: Hashable, task: asyncio.Task) -> None:
+        # A forgotten call may finish after a newer one took its key
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executed": self.executed,
+            "collapsed": self.collapsed,
+            "in_flight": len(self._inflight)
+        }
+
+# Process-wide groups, so identical reads coalesce across service instances
+_groups: Dict[str, SingleFlight] = {}
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Get (or create) the named single-flight group"""
+    group: Optional[SingleFlight] = _groups.get(name)
+    if group is None:
+        group = _groups[name] = SingleFlight(name)
+    return group
+
+def get_single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    """Collapse counters for every single-flight group"""
+    return {name: group.get_stats() for name, group in _groups.items()}
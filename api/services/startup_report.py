@@ -0,0 +1,57 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+class StartupReport:
+    """Wall-clock cost of each module import and client init on the API startup path
+    
+    Entries recorded before `mark_ready()` are paid by every cold start; anything
+    initialized later shows up as `first_use`, paid by the first request that needs it.
+    """
+    
+    def __init__(self):
+        self._started = time.perf_counter()
+        self.entries: List[Dict[str, Any]] = []
+        self.ready_ms: float = 0.0
+        self.ready = False
+    
+    @contextmanager
+    def measure(self, name: str, kind: str = "init"):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.entries.append({
+                "name": name,
+                "kind": kind,
+                "phase": "first_use" if self.ready else "startup",
+                "ms": round((time.perf_counter() - start) * 1000, 2)
+            })
+    
+    def mark_ready(self) -> None:
+        """Record the end of startup and log the breakdown"""
+        self.ready = True
+        self.ready_ms = round((time.perf_counter() - self._started) * 1000, 2)
+        
+        startup = [entry for entry in self.entries if entry["phase"] == "startup"]
+        logger.info(f"API ready in {self.ready_ms} ms")
+        for entry in sorted(startup, key=lambda e: e["ms"], reverse=True):
+            logger.info(f"  {entry['kind']:7}{entry['name']:32}{entry['ms']:>10.2f} ms")
+    
+    def get_report(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "ready_ms": self.ready_ms,
+            "startup": [entry for entry in self.entries if entry["phase"] == "startup"],
+            "first_use": [entry for entry in self.entries if entry["phase"] == "first_use"]
+        }
+
+# Global report; created when main.py starts importing
+_report = StartupReport()
+
+def get_startup_report() -> StartupReport:
+    """Get the process-wide startup report"""
+    return _report
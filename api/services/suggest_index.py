@@ -0,0 +1,367 @@
+import asyncio
+import heapq
+import logging
+import os
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from services.index_refresher import IndexRefresher
+
+logger = logging.getLogger(__name__)
+
+# Suggestions are (kind, key): ("title", manhwa_id), ("author", name) or ("genre", name)
+Suggestion = Tuple[str, str]
+Ranked = List[Tuple[float, Suggestion]]
+
+# Matches that start mid-title ("leveling" in "Solo Leveling") rank below ones that start the title
+WORD_START_FACTOR = 0.5
+
+# Only the first few words of a title or name get their own entry point
+MAX_WORD_STARTS = 6
+
+# Prefixes matching more keys than this are too costly to rank per keystroke; their answers are kept precomputed
+HEAVY_PREFIX_KEYS = int(os.getenv("SUGGEST_HEAVY_PREFIX_KEYS", "128"))
+
+# Precomputed lists keep this many times the answer size, so deletes rarely force a re-rank
+HEAVY_HEADROOM = 4
+
+def normalize_prefix(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", text or "").casefold().split())
+
+def _prefix_end(prefix: str) -> str:
+    """Smallest string greater than every string starting with `prefix`"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+def _entry_keys(text: str) -> List[Tuple[str, bool]]:
+    words = normalize_prefix(text).split()
+    return [(" ".join(words[i:]), i > 0) for i in range(min(len(words), MAX_WORD_STARTS))]
+
+class SuggestIndex:
+    """Typeahead over titles, authors and genres: a sorted key array searched with bisect
+    
+    Every title and name is stored once per word it can be typed from, so "lev" finds
+    "Solo Leveling". A prefix maps to one contiguous slice of the sorted keys, and the
+    best entries in that slice are picked by popularity: a title's view_count, or the
+    summed view_count of an author's or genre's manhwa.
+    
+    Prefixes covering more than HEAVY_PREFIX_KEYS keys (one or two letters, or a common
+    first word) get their top lists built at warm time and patched on each write. The
+    rest are ranked on demand from at most that many keys, with answers memoized until
+    a write touches them.
+    """
+    
+    def __init__(self, result_cache_size: int = 4096):
+        self._keys: List[Tuple[str, Suggestion, bool]] = []
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        self._groups: Dict[Suggestion, Dict[str, int]] = {}
+        self._group_weights: Dict[Suggestion, int] = {}
+        self._heavy: Dict[str, Ranked] = {}
+        self._heavy_stale: Set[str] = set()
+        # Heavy prefixes whose list had to drop candidates (everything dropped ranks below its tail)
+        self._heavy_truncated: Set[str] = set()
+        self._results: "OrderedDict[str, Ranked]" = OrderedDict()
+        self.result_cache_size = result_cache_size
+        self.max_limit = int(os.getenv("SUGGEST_MAX_LIMIT", "20"))
+        
+        self.ready = False
+        self.warmed_at: Optional[str] = None
+        self.warm_ms = 0.0
+        self.queries = 0
+        self.cache_hits = 0
+        
+        # Writes that land while a rebuild is streaming, replayed onto the new data before the swap
+        self._replay: Optional[List[tuple]] = None
+    
+    def __len__(self) -> int:
+        return len(self._docs)
+    
+    def upsert(self, manhwa: Dict[str, Any]) -> None:
+        if self._replay is not None:
+            self._replay.append(("upsert", manhwa))
+        self._apply(manhwa["id"], manhwa)
+    
+    def remove(self, manhwa_id: str) -> bool:
+        if self._replay is not None:
+            self._replay.append(("remove", manhwa_id))
+        return self._apply(manhwa_id, None)
+    
+    def suggest(self, prefix: str, limit: int = 8) -> List[Dict[str, Any]]:
+        """Most popular titles, authors and genres that `prefix` starts (a word of)"""
+        prefix = normalize_prefix(prefix)
+        if not prefix:
+            return []
+        self.queries += 1
+        
+        if prefix in self._heavy:
+            if prefix in self._heavy_stale:
+                self._rank_heavy(prefix, *self._range(prefix))
+                self._heavy_stale.discard(prefix)
+            ranked = self._heavy[prefix]
+        else:
+            ranked = self._results.get(prefix)
+            if ranked is not None:
+                self._results.move_to_end(prefix)
+                self.cache_hits += 1
+            else:
+                ranked = self._rank(prefix)
+                self._results[prefix] = ranked
+                if len(self._results) > self.result_cache_size:
+                    self._results.popitem(last=False)
+        
+        suggestions = []
+        for score, (kind, key) in ranked[:limit]:
+            if kind == "title":
+                suggestions.append({"text": self._docs[key]["title"], "type": kind, "id": key, "score": score})
+            else:
+                suggestions.append({"text": key, "type": kind, "id": None, "score": score})
+        return suggestions
+    
+    async def warm(self, oracle_client) -> int:
+        """Rebuild from Oracle without blocking queries; the current data serves until the swap"""
+        start = time.perf_counter()
+        fresh = SuggestIndex(self.result_cache_size)
+        self._replay = []
+        try:
+            rows = [manhwa async for manhwa in oracle_client.iter_all_manhwa()]
+            # Sorting and ranking every heavy prefix is CPU work; keep it off the event loop
+            await asyncio.to_thread(fresh._build, rows)
+            
+            # No await between replay and swap, so no write can slip in between
+            for op in self._replay:
+                if op[0] == "upsert":
+                    fresh._apply(op[1]["id"], op[1])
+                else:
+                    fresh._apply(op[1], None)
+        finally:
+            self._replay = None
+        
+        self._keys, self._docs = fresh._keys, fresh._docs
+        self._groups, self._group_weights = fresh._groups, fresh._group_weights
+        self._heavy, self._heavy_stale, self._heavy_truncated = fresh._heavy, fresh._heavy_stale, fresh._heavy_truncated
+        self._results.clear()
+        self.ready = True
+        self.warmed_at = datetime.now().isoformat()
+        self.warm_ms = round((time.perf_counter() - start) * 1000, 2)
+        logger.info(f"Suggest index warmed with {len(self)} manhwa ({len(self._keys)} keys) in {self.warm_ms} ms")
+        return len(self)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "entries": len(self),
+            "keys": len(self._keys),
+            "authors": sum(1 for kind, _ in self._groups if kind == "author"),
+            "genres": sum(1 for kind, _ in self._groups if kind == "genre"),
+            "heavy_prefixes": len(self._heavy),
+            "cached_prefixes": len(self._results),
+            "queries": self.queries,
+            "cache_hits": self.cache_hits,
+            "warmed_at": self.warmed_at,
+            "warm_ms": self.warm_ms
+        }
+    
+    def _build(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for manhwa in rows:
+            self._keys.extend(self._add_doc(manhwa))
+        self._keys.sort()
+        
+        # Split the sorted keys into same-prefix runs one character deeper at a time,
+        # descending only into runs that are still heavy
+        pending = [(0, len(self._keys), 1)]
+        while pending:
+            low, high, length = pending.pop()
+            index = low
+            while index < high:
+                key = self._keys[index][0]
+                if len(key) < length:
+                    index += 1
+                    continue
+                prefix = key[:length]
+                end = bisect_left(self._keys, (_prefix_end(prefix),), index, high)
+                if end - index > HEAVY_PREFIX_KEYS:
+                    self._rank_heavy(prefix, index, end)
+                    pending.append((index, end, length + 1))
+                index = end
+    
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        low = bisect_left(self._keys, (prefix,))
+        return low, bisect_left(self._keys, (_prefix_end(prefix),), low)
+    
+    def _rank(self, prefix: str) -> Ranked:
+        return self._top(self._candidates(*self._range(prefix)), self.max_limit)
+    
+    def _rank_heavy(self, prefix: str, low: int, high: int) -> None:
+        candidates = self._candidates(low, high)
+        capacity = self.max_limit * HEAVY_HEADROOM
+        self._heavy[prefix] = self._top(candidates, capacity)
+        if len(candidates) > capacity:
+            self._heavy_truncated.add(prefix)
+        else:
+            self._heavy_truncated.discard(prefix)
+    
+    def _candidates(self, low: int, high: int) -> Dict[Suggestion, float]:
+        best: Dict[Suggestion, float] = {}
+        for index in range(low, high):
+            _, suggestion, word_start = self._keys[index]
+            score = self._score(suggestion, word_start)
+            # A title can match at several words; keep its best entry point
+            if score > best.get(suggestion, -1.0):
+                best[suggestion] = score
+        return best
+    
+    def _top(self, candidates: Dict[Suggestion, float], size: int) -> Ranked:
+        top = heapq.nlargest(size, candidates.items(), key=lambda item: (item[1], item[0]))
+        return [(score, suggestion) for suggestion, score in top]
+    
+    def _score(self, suggestion: Suggestion, word_start: bool) -> float:
+        if suggestion[0] == "title":
+            # +1 so unviewed manhwa still rank by match position
+            weight = self._docs[suggestion[1]]["view_count"] + 1
+        else:
+            weight = self._group_weights.get(suggestion, 0) + 1
+        return float(weight) * (WORD_START_FACTOR if word_start else 1.0)
+    
+    def _suggestion_keys(self, suggestion: Suggestion) -> List[Tuple[str, bool]]:
+        if suggestion[0] == "title":
+            doc = self._docs.get(suggestion[1])
+            return _entry_keys(doc["title"]) if doc else []
+        return _entry_keys(suggestion[1]) if suggestion in self._groups else []
+    
+    def _apply(self, manhwa_id: str, manhwa: Optional[Dict[str, Any]]) -> bool:
+        """Replace (or with None, remove) one manhwa and patch every answer it can change"""
+        old = self._docs.get(manhwa_id)
+        touched = {("title", manhwa_id)}
+        for doc in (old, manhwa):
+            if doc:
+                touched.add(("author", doc.get("author") or ""))
+                touched.update(("genre", genre) for genre in doc.get("genre") or [])
+        touched.discard(("author", ""))
+        
+        # Keys as they were, so prefixes a renamed title no longer matches are patched too
+        old_keys = {suggestion: self._suggestion_keys(suggestion) for suggestion in touched}
+        
+        removed = self._remove(manhwa_id)
+        if manhwa is not None:
+            for entry in self._add_doc(manhwa):
+                insort(self._keys, entry)
+        
+        for suggestion in touched:
+            keys = self._suggestion_keys(suggestion)
+            prefixes = set()
+            for key, _ in old_keys[suggestion] + keys:
+                for length in range(1, len(key) + 1):
+                    prefixes.add(key[:length])
+            for prefix in prefixes:
+                if prefix in self._heavy:
+                    self._patch_heavy(prefix, suggestion, keys)
+                else:
+                    self._results.pop(prefix, None)
+        return removed
+    
+    def _patch_heavy(self, prefix: str, suggestion: Suggestion, keys: List[Tuple[str, bool]]) -> None:
+        if prefix in self._heavy_stale:
+            return
+        ranked = [entry for entry in self._heavy[prefix] if entry[1] != suggestion]
+        truncated = prefix in self._heavy_truncated
+        
+        scores = [self._score(suggestion, word_start) for key, word_start in keys if key.startswith(prefix)]
+        if scores:
+            entry = (max(scores), suggestion)
+            # Below a truncated list's tail it ranks among the dropped candidates, so it stays out
+            if not truncated or (ranked and entry > ranked[-1]):
+                ranked.append(entry)
+                ranked.sort(reverse=True)
+        
+        capacity = self.max_limit * HEAVY_HEADROOM
+        if len(ranked) > capacity:
+            ranked = ranked[:capacity]
+            self._heavy_truncated.add(prefix)
+        elif truncated and len(ranked) < self.max_limit:
+            # Too few kept to answer exactly; re-rank from the keys on next use
+            self._heavy_stale.add(prefix)
+        self._heavy[prefix] = ranked
+    
+    def _add_doc(self, manhwa: Dict[str, Any]) -> List[Tuple[str, Suggestion, bool]]:
+        """Record a manhwa and return the keys it adds; a new author or genre brings its own keys"""
+        manhwa_id = manhwa["id"]
+        view_count = int(manhwa.get("view_count") or 0)
+        self._docs[manhwa_id] = {
+            "title": manhwa.get("title") or "",
+            "author": manhwa.get("author") or "",
+            "genre": list(manhwa.get("genre") or []),
+            "view_count": view_count
+        }
+        
+        added = [(key, ("title", manhwa_id), word_start) for key, word_start in _entry_keys(manhwa.get("title"))]
+        for group in [("author", manhwa.get("author"))] + [("genre", genre) for genre in manhwa.get("genre") or []]:
+            if not group[1]:
+                continue
+            if group not in self._groups:
+                self._groups[group] = {}
+                self._group_weights[group] = 0
+                added.extend((key, group, word_start) for key, word_start in _entry_keys(group[1]))
+            self._groups[group][manhwa_id] = view_count
+            self._group_weights[group] += view_count
+        return added
+    
+    def _remove(self, manhwa_id: str) -> bool:
+        doc = self._docs.pop(manhwa_id, None)
+        if doc is None:
+            return False
+        
+        removed = [(key, ("title", manhwa_id), word_start) for key, word_start in _entry_keys(doc["title"])]
+        for group in [("author", doc["author"])] + [("genre", genre) for genre in doc["genre"]]:
+            members = self._groups.get(group)
+            if members is None or manhwa_id not in members:
+                continue
+            self._group_weights[group] -= members.pop(manhwa_id)
+            if not members:
+                # Last manhwa by this author / in this genre: the name stops being suggested
+                del self._groups[group]
+                del self._group_weights[group]
+                removed.extend((key, group, word_start) for key, word_start in _entry_keys(group[1]))
+        
+        for entry in removed:
+            index = bisect_left(self._keys, entry)
+            if index < len(self._keys) and self._keys[index] == entry:
+                del self._keys[index]
+        return True
+
+def suggest_index_enabled() -> bool:
+    return os.getenv("SUGGEST_INDEX_ENABLED", "true").lower() == "true"
+
+# Global index and its refresher
+_suggest_index: Optional[SuggestIndex] = None
+_refresher: Optional[IndexRefresher] = None
+
+def get_suggest_index() -> Optional[SuggestIndex]:
+    """Get the global suggest index, or None if it's disabled or not started"""
+    return _suggest_index
+
+async def initialize_suggest_index(oracle_client) -> None:
+    """Create the global suggest index and start warming it from Oracle"""
+    global _suggest_index, _refresher
+    
+    if _suggest_index is None:
+        _suggest_index = SuggestIndex()
+        # Refreshes also pick up view counts flushed since the last warm
+        _refresher = IndexRefresher(
+            "suggest", _suggest_index, oracle_client,
+            refresh_interval_seconds=float(os.getenv("SUGGEST_INDEX_REFRESH_SECONDS", "300"))
+        )
+        await _refresher.start()
+        logger.info("Global suggest index initialized")
+    else:
+        logger.warning("Suggest index already initialized")
+
+async def shutdown_suggest_index() -> None:
+    global _suggest_index, _refresher
+    
+    if _refresher:
+        await _refresher.stop()
+    _suggest_index = None
+    _refresher = None
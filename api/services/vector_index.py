@@ -0,0 +1,281 @@
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from services.embedding_provider import VECTOR_DIMENSION
+from services.index_refresher import IndexRefresher
+
+logger = logging.getLogger(__name__)
+
+# Row fields kept next to each vector so index hits don't need an Oracle read
+RESULT_FIELDS = ("id", "title", "author", "genre", "status", "description", "cover_image", "rating", "view_count")
+
+class VectorIndex:
+    """In-process exact nearest-neighbour index over manhwa embeddings, Oracle stays the source of truth
+    
+    Vectors live L2-normalized in one contiguous float32 matrix, so a query is a single
+    matrix-vector product plus a partial sort. Genre and status filters are boolean masks
+    per value, applied before scoring. Deletes move the last row into the hole so the
+    live rows stay contiguous.
+    
+    Scores follow Oracle's VECTOR_DISTANCE(COSINE): `similarity_score` is a distance,
+    lower is closer, so results are interchangeable with `OracleClient.search_similar_manhwa`.
+    """
+    
+    def __init__(self, dimension: int = VECTOR_DIMENSION, capacity: int = 1024):
+        self.dimension = dimension
+        self._vectors = np.zeros((capacity, dimension), dtype=np.float32)
+        self._rows: List[Dict[str, Any]] = []
+        self._positions: Dict[str, int] = {}
+        self._genre_masks: Dict[str, np.ndarray] = {}
+        self._status_masks: Dict[str, np.ndarray] = {}
+        
+        self.ready = False
+        self.warmed_at: Optional[str] = None
+        self.warm_ms = 0.0
+        self.queries = 0
+        self.query_seconds = 0.0
+        
+        # Writes that land while a rebuild is streaming, replayed onto the new data before the swap
+        self._replay: Optional[List[tuple]] = None
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def __contains__(self, manhwa_id: str) -> bool:
+        return manhwa_id in self._positions
+    
+    def upsert(self, manhwa: Dict[str, Any], embedding: Sequence[float]) -> None:
+        """Add or replace one manhwa; rows without an embedding are dropped, as Oracle search skips them"""
+        if self._replay is not None:
+            self._replay.append(("upsert", manhwa, embedding))
+        self._upsert(manhwa, embedding)
+    
+    def remove(self, manhwa_id: str) -> bool:
+        if self._replay is not None:
+            self._replay.append(("remove", manhwa_id))
+        return self._remove(manhwa_id)
+    
+    def update_vector(self, manhwa_id: str, embedding: Sequence[float]) -> bool:
+        """Replace the vector of an indexed manhwa; False if it isn't indexed yet"""
+        position = self._positions.get(manhwa_id)
+        if position is None:
+            return False
+        self.upsert(self._rows[position], embedding)
+        return True
+    
+    def get_vector(self, manhwa_id: str) -> Optional[np.ndarray]:
+        position = self._positions.get(manhwa_id)
+        return None if position is None else self._vectors[position].copy()
+    
+    def search(self, query_embedding: Sequence[float], limit: int = 10, exclude_id: Optional[str] = None,
+               genre: Optional[str] = None, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Nearest manhwa to `query_embedding`, optionally pre-filtered by genre and status"""
+        return self.search_many([{
+            "embedding": query_embedding, "limit": limit, "exclude_id": exclude_id, "genre": genre, "status": status
+        }])[0]
+    
+    def search_many(self, searches: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Run several searches in one pass, results in the same order as `searches`
+        
+        Each search is a dict of `search` arguments with the vector under `embedding`.
+        Searches sharing a genre/status filter are scored together with one matrix product.
+        """
+        start = time.perf_counter()
+        groups: Dict[tuple, List[int]] = {}
+        for position, search in enumerate(searches):
+            groups.setdefault((search.get("genre"), search.get("status")), []).append(position)
+        
+        results: List[List[Dict[str, Any]]] = [[] for _ in searches]
+        for (genre, status), positions in groups.items():
+            candidates = self._candidates(genre, status)
+            if candidates is not None and len(candidates) == 0:
+                continue
+            
+            queries = np.stack([self._normalize(searches[position]["embedding"]) for position in positions])
+            vectors = self._vectors[:len(self._rows)] if candidates is None else self._vectors[candidates]
+            for position, scores in zip(positions, queries @ vectors.T):
+                search = searches[position]
+                results[position] = self._top(candidates, scores, search.get("limit", 10), search.get("exclude_id"))
+        
+        self.queries += len(searches)
+        self.query_seconds += time.perf_counter() - start
+        return results
+    
+    async def warm(self, oracle_client) -> int:
+        """Rebuild from Oracle without blocking queries; the current data serves until the swap"""
+        start = time.perf_counter()
+        fresh = VectorIndex(self.dimension, capacity=max(1024, self._vectors.shape[0]))
+        self._replay = []
+        try:
+            async for manhwa in oracle_client.iter_manhwa_embeddings():
+                fresh._upsert(manhwa, manhwa["embedding"])
+            
+            # No await between replay and swap, so no write can slip in between
+            for op in self._replay:
+                if op[0] == "upsert":
+                    fresh._upsert(op[1], op[2])
+                else:
+                    fresh._remove(op[1])
+        finally:
+            self._replay = None
+        
+        self._vectors, self._rows, self._positions = fresh._vectors, fresh._rows, fresh._positions
+        self._genre_masks, self._status_masks = fresh._genre_masks, fresh._status_masks
+        self.ready = True
+        self.warmed_at = datetime.now().isoformat()
+        self.warm_ms = round((time.perf_counter() - start) * 1000, 2)
+        logger.info(f"Vector index warmed with {len(self)} manhwa in {self.warm_ms} ms")
+        return len(self)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "entries": len(self),
+            "capacity": self._vectors.shape[0],
+            "dimension": self.dimension,
+            "matrix_bytes": self._vectors.nbytes,
+            "genres": len(self._genre_masks),
+            "statuses": len(self._status_masks),
+            "warmed_at": self.warmed_at,
+            "warm_ms": self.warm_ms,
+            "queries": self.queries,
+            "avg_query_us": round(self.query_seconds / self.queries * 1e6, 1) if self.queries else 0.0
+        }
+    
+    def _normalize(self, embedding: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        if vector.shape[0] != self.dimension:
+            raise ValueError(f"Expected a {self.dimension}-dim vector, got {vector.shape[0]}")
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+    
+    def _candidates(self, genre: Optional[str], status: Optional[str]) -> Optional[np.ndarray]:
+        """Row positions passing the filters, or None when there are no filters"""
+        count = len(self._rows)
+        mask = None
+        for masks, value in ((self._genre_masks, genre), (self._status_masks, status)):
+            if value:
+                value_mask = masks.get(value)
+                if value_mask is None:
+                    return np.empty(0, dtype=np.intp)
+                mask = value_mask[:count] if mask is None else mask & value_mask[:count]
+        return None if mask is None else np.flatnonzero(mask)
+    
+    def _top(self, candidates: Optional[np.ndarray], scores: np.ndarray, limit: int,
+             exclude_id: Optional[str]) -> List[Dict[str, Any]]:
+        if exclude_id is not None and exclude_id in self._positions:
+            position = self._positions[exclude_id]
+            if candidates is None:
+                scores[position] = -np.inf
+            else:
+                scores[candidates == position] = -np.inf
+        
+        limit = min(limit, len(scores))
+        if limit <= 0:
+            return []
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        
+        return [
+            {**self._rows[i if candidates is None else candidates[i]], "similarity_score": float(1.0 - scores[i])}
+            for i in top if scores[i] != -np.inf
+        ]
+    
+    def _upsert(self, manhwa: Dict[str, Any], embedding: Optional[Sequence[float]]) -> None:
+        manhwa_id = manhwa["id"]
+        if embedding is None:
+            self._remove(manhwa_id)
+            return
+        
+        position = self._positions.get(manhwa_id)
+        if position is None:
+            position = len(self._rows)
+            if position == self._vectors.shape[0]:
+                self._grow()
+            self._rows.append({})
+            self._positions[manhwa_id] = position
+        else:
+            self._set_filters(position, self._rows[position], False)
+        
+        row = {field: manhwa.get(field) for field in RESULT_FIELDS}
+        self._vectors[position] = self._normalize(embedding)
+        self._rows[position] = row
+        self._set_filters(position, row, True)
+    
+    def _remove(self, manhwa_id: str) -> bool:
+        position = self._positions.pop(manhwa_id, None)
+        if position is None:
+            return False
+        
+        self._set_filters(position, self._rows[position], False)
+        last = len(self._rows) - 1
+        if position != last:
+            moved = self._rows[last]
+            self._set_filters(last, moved, False)
+            self._vectors[position] = self._vectors[last]
+            self._rows[position] = moved
+            self._positions[moved["id"]] = position
+            self._set_filters(position, moved, True)
+        self._rows.pop()
+        return True
+    
+    def _set_filters(self, position: int, row: Dict[str, Any], value: bool) -> None:
+        for genre in row.get("genre") or []:
+            self._mask(self._genre_masks, genre)[position] = value
+        if row.get("status"):
+            self._mask(self._status_masks, row["status"])[position] = value
+    
+    def _mask(self, masks: Dict[str, np.ndarray], key: str) -> np.ndarray:
+        if key not in masks:
+            masks[key] = np.zeros(self._vectors.shape[0], dtype=bool)
+        return masks[key]
+    
+    def _grow(self) -> None:
+        capacity = self._vectors.shape[0] * 2
+        vectors = np.zeros((capacity, self.dimension), dtype=np.float32)
+        vectors[:len(self._rows)] = self._vectors[:len(self._rows)]
+        self._vectors = vectors
+        for masks in (self._genre_masks, self._status_masks):
+            for key, mask in masks.items():
+                grown = np.zeros(capacity, dtype=bool)
+                grown[:mask.shape[0]] = mask
+                masks[key] = grown
+
+def vector_index_enabled() -> bool:
+    return os.getenv("VECTOR_INDEX_ENABLED", "false").lower() == "true"
+
+# Global index and its refresher
+_vector_index: Optional[VectorIndex] = None
+_refresher: Optional[IndexRefresher] = None
+
+def get_vector_index() -> Optional[VectorIndex]:
+    """Get the global vector index, or None if it's disabled or not started"""
+    return _vector_index
+
+async def initialize_vector_index(oracle_client) -> None:
+    """Create the global vector index and start warming it from Oracle"""
+    global _vector_index, _refresher
+    
+    if _vector_index is None:
+        _vector_index = VectorIndex()
+        _refresher = IndexRefresher(
+            "vector", _vector_index, oracle_client,
+            refresh_interval_seconds=float(os.getenv("VECTOR_INDEX_REFRESH_SECONDS", "300"))
+        )
+        await _refresher.start()
+        logger.info("Global vector index initialized")
+    else:
+        logger.warning("Vector index already initialized")
+
+async def shutdown_vector_index() -> None:
+    global _vector_index, _refresher
+    
+    if _refresher:
+        await _refresher.stop()
+    _vector_index = None
+    _refresher = None
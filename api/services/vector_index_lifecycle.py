@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+def _latency_stats(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 2),
+        "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 2)
+    }
+
+class VectorIndexLifecycle:
+    """Admin operations on Oracle's manhwa_vector_idx: background rebuilds, status and recall checks
+    
+    A rebuild builds a replacement index with the requested organization (IVF or HNSW) and
+    build parameters next to the current one, then swaps it in. It runs as a background task
+    since a large catalog takes minutes, and only one runs at a time.
+    """
+    
+    def __init__(self, oracle_client):
+        self.oracle_client = oracle_client
+        self._task: Optional[asyncio.Task] = None
+        
+        # Last rebuild requested through this process
+        self.rebuild: Optional[Dict[str, Any]] = None
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def start_rebuild(self, index_type: str, accuracy: int, parameters: Dict[str, int], parallel: Optional[int] = None) -> bool:
+        """Rebuild in the background; False if a rebuild is already running, ValueError for a bad spec"""
+        from dal.oracle_client import vector_index_ddl
+        
+        if self.running:
+            return False
+        # Fail on a bad spec here rather than in the background task
+        vector_index_ddl(index_type, accuracy, parameters, parallel=parallel)
+        
+        self.rebuild = {
+            "state": "running",
+            "index_type": index_type.upper(),
+            "accuracy": accuracy,
+            "parameters": parameters,
+            "parallel": parallel,
+            "started_at": datetime.now().isoformat(),
+            "finished_at": None,
+            "build_seconds": None,
+            "error": None
+        }
+        self._task = asyncio.create_task(self._rebuild(index_type, accuracy, parameters, parallel))
+        return True
+    
+    async def _rebuild(self, index_type: str, accuracy: int, parameters: Dict[str, int], parallel: Optional[int]) -> None:
+        start = time.perf_counter()
+        logger.info(f"Rebuilding vector index as {index_type.upper()} (target accuracy {accuracy}, {parameters})")
+        try:
+            await self.oracle_client.rebuild_vector_index(index_type, accuracy, parameters, parallel=parallel)
+            self.rebuild["state"] = "completed"
+        except asyncio.CancelledError:
+            # The statement in flight still runs to completion on the database
+            self.rebuild["state"] = "cancelled"
+            raise
+        except Exception as e:
+            self.rebuild["state"] = "failed"
+            self.rebuild["error"] = str(e)
+            logger.error(f"Vector index rebuild failed: {e}")
+        finally:
+            self.rebuild["finished_at"] = datetime.now().isoformat()
+            self.rebuild["build_seconds"] = round(time.perf_counter() - start, 1)
+            logger.info(f"Vector index rebuild {self.rebuild['state']} after {self.rebuild['build_seconds']}s")
+    
+    async def stop(self) -> None:
+        if self.running:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+    
+    async def get_status(self) -> Dict[str, Any]:
+        from dal.oracle_client import get_vector_search_accuracy
+        
+        try:
+            index = await self.oracle_client.get_vector_index_info()
+        except Exception as e:
+            index = {"error": str(e)}
+        return {
+            "index": index,
+            "search_accuracy": get_vector_search_accuracy(),
+            "rebuild": self.rebuild
+        }
+    
+    async def measure_recall(self, accuracy: int, k: int = 10, samples: int = 50, genre: Optional[str] = None) -> Dict[str, Any]:
+        """Recall@k of approximate searches at `accuracy` against exact ones, from stored manhwa vectors
+        
+        Each sampled manhwa is used as a "more like this" query, through
+        `search_manhwa_hybrid` when `genre` is given and `search_similar_manhwa` otherwise.
+        """
+        manhwa_ids = await self.oracle_client.sample_manhwa_ids(samples)
+        embeddings = await self.oracle_client.get_manhwa_embeddings(manhwa_ids)
+        
+        async def run(manhwa_id: str, embedding, target: int) -> List[Dict[str, Any]]:
+            if genre:
+                # Hybrid search has no exclusion, so fetch one extra and drop the query manhwa
+                results = await self.oracle_client.search_manhwa_hybrid(embedding, genre_filter=genre, limit=k + 1, accuracy=target)
+                return [result for result in results if result["id"] != manhwa_id][:k]
+            return await self.oracle_client.search_similar_manhwa(embedding, k, exclude_id=manhwa_id, accuracy=target)
+        
+        recalls: List[float] = []
+        exact_seconds: List[float] = []
+        approx_seconds: List[float] = []
+        for manhwa_id, embedding in embeddings.items():
+            start = time.perf_counter()
+            exact = await run(manhwa_id, embedding, 100)
+            exact_seconds.append(time.perf_counter() - start)
+            
+            start = time.perf_counter()
+            approx = await run(manhwa_id, embedding, accuracy)
+            approx_seconds.append(time.perf_counter() - start)
+            
+            if exact:
+                recalls.append(len({r["id"] for r in exact} & {r["id"] for r in approx}) / len(exact))
+        
+        if not recalls:
+            return {"accuracy": accuracy, "k": k, "genre": genre, "samples": 0, "message": "No embedded manhwa to sample"}
+        return {
+            "accuracy": accuracy,
+            "k": k,
+            "genre": genre,
+            "samples": len(recalls),
+            "recall": round(sum(recalls) / len(recalls), 4),
+            "min_recall": round(min(recalls), 4),
+            "exact": _latency_stats(exact_seconds),
+            "approx": _latency_stats(approx_seconds)
+        }
+
+# Global lifecycle manager, created on first use
+_lifecycle: Optional[VectorIndexLifecycle] = None
+
+def get_vector_index_lifecycle(oracle_client=None) -> Optional[VectorIndexLifecycle]:
+    """Get the global vector index lifecycle manager, creating it if an Oracle client is given"""
+    global _lifecycle
+    
+    if _lifecycle is None and oracle_client is not None:
+        _lifecycle = VectorIndexLifecycle(oracle_client)
+    return _lifecycle
+
+async def shutdown_vector_index_lifecycle() -> None:
+    global _lifecycle
+    
+    if _lifecycle:
+        await _lifecycle.stop()
+    _lifecycle = None
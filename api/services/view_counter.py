@@ -0,0 +1,150 @@
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Optional, Dict, Any
+import os
+
+logger = logging.getLogger(__name__)
+
+class ViewCounterBuffer:
+    """Write-behind buffer that coalesces page views per manhwa and flushes them in batches"""
+    
+    def __init__(self, oracle_client):
+        self.oracle_client = oracle_client
+        self.running = False
+        
+        # Configuration from environment variables
+        self.flush_interval_seconds = float(os.getenv("VIEW_COUNT_FLUSH_INTERVAL_SECONDS", "10"))
+        self.flush_threshold = int(os.getenv("VIEW_COUNT_FLUSH_THRESHOLD", "1000"))
+        
+        self._pending: Counter = Counter()
+        self._pending_total = 0
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._threshold_task: Optional[asyncio.Task] = None
+        
+        # Metrics
+        self.flushed_views = 0
+        self.flush_count = 0
+        self.failed_flushes = 0
+        self.last_flush_at: Optional[str] = None
+        
+        logger.info(f"ViewCounterBuffer initialized - Interval: {self.flush_interval_seconds}s, Threshold: {self.flush_threshold}")
+    
+    def record(self, manhwa_id: str, views: int = 1) -> None:
+        """Record page views; flushes early once the size threshold is reached"""
+        self._pending[manhwa_id] += views
+        self._pending_total += views
+        
+        if self._pending_total >= self.flush_threshold and (self._threshold_task is None or self._threshold_task.done()):
+            self._threshold_task = asyncio.create_task(self.flush())
+    
+    @property
+    def unflushed_views(self) -> int:
+        return self._pending_total
+    
+    async def flush(self) -> int:
+        """Write all pending increments to Oracle; returns the number of views flushed"""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            
+            batch, total = self._pending, self._pending_total
+            self._pending, self._pending_total = Counter(), 0
+            
+            try:
+                await self.oracle_client.increment_view_counts(dict(batch))
+            except asyncio.CancelledError:
+                self._pending.update(batch)
+                self._pending_total += total
+                raise
+            except Exception as e:
+                # Put the views back so the next flush retries them
+                self._pending.update(batch)
+                self._pending_total += total
+                self.failed_flushes += 1
+                logger.error(f"Failed to flush {total} view counts: {e}")
+                return 0
+            
+            self.flushed_views += total
+            self.flush_count += 1
+            self.last_flush_at = datetime.now().isoformat()
+            logger.debug(f"Flushed {total} views across {len(batch)} manhwa")
+            return total
+    
+    async def start(self):
+        """Start the periodic flush task"""
+        if self.running:
+            return
+        
+        self.running = True
+        self._flush_task = asyncio.create_task(self._periodic_flush())
+    
+    async def stop(self):
+        """Stop the periodic flush and write out anything still buffered"""
+        if not self.running:
+            return
+        
+        self.running = False
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        
+        if self._threshold_task and not self._threshold_task.done():
+            await self._threshold_task
+        
+        flushed = await self.flush()
+        logger.info(f"View counter stopped - flushed {flushed} remaining views")
+    
+    async def _periodic_flush(self):
+        while self.running:
+            await asyncio.sleep(self.flush_interval_seconds)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error in periodic view count flush: {e}")
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get buffer metrics"""
+        return {
+            "running": self.running,
+            "unflushed_views": self._pending_total,
+            "unflushed_manhwa": len(self._pending),
+            "flushed_views": self.flushed_views,
+            "flush_count": self.flush_count,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_at": self.last_flush_at,
+            "flush_interval_seconds": self.flush_interval_seconds,
+            "flush_threshold": self.flush_threshold
+        }
+
+# Global view counter instance
+_view_counter: Optional[ViewCounterBuffer] = None
+
+def get_view_counter() -> Optional[ViewCounterBuffer]:
+    """Get the global view counter instance"""
+    return _view_counter
+
+async def initialize_view_counter(oracle_client):
+    """Initialize and start the global view counter"""
+    global _view_counter
+    
+    if _view_counter is None:
+        _view_counter = ViewCounterBuffer(oracle_client)
+        await _view_counter.start()
+        logger.info("Global view counter initialized")
+    else:
+        logger.warning("View counter already initialized")
+
+async def shutdown_view_counter():
+    """Flush and stop the global view counter"""
+    global _view_counter
+    
+    if _view_counter:
+        await _view_counter.stop()
+        _view_counter = None
+        logger.info("Global view counter shutdown")
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Tests import modules the way the app does (services.*, rest.*) plus the shared dal package
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [API_DIR, os.path.dirname(API_DIR)]
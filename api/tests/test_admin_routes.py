@@ -0,0 +1,17 @@
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from rest.manhwa_import import router
+
+def test_import_health_reports_the_container_services(monkeypatch):
+    monkeypatch.setattr("rest.manhwa_import.get_scheduler", lambda: SimpleNamespace(running=True))
+    app = FastAPI()
+    app.state.services = SimpleNamespace(manhwa_service=object(), import_service=object(), minio_client=object())
+    app.include_router(router, prefix="/api/v1/admin")
+    
+    response = TestClient(app).get("/api/v1/admin/import/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+    assert all(response.json()["checks"].values())
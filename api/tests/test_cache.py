@@ -0,0 +1,40 @@
+import asyncio
+import time
+
+from services.cache import MemoryCache
+
+def test_entries_expire_after_their_ttl(monkeypatch):
+    cache = MemoryCache()
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    
+    asyncio.run(cache.set("k", {"v": 1}, ttl=30))
+    assert asyncio.run(cache.get("k")) == {"v": 1}
+    now[0] += 31
+    assert asyncio.run(cache.get("k")) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_least_recently_used_entry_is_evicted():
+    cache = MemoryCache(max_entries=2)
+    
+    async def fill():
+        await cache.set("a", 1, ttl=0)
+        await cache.set("b", 2, ttl=0)
+        await cache.get("a")
+        await cache.set("c", 3, ttl=0)
+        return [await cache.get(key) for key in ("a", "b", "c")]
+    
+    assert asyncio.run(fill()) == [1, None, 3]
+    assert cache.evictions == 1
+
+def test_counters_survive_eviction_and_clear():
+    cache = MemoryCache(max_entries=1)
+    
+    async def bump():
+        await cache.incr("generation")
+        await cache.set("a", 1, ttl=0)
+        await cache.set("b", 2, ttl=0)
+        await cache.clear()
+        return await cache.incr("generation")
+    
+    assert asyncio.run(bump()) == 2
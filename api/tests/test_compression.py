@@ -0,0 +1,93 @@
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from rest import compression
+from rest.compression import CompressionMiddleware, _parse_accept_encoding
+
+BODY = "manhwa " * 500
+
+def _client() -> TestClient:
+    app = FastAPI()
+    
+    @app.get("/text")
+    async def text():
+        return PlainTextResponse(BODY)
+    
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("tiny")
+    
+    @app.get("/image")
+    async def image():
+        return Response(b"\x89PNG" + b"0" * 4000, media_type="image/png")
+    
+    @app.get("/vary")
+    async def vary():
+        return PlainTextResponse(BODY, headers={"Vary": "Origin"})
+    
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(iter([BODY.encode()[:1000], BODY.encode()[1000:]]), media_type="text/plain")
+    
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return TestClient(app)
+
+def _get(client: TestClient, path: str, accept_encoding: str):
+    # Read the raw bytes so the test client doesn't decode them for us
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+def test_accept_encoding_parsing():
+    assert _parse_accept_encoding("gzip;q=0.5, br, identity;q=0, bad;q=x") == {
+        "gzip": 0.5, "br": 1.0, "identity": 0.0, "bad": 0.0
+    }
+
+def test_gzip_when_brotli_is_not_available(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    response, raw = _get(_client(), "/text", "br, gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(raw)
+    assert gzip.decompress(raw).decode() == BODY
+
+def test_brotli_preferred_when_installed():
+    brotli = pytest.importorskip("brotli")
+    response, raw = _get(_client(), "/text", "gzip, br")
+    assert response.headers["content-encoding"] == "br"
+    assert brotli.decompress(raw).decode() == BODY
+
+def test_refused_codings_small_bodies_and_binary_media_are_sent_as_is(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    client = _client()
+    for path, accept_encoding in (("/text", "gzip;q=0"), ("/text", "identity"), ("/text", ""), ("/small", "gzip"), ("/image", "gzip")):
+        response, _ = _get(client, path, accept_encoding)
+        assert "content-encoding" not in response.headers, (path, accept_encoding)
+        # A shared cache must not hand this uncompressed copy to a client that asked for gzip, or the reverse
+        if path != "/image":
+            assert response.headers["vary"] == "Accept-Encoding", (path, accept_encoding)
+    assert "vary" not in _get(client, "/image", "gzip")[0].headers
+    
+    # A wildcard accepts gzip
+    assert _get(client, "/text", "*")[0].headers["content-encoding"] == "gzip"
+
+def test_streaming_responses_are_compressed_chunk_by_chunk(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    response, raw = _get(_client(), "/stream", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert zlib.decompress(raw, 31).decode() == BODY
+
+def test_vary_is_merged_into_an_existing_header(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    client = _client()
+    for accept_encoding in ("gzip", ""):
+        response, _ = _get(client, "/vary", accept_encoding)
+        assert response.headers.get_list("vary") == ["Origin, Accept-Encoding"]
+    
+    assert compression._vary_accept_encoding([(b"Vary", b"*")]) == [(b"Vary", b"*")]
+    assert compression._vary_accept_encoding([(b"vary", b"accept-encoding")]) == [(b"vary", b"accept-encoding")]
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+
+from services.container import ServiceContainer
+from services.startup_report import StartupReport
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_services_are_built_on_first_use_and_shared(monkeypatch):
+    monkeypatch.setenv("ORACLE_SKIP", "1")
+    report = StartupReport()
+    monkeypatch.setattr("services.container.get_startup_report", lambda: report)
+    
+    container = ServiceContainer()
+    assert not any(container.initialized().values())
+    
+    service = container.manhwa_service
+    assert container.manhwa_service is service
+    assert service.oracle_client is None
+    
+    initialized = container.initialized()
+    assert initialized["manhwa_service"] and initialized["oracle_client"]
+    assert not initialized["search_service"] and not initialized["minio_client"]
+    
+    # Each service is timed once; the report isn't marked ready, so both count as startup
+    assert sorted(entry["name"] for entry in report.entries) == ["manhwa_service", "oracle_client"]
+    assert all(entry["phase"] == "startup" for entry in report.entries)
+
+def test_startup_report_splits_startup_and_first_use():
+    report = StartupReport()
+    with report.measure("rest.manhwa", "import"):
+        pass
+    report.mark_ready()
+    with report.measure("search_service"):
+        pass
+    
+    result = report.get_report()
+    assert result["ready"] is True
+    assert [entry["name"] for entry in result["startup"]] == ["rest.manhwa"]
+    assert [entry["name"] for entry in result["first_use"]] == ["search_service"]
+
+def test_importing_the_app_leaves_heavy_dependencies_unloaded():
+    # A fresh interpreter, so modules imported by other tests don't count
+    heavy = ["numpy", "oracledb", "dal.oracle_client", "minio", "PIL"]
+    code = f"import sys, main; print([m for m in {heavy!r} if m in sys.modules])"
+    env = {**os.environ, "ORACLE_SKIP": "1"}
+    output = subprocess.run([sys.executable, "-c", code], cwd=API_DIR, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    assert output.strip().splitlines()[-1] == "[]"
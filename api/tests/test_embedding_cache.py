@@ -0,0 +1,77 @@
+import asyncio
+import json
+from typing import List, Sequence
+
+from services.embedding_cache import EmbeddingCache, embedding_key, normalize_text
+from services.embedding_provider import CachingEmbeddingProvider, EmbeddingProvider, _tokenizer_lowercases
+
+class _CountingProvider(EmbeddingProvider):
+    """Returns the text length as a 2-dim vector and records every batch it's asked for"""
+    
+    model_id = "counting"
+    dimension = 2
+    
+    def __init__(self, case_sensitive: bool = True):
+        self.case_sensitive = case_sensitive
+        self.batches: List[List[str]] = []
+    
+    def encode(self, texts: Sequence[str]) -> List[List[float]]:
+        self.batches.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+def test_normalization_folds_whitespace_and_unicode_but_case_only_on_request():
+    assert normalize_text("  Solo\tLeveling\n") == "Solo Leveling"
+    # NFKC turns the fullwidth letters into ASCII
+    assert normalize_text("ＳＯＬＯ") == "SOLO"
+    assert normalize_text("Solo Leveling", fold_case=True) == "solo leveling"
+    
+    assert embedding_key("m", "Apple") != embedding_key("m", "apple")
+    assert embedding_key("m", "Apple", fold_case=True) == embedding_key("m", "apple", fold_case=True)
+    assert embedding_key("m1", "apple") != embedding_key("m2", "apple")
+
+def test_tokenizer_lowercase_detection(tmp_path):
+    def tokenizer(normalizer) -> str:
+        path = tmp_path / "tokenizer.json"
+        path.write_text(json.dumps({"normalizer": normalizer}))
+        return str(path)
+    
+    assert _tokenizer_lowercases(tokenizer({"type": "BertNormalizer", "lowercase": True}))
+    assert _tokenizer_lowercases(tokenizer({"type": "Sequence", "normalizers": [{"type": "NFD"}, {"type": "Lowercase"}]}))
+    assert not _tokenizer_lowercases(tokenizer({"type": "BertNormalizer", "lowercase": False}))
+    assert not _tokenizer_lowercases(tokenizer(None))
+    assert not _tokenizer_lowercases(str(tmp_path / "missing.json"))
+
+def test_cache_lru_and_disk_round_trip(tmp_path):
+    path = str(tmp_path / "embeddings.db")
+    cache = EmbeddingCache(max_entries=2, path=path)
+    cache.put_many({"a": [0.5, 1.0], "b": [1.5, 2.0], "c": [2.5, 3.0]})
+    assert cache.get_stats()["evictions"] == 1
+    assert cache.get_many(["a"], memory_only=True) == [None]
+    
+    # A fresh cache on the same file starts with the vectors already on disk
+    reopened = EmbeddingCache(max_entries=2, path=path)
+    assert reopened.get_many(["a", "c", "missing"]) == [[0.5, 1.0], [2.5, 3.0], None]
+    stats = reopened.get_stats()
+    assert (stats["disk_hits"], stats["misses"], stats["disk_entries"]) == (2, 1, 3)
+
+def test_caching_provider_embeds_each_normalized_text_once():
+    inner = _CountingProvider()
+    provider = CachingEmbeddingProvider(inner, EmbeddingCache())
+    
+    first = provider.encode(["Solo  Leveling", "Solo Leveling", "Omniscient Reader"])
+    assert first[0] == first[1]
+    assert inner.batches == [["Solo  Leveling", "Omniscient Reader"]]
+    
+    # Everything is now in memory, so the async path never reaches the provider
+    assert asyncio.run(provider.encode_async(["Omniscient Reader"])) == [first[2]]
+    provider.encode(["solo leveling"])
+    assert inner.batches[-1] == ["solo leveling"]
+
+def test_caching_provider_shares_entries_across_case_for_uncased_models():
+    inner = _CountingProvider(case_sensitive=False)
+    provider = CachingEmbeddingProvider(inner, EmbeddingCache())
+    assert provider.case_sensitive is False
+    
+    provider.encode(["Solo Leveling"])
+    provider.encode(["solo leveling", "SOLO LEVELING"])
+    assert inner.batches == [["Solo Leveling"]]
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from services.embedding_provider import (
+    VECTOR_DIMENSION, HashingEmbeddingProvider, create_embedding_provider, manhwa_text
+)
+
+def _cosine(a, b) -> float:
+    return float(np.dot(a, b))
+
+def test_hashing_vectors_fit_the_embedding_column_and_are_unit_length():
+    provider = HashingEmbeddingProvider()
+    vectors = provider.encode(["Solo Leveling", "A hunter rises through the dungeons", ""])
+    
+    assert provider.dimension == VECTOR_DIMENSION
+    assert all(len(vector) == VECTOR_DIMENSION for vector in vectors)
+    assert np.linalg.norm(vectors[0]) == pytest.approx(1.0, abs=1e-5)
+    # An empty text has no features and stays the zero vector instead of dividing by zero
+    assert not any(vectors[2])
+    assert provider.encode([]) == []
+
+def test_hashing_is_deterministic_and_batch_independent():
+    provider = HashingEmbeddingProvider()
+    batch = provider.encode(["tower of god", "the breaker"])
+    assert batch[0] == provider.encode_one("tower of god")
+    assert batch == HashingEmbeddingProvider().encode(["tower of god", "the breaker"])
+    # encode() lowercases, which is why the provider reports itself case-insensitive
+    assert provider.encode_one("Tower Of God") == batch[0]
+    assert provider.case_sensitive is False
+
+def test_related_words_land_closer_than_unrelated_ones():
+    provider = HashingEmbeddingProvider()
+    hunter, hunters, romance = provider.encode(["hunter", "hunters", "romance"])
+    assert _cosine(hunter, hunters) > _cosine(hunter, romance)
+    
+    query = provider.encode_one("dungeon hunter")
+    relevant = provider.encode_manhwa("Solo Leveling", "The weakest hunter clears a dungeon", ["Action"])
+    unrelated = provider.encode_manhwa("True Beauty", "A makeup tutorial changes her school life", ["Romance"])
+    assert _cosine(query, relevant) > _cosine(query, unrelated)
+
+def test_manhwa_text_repeats_the_title():
+    assert manhwa_text("Title", None, ["Action", "Drama"]) == "Title. Title.  Action Drama"
+
+def test_unknown_provider_is_rejected():
+    with pytest.raises(ValueError, match="Unknown embedding provider"):
+        create_embedding_provider("word2vec")
+    assert isinstance(create_embedding_provider("HASHING"), HashingEmbeddingProvider)
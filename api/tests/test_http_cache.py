@@ -0,0 +1,58 @@
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from rest.http_cache import ETagMiddleware, _etag_matches, cache_control
+
+def _client(max_body_bytes: int = 1024 * 1024) -> TestClient:
+    app = FastAPI()
+    
+    @app.get("/cached", dependencies=[cache_control("public, max-age=30")])
+    async def cached():
+        return {"title": "Omniscient Reader"}
+    
+    @app.get("/uncached")
+    async def uncached():
+        return {"title": "Omniscient Reader"}
+    
+    @app.get("/no-store", dependencies=[cache_control("no-store")])
+    async def no_store():
+        return {"title": "Omniscient Reader"}
+    
+    @app.get("/large", dependencies=[cache_control("public, max-age=30")])
+    async def large():
+        return StreamingResponse(iter([b"x" * 600, b"y" * 600]), headers={"Cache-Control": "public, max-age=30"})
+    
+    app.add_middleware(ETagMiddleware, max_body_bytes=max_body_bytes)
+    return TestClient(app)
+
+def test_cacheable_responses_get_an_etag_and_answer_304():
+    client = _client()
+    response = client.get("/cached")
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"') and response.headers["cache-control"] == "public, max-age=30"
+    
+    not_modified = client.get("/cached", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b"" and not_modified.headers["etag"] == etag
+    
+    # Strong form of the same tag, and a list containing it, still match
+    assert client.get("/cached", headers={"If-None-Match": f'"other", {etag[2:]}'}).status_code == 304
+    assert client.get("/cached", headers={"If-None-Match": '"other"'}).status_code == 200
+
+def test_routes_without_a_cache_policy_are_left_alone():
+    client = _client()
+    assert "etag" not in client.get("/uncached").headers
+    assert "etag" not in client.get("/no-store").headers
+    assert "etag" not in client.post("/cached").headers
+
+def test_bodies_over_the_limit_stream_through_without_an_etag():
+    response = _client(max_body_bytes=1000).get("/large")
+    assert response.status_code == 200
+    assert response.content == b"x" * 600 + b"y" * 600
+    assert "etag" not in response.headers
+
+def test_etag_matching():
+    assert _etag_matches("*", 'W/"abc"')
+    assert _etag_matches('W/"abc"', '"abc"')
+    assert not _etag_matches('"abd"', 'W/"abc"')
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from services.lexical_index import LexicalIndex, tokenize
+from services.search_service import SearchService, reciprocal_rank_fusion, vector_relevance
+
+CATALOG = [
+    {"id": "solo", "title": "Solo Leveling", "author": "Chugong", "genre": ["Action"], "status": "completed",
+     "description": "The weakest hunter in the world levels up alone."},
+    {"id": "tog", "title": "Tower of God", "author": "SIU", "genre": ["Fantasy"], "status": "ongoing",
+     "description": "A boy climbs the tower to find the girl who left him."},
+    {"id": "orv", "title": "Omniscient Reader", "author": "Sing Shong", "genre": ["Action", "Fantasy"], "status": "ongoing",
+     "description": "A reader wakes up inside the novel he finished, where a hunter tower awaits."},
+]
+
+def _lexical_index() -> LexicalIndex:
+    index = LexicalIndex()
+    for manhwa in CATALOG:
+        index.upsert(manhwa)
+    return index
+
+def test_rrf_rewards_agreement_between_rankings():
+    vector = [{"id": "a"}, {"id": "b"}, {"id": "c"}]
+    lexical = [{"id": "c"}, {"id": "b"}, {"id": "d"}]
+    fused = reciprocal_rank_fusion([vector, lexical], k=60)
+    
+    # b is second in both lists; a and c each lead one list but c is also third in the other
+    assert [row["id"] for row in fused] == ["c", "b", "a", "d"]
+    assert fused[1]["rrf_score"] == pytest.approx(2 / 62)
+    assert fused[3]["rrf_score"] == pytest.approx(1 / 63)
+    assert reciprocal_rank_fusion([]) == []
+
+def test_vector_relevance_turns_distance_into_similarity():
+    assert vector_relevance({"similarity_score": 0.25}) == 0.75
+    assert vector_relevance({}) == 0.0
+
+def test_bm25_weights_title_matches_over_description_matches():
+    index = _lexical_index()
+    results = index.search("tower")
+    assert [row["id"] for row in results] == ["tog", "orv"]
+    assert results[0]["bm25_score"] > results[1]["bm25_score"]
+    
+    assert [row["id"] for row in index.search("HUNTER", genre="Action", status="ongoing")] == ["orv"]
+    assert index.search("zzz") == [] and index.search("") == []
+    assert tokenize("Ｔower-of God") == ["tower", "of", "god"]
+
+def test_bm25_updates_and_removals_touch_only_that_manhwa():
+    index = _lexical_index()
+    index.upsert({**CATALOG[1], "title": "Girl of the Tower", "description": ""})
+    assert [row["id"] for row in index.search("girl")] == ["tog"]
+    assert index.search("boy") == []
+    
+    assert index.remove("tog") is True
+    assert [row["id"] for row in index.search("tower")] == ["orv"]
+    assert index.get_stats()["entries"] == 2
+
+def test_bm25_with_only_empty_documents_does_not_divide_by_zero():
+    index = LexicalIndex()
+    index.upsert({"id": "blank", "title": "", "description": None})
+    assert index.search("anything") == []
+
+class _VectorOracle:
+    """Answers every vector search with a fixed ranking"""
+    
+    def __init__(self, ranking):
+        self.ranking = ranking
+    
+    async def search_similar_manhwa(self, query_embedding, limit=10):
+        return self.ranking[:limit]
+
+def test_search_fuses_vector_and_keyword_rankings(monkeypatch):
+    ranking = [{**CATALOG[0], "similarity_score": 0.2}, {**CATALOG[1], "similarity_score": 0.4}]
+    service = SearchService(oracle_client=_VectorOracle(ranking))
+    monkeypatch.setattr("services.vector_index._vector_index", None)
+    
+    # Vector-only until the keyword index is warm: relevance is 1 - distance
+    monkeypatch.setattr("services.lexical_index._lexical_index", None)
+    results = asyncio.run(service._search("tower", limit=2))
+    assert [row["relevance_score"] for row in results] == pytest.approx([0.8, 0.6])
+    
+    lexical_index = _lexical_index()
+    lexical_index.ready = True
+    monkeypatch.setattr("services.lexical_index._lexical_index", lexical_index)
+    results = asyncio.run(service._search("tower", limit=3))
+    assert [row["id"] for row in results] == ["tog", "solo", "orv"]
+    assert all(row["relevance_score"] == row["rrf_score"] for row in results)
+    assert results[0]["relevance_score"] > results[1]["relevance_score"]
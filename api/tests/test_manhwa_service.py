@@ -0,0 +1,134 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from services.cache import MemoryCache
+from services.embedding_provider import VECTOR_DIMENSION
+from services.manhwa_service import ManhwaService
+
+class _FakeOracleClient:
+    def __init__(self, rows=None):
+        self.calls = []
+        self.rows = rows or {}
+    
+    async def get_manhwa_by_id(self, manhwa_id):
+        self.calls.append(("get", manhwa_id))
+        return self.rows.get(manhwa_id)
+    
+    async def create_manhwa_with_embedding(self, manhwa_data, embedding):
+        self.calls.append(("create", manhwa_data["title"], len(embedding)))
+        return {**manhwa_data, "id": "m1", "rating": 0.0, "view_count": 0}
+    
+    async def update_manhwa_with_embedding(self, manhwa_id, manhwa_data, embedding):
+        self.calls.append(("update", manhwa_id, len(embedding)))
+        return {**manhwa_data, "id": manhwa_id, "rating": 0.0, "view_count": 0}
+
+def test_create_and_update_write_the_embedding_with_the_row():
+    oracle = _FakeOracleClient()
+    service = ManhwaService(oracle_client=oracle)
+    data = {"title": "Solo Leveling", "author": "Chugong", "genre": ["action"], "description": "Hunters"}
+    
+    created = asyncio.run(service.create(data))
+    asyncio.run(service.update(created["id"], {**data, "title": "Solo Leveling: Ragnarok"}))
+    
+    # One statement per write, each carrying a full-size embedding
+    assert oracle.calls == [
+        ("create", "Solo Leveling", VECTOR_DIMENSION),
+        ("update", "m1", VECTOR_DIMENSION),
+    ]
+
+def test_cursor_round_trip_and_malformed_cursor():
+    service = ManhwaService(oracle_client=_FakeOracleClient())
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    
+    assert service._decode_cursor(service._encode_cursor(created_at, "m42")) == (created_at, "m42")
+    # Rows without created_at still produce a usable cursor
+    assert service._decode_cursor(service._encode_cursor(None, "m7")) == (None, "m7")
+    with pytest.raises(ValueError):
+        service._decode_cursor("not-a-cursor")
+
+def test_cursor_pages_continue_without_overlap(monkeypatch):
+    monkeypatch.setenv("ORACLE_SKIP", "true")
+    service = ManhwaService()
+    
+    first = asyncio.run(service.get_page(limit=2))
+    second = asyncio.run(service.get_page(limit=2, cursor=first["next_cursor"]))
+    
+    first_ids = [item["id"] for item in first["items"]]
+    second_ids = [item["id"] for item in second["items"]]
+    assert len(first_ids) == 2 and second_ids
+    assert not set(first_ids) & set(second_ids)
+    assert second_ids == [item["id"] for item in asyncio.run(service.get_page(skip=2, limit=2))["items"]]
+
+def test_detail_reads_are_cached_including_misses_until_a_write():
+    oracle = _FakeOracleClient(rows={"m1": {"id": "m1", "title": "Tower of God"}})
+    service = ManhwaService(oracle_client=oracle)
+    service.cache = MemoryCache()
+    
+    async def reads():
+        first = await service.get_by_id("m1")
+        await service.get_by_id("m1")
+        missing = await service.get_by_id("nope")
+        await service.get_by_id("nope")
+        await service.invalidate_cache("m1")
+        await service.get_by_id("m1")
+        return first, missing
+    
+    first, missing = asyncio.run(reads())
+    assert first["title"] == "Tower of God" and missing is None
+    assert oracle.calls == [("get", "m1"), ("get", "nope"), ("get", "m1")]
+
+def test_a_read_racing_a_write_does_not_cache_the_old_row():
+    oracle = _FakeOracleClient(rows={"m1": {"id": "m1", "title": "Old"}})
+    service = ManhwaService(oracle_client=oracle)
+    service.cache = MemoryCache()
+    reads = []
+    
+    async def slow_get(manhwa_id):
+        # Each Oracle read takes its row now and returns it when its event is set
+        release = asyncio.Event()
+        reads.append(release)
+        row = dict(oracle.rows[manhwa_id])
+        await release.wait()
+        return row
+    
+    async def wait_for_reads(count):
+        while len(reads) < count:
+            await asyncio.sleep(0)
+    
+    async def race():
+        service.oracle_client = type("SlowOracle", (), {"get_manhwa_by_id": staticmethod(slow_get)})()
+        stale_read = asyncio.ensure_future(service.get_by_id("m1"))
+        await asyncio.wait_for(wait_for_reads(1), 1)
+        
+        # The update commits and invalidates while the first read is still in flight
+        oracle.rows["m1"] = {"id": "m1", "title": "New"}
+        await service.invalidate_cache("m1")
+        fresh_read = asyncio.ensure_future(service.get_by_id("m1"))
+        # A read arriving after the write must not join the one in flight
+        await asyncio.wait_for(wait_for_reads(2), 1)
+        
+        # The stale read finishes first, and must not leave its row in the cache
+        reads[0].set()
+        assert (await stale_read)["title"] == "Old"
+        assert await service.cache.get("manhwa:id:m1") is None
+        
+        reads[1].set()
+        assert (await fresh_read)["title"] == "New"
+        return await service.get_by_id("m1")
+    
+    assert asyncio.run(race())["title"] == "New"
+    assert len(reads) == 2
+
+def test_cached_rows_are_not_shared_between_callers():
+    oracle = _FakeOracleClient(rows={"m1": {"id": "m1", "title": "Tower of God", "genre": ["Fantasy"]}})
+    service = ManhwaService(oracle_client=oracle)
+    service.cache = MemoryCache()
+    
+    async def reads():
+        first = await service.get_by_id("m1")
+        first["genre"].append("Mutated")
+        return await service.get_by_id("m1")
+    
+    assert asyncio.run(reads())["genre"] == ["Fantasy"]
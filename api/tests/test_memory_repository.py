@@ -0,0 +1,56 @@
+from services.memory_repository import InMemoryManhwaRepository
+
+SEED = [
+    {"id": "a", "title": "A", "genre": ["Action", "fantasy"], "status": "ongoing"},
+    {"id": "b", "title": "B", "genre": ["romance"], "status": "completed"},
+    {"id": "c", "title": "C", "genre": ["action"], "status": "completed"},
+]
+
+def test_paging_follows_listing_order():
+    repository = InMemoryManhwaRepository(seed=SEED)
+    
+    assert [r["id"] for r in repository.list(skip=1, limit=5)] == ["b", "c"]
+    assert [r["id"] for r in repository.list_after("a", limit=1)] == ["b"]
+    assert repository.list_after("unknown") == []
+
+def test_updates_and_deletes_keep_listing_order():
+    repository = InMemoryManhwaRepository(seed=SEED)
+    
+    repository.update("a", {"title": "A2", "genre": ["romance"], "status": "completed"})
+    assert repository.get("a")["title"] == "A2"
+    assert [r["id"] for r in repository.list()] == ["a", "b", "c"]
+    
+    assert repository.delete("b") and not repository.delete("b")
+    assert [r["id"] for r in repository.list()] == ["a", "c"]
+    assert [r["id"] for r in repository.list_after("a")] == ["c"]
+    assert repository.update("b", {"title": "gone"}) is None
+
+def test_deletes_leave_tombstones_until_compaction():
+    repository = InMemoryManhwaRepository(seed=[{"id": str(i), "title": str(i)} for i in range(6)])
+    
+    repository.delete("1")
+    repository.delete("3")
+    # Positions of the remaining records are left alone; paging skips the gaps
+    assert repository.get_stats()["tombstones"] == 2
+    assert [r["id"] for r in repository.list(skip=1, limit=2)] == ["2", "4"]
+    assert [r["id"] for r in repository.list_after("2", limit=2)] == ["4", "5"]
+    
+    # Half the id list is tombstones now, so it is compacted
+    repository.delete("0")
+    assert repository.get_stats()["tombstones"] == 0
+    assert [r["id"] for r in repository.list()] == ["2", "4", "5"]
+    assert [r["id"] for r in repository.list_after("2")] == ["4", "5"]
+
+def test_generated_ids_skip_taken_ones():
+    repository = InMemoryManhwaRepository(seed=[{"id": "manhwa_1", "title": "taken"}])
+    assert repository.add({"title": "new"})["id"] == "manhwa_2"
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "store.json")
+    repository = InMemoryManhwaRepository(seed=SEED, snapshot_path=path)
+    repository.add({"id": "d", "title": "D", "genre": ["action"]})
+    repository.delete("b")
+    assert repository.save_snapshot() and not repository.save_snapshot()
+    
+    restored = InMemoryManhwaRepository(seed=[], snapshot_path=path)
+    assert [r["id"] for r in restored.list()] == ["a", "c", "d"]
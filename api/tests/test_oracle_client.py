@@ -0,0 +1,377 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("oracledb")
+
+import dal.oracle_client as oracle_client
+from dal.oracle_client import OracleClient
+
+class _RecordingClient(OracleClient):
+    """OracleClient whose statements are recorded instead of sent to a database"""
+    
+    def __init__(self, query_results=None, batch_errors=None):
+        self.async_mode = False
+        self.statements = []
+        self.query_results = query_results or []
+        self.batch_errors = batch_errors or []
+    
+    async def execute_query(self, query, params=None, row_format='dict', input_sizes=None):
+        self.statements.append((" ".join(query.split()), params, input_sizes))
+        return self.query_results.pop(0) if self.query_results else []
+    
+    async def execute_non_query(self, query, params=None):
+        self.statements.append((" ".join(query.split()), params, None))
+    
+    async def execute_many(self, query, rows, batch_size=1000, row_counts=None, input_sizes=None):
+        self.statements.append((" ".join(query.split()), rows, input_sizes))
+        if row_counts is not None:
+            failed = {error["offset"] for error in self.batch_errors}
+            row_counts.extend(0 if offset in failed else 1 for offset in range(len(rows)))
+        return self.batch_errors
+
+def test_driver_mode_from_env(monkeypatch):
+    monkeypatch.delenv("ORACLE_DRIVER_MODE", raising=False)
+    assert oracle_client._use_async_driver() is False
+    monkeypatch.setenv("ORACLE_DRIVER_MODE", "ASYNC")
+    assert oracle_client._use_async_driver() is True
+
+def test_bulk_upsert_keeps_stored_vectors_and_reports_written_ids():
+    client = _RecordingClient(batch_errors=[{"offset": 1, "message": "ORA-12899: value too large"}])
+    summary = asyncio.run(client.upsert_manhwa_many([
+        {"id": "a", "title": "A", "author": "x", "embedding": [0.1] * 384},
+        {"id": "b", "title": "B", "author": "x"},
+        {"id": "c", "title": "C", "author": "x"},
+    ]))
+    
+    query, rows, _ = client.statements[0]
+    assert "m.embedding = NVL(src.embedding, m.embedding)" in query
+    assert rows[1]["embedding"] is None
+    assert summary["processed"] == 3 and summary["succeeded"] == 2
+    assert summary["upserted_ids"] == ["a", "c"]
+    assert summary["errors"][0]["id"] == "b"
+
+def test_to_vector_binds_float32_arrays_or_text(monkeypatch):
+    monkeypatch.setattr(oracle_client, "_native_vectors", True)
+    vector = oracle_client.to_vector([0.5, -1.0])
+    assert vector.typecode == "f" and list(vector) == [0.5, -1.0]
+    assert oracle_client.to_vector(None) is None
+    
+    # Pre-23ai thick clients get a text literal the server parses
+    monkeypatch.setattr(oracle_client, "_native_vectors", False)
+    assert oracle_client.to_vector([0.5, -1.0]) == "[0.5,-1.0]"
+
+def test_keyset_page_after_a_row_without_created_at():
+    client = _RecordingClient()
+    asyncio.run(client.get_manhwa_list_after(after=(None, "m7"), limit=5))
+    
+    query, params, input_sizes = client.statements[0]
+    assert "(created_at IS NULL AND id < :after_id) OR created_at IS NOT NULL" in query
+    assert "NULLS FIRST" in query
+    assert params == {"after_id": "m7", "limit": 5} and input_sizes is None
+
+def test_keyset_page_binds_the_cursor_time_as_timestamp():
+    client = _RecordingClient()
+    after = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    asyncio.run(client.get_manhwa_list_after(after=(after, "m42"), limit=5))
+    
+    query, params, input_sizes = client.statements[0]
+    assert "created_at < :after_created_at" in query
+    assert params["after_created_at"] == after
+    assert input_sizes == {"after_created_at": oracle_client.oracledb.DB_TYPE_TIMESTAMP}
+
+class _FakeCursor:
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.description = [("ID", None), ("TITLE", None)]
+        self.arraysize = self.prefetchrows = None
+        self.closed = False
+    
+    def execute(self, query, params=None):
+        pass
+    
+    def fetchmany(self):
+        return self.batches.pop(0) if self.batches else []
+    
+    def close(self):
+        self.closed = True
+
+def test_stream_query_fetches_in_arraysize_batches(monkeypatch):
+    from contextlib import asynccontextmanager
+    
+    cursor = _FakeCursor([[("a", "A"), ("b", "B")], [("c", "C")]])
+    
+    class _Connection:
+        def cursor(self):
+            return cursor
+    
+    @asynccontextmanager
+    async def get_connection():
+        yield _Connection()
+    
+    client = _RecordingClient()
+    monkeypatch.setattr(client, "get_connection", get_connection)
+    monkeypatch.setenv("ORACLE_STREAM_PREFETCHROWS", "3")
+    
+    async def collect():
+        return [row async for row in client.stream_query("SELECT id, title FROM manhwa", arraysize=2)]
+    
+    assert asyncio.run(collect()) == [{"id": "a", "title": "A"}, {"id": "b", "title": "B"}, {"id": "c", "title": "C"}]
+    assert (cursor.arraysize, cursor.prefetchrows) == (2, 3)
+    assert cursor.closed
+
+@pytest.mark.parametrize("columns, expected", [
+    ({"GENRE": "CLOB"}, ["ADD", "UPDATE", "DROP", "RENAME"]),
+    # Earlier run failed after adding genre_json, or after dropping the old column
+    ({"GENRE": "CLOB", "GENRE_JSON": "JSON"}, ["UPDATE", "DROP", "RENAME"]),
+    ({"GENRE_JSON": "JSON"}, ["RENAME"]),
+    ({"GENRE": "JSON"}, []),
+])
+def test_genre_migration_resumes_after_a_partial_run(columns, expected):
+    client = _RecordingClient(query_results=[[
+        {"column_name": name, "data_type": data_type} for name, data_type in columns.items()
+    ]])
+    
+    migrated = asyncio.run(client.migrate_genre_to_json())
+    
+    steps = [query.split()[3] if query.startswith("ALTER") else query.split()[0] for query, _, _ in client.statements[1:]]
+    assert steps == expected
+    assert migrated == bool(expected)
+
+def test_genre_values_from_json_and_legacy_clob_columns():
+    assert oracle_client._parse_genre(["action", "fantasy"]) == ["action", "fantasy"]
+    assert oracle_client._parse_genre('["action"]') == ["action"]
+    assert oracle_client._parse_genre(None) == []
+    assert oracle_client._parse_genre("not json") == []
+
+def test_view_count_flush_is_one_merge_in_id_order():
+    client = _RecordingClient()
+    asyncio.run(client.increment_view_counts({"b": 2, "a": 5}))
+    
+    query, rows, _ = client.statements[0]
+    assert query.startswith("MERGE INTO manhwa")
+    assert rows == [{"id": "a", "delta": 5}, {"id": "b", "delta": 2}]
+
+def test_batched_vector_search_is_one_union_routed_back_by_position(monkeypatch):
+    monkeypatch.setattr(oracle_client, "_native_vectors", False)
+    client = _RecordingClient(query_results=[[
+        {"query_index": 0, "id": "a", "genre": '["Action"]', "similarity_score": 0.1},
+        {"query_index": 2, "id": "b", "genre": None, "similarity_score": 0.3},
+    ]])
+    results = asyncio.run(client.search_similar_manhwa_many([
+        {"embedding": [1.0], "limit": 3},
+        {"embedding": [0.5], "genre": "Romance", "exclude_id": "a"},
+        {"embedding": [0.0], "status": "completed"},
+    ]))
+    
+    assert len(client.statements) == 1
+    query, params, _ = client.statements[0]
+    assert query.count("UNION ALL") == 2
+    assert "id != :excl1" in query and ":genre1" in query and "status = :status2" in query
+    assert params["lim0"] == 3 and params["lim1"] == 10 and params["vec2"] == "[0.0]"
+    assert results == [
+        [{"id": "a", "genre": ["Action"], "similarity_score": 0.1}],
+        [],
+        [{"id": "b", "genre": [], "similarity_score": 0.3}],
+    ]
+    assert asyncio.run(client.search_similar_manhwa_many([])) == []
+
+def test_vector_index_ddl_per_organization():
+    ivf = " ".join(oracle_client.vector_index_ddl("ivf", 90, {"partitions": 32}, parallel=4).split())
+    assert ivf == (
+        "CREATE VECTOR INDEX manhwa_vector_idx ON manhwa (embedding) ORGANIZATION NEIGHBOR PARTITIONS "
+        "DISTANCE COSINE WITH TARGET ACCURACY 90 PARAMETERS (TYPE IVF, NEIGHBOR PARTITIONS 32) PARALLEL 4"
+    )
+    hnsw = " ".join(oracle_client.vector_index_ddl("HNSW", 95, {"neighbors": 16}, index_name="idx_new").split())
+    assert "idx_new ON manhwa" in hnsw and "INMEMORY NEIGHBOR GRAPH" in hnsw
+    assert hnsw.endswith("PARAMETERS (TYPE HNSW, NEIGHBORS 16)")
+    
+    with pytest.raises(ValueError, match="Unknown vector index type"):
+        oracle_client.vector_index_ddl("LSH")
+    with pytest.raises(ValueError, match="between 1 and 100"):
+        oracle_client.vector_index_ddl("IVF", 0)
+
+def test_vector_searches_are_exact_unless_an_accuracy_is_set(monkeypatch):
+    monkeypatch.delenv("ORACLE_VECTOR_SIMILAR_ACCURACY", raising=False)
+    assert oracle_client._env_accuracy("ORACLE_VECTOR_SIMILAR_ACCURACY") is None
+    assert oracle_client._fetch_first(":limit", None) == "FETCH FIRST :limit ROWS ONLY"
+    assert oracle_client._fetch_first(":limit", 100) == "FETCH FIRST :limit ROWS ONLY"
+    assert oracle_client._fetch_first(":limit", 90) == "FETCH APPROX FIRST :limit ROWS ONLY WITH TARGET ACCURACY 90"
+    
+    monkeypatch.setattr(oracle_client, "_search_accuracy", {"similar": None, "hybrid": None})
+    client = _RecordingClient()
+    asyncio.run(client.search_similar_manhwa([0.1], limit=5))
+    assert "FETCH FIRST :limit ROWS ONLY" in client.statements[-1][0]
+    
+    oracle_client.set_vector_search_accuracy("similar", 80)
+    asyncio.run(client.search_similar_manhwa([0.1], limit=5))
+    assert "FETCH APPROX FIRST :limit ROWS ONLY WITH TARGET ACCURACY 80" in client.statements[-1][0]
+    with pytest.raises(ValueError):
+        oracle_client.set_vector_search_accuracy("suggest", 80)
+
+def test_rebuild_builds_a_shadow_index_before_replacing_the_live_one():
+    client = _RecordingClient()
+    asyncio.run(client.rebuild_vector_index("HNSW", 95, {"neighbors": 32}))
+    
+    statements = [statement for statement, _, _ in client.statements]
+    assert statements[0] == "DROP INDEX IF EXISTS manhwa_vector_idx_new"
+    assert statements[1].startswith("CREATE VECTOR INDEX manhwa_vector_idx_new ON manhwa")
+    # The live index is only dropped once its replacement has been built
+    assert statements[2:] == [
+        "DROP INDEX IF EXISTS manhwa_vector_idx",
+        "ALTER INDEX manhwa_vector_idx_new RENAME TO manhwa_vector_idx",
+    ]
+
+class _AsyncCursor:
+    """Cursor of the asyncio driver: execute, fetch and executemany are coroutines"""
+    
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = [("ID", None), ("TITLE", None)]
+        self.arraysize = self.prefetchrows = None
+        self.rowcount = connection.rowcount
+        self.input_sizes = None
+        self.closed = False
+        self._batch_errors = []
+        self._row_counts = []
+    
+    def setinputsizes(self, **input_sizes):
+        self.input_sizes = input_sizes
+    
+    async def execute(self, query, params=None):
+        self.connection.executed.append((" ".join(query.split()), params, self.connection.autocommit))
+    
+    async def fetchall(self):
+        return [row for batch in self.connection.batches for row in batch]
+    
+    async def fetchmany(self):
+        return self.connection.batches.pop(0) if self.connection.batches else []
+    
+    async def executemany(self, query, rows, batcherrors=False, arraydmlrowcounts=False):
+        self.connection.executed.append((" ".join(query.split()), rows, self.connection.autocommit))
+        failed = [index for index, row in enumerate(rows) if row.get("fail")]
+        self._batch_errors = [type("BatchError", (), {"offset": index, "message": "ORA-00001"})() for index in failed]
+        self._row_counts = [0 if index in failed else 1 for index in range(len(rows))]
+    
+    def getbatcherrors(self):
+        return self._batch_errors
+    
+    def getarraydmlrowcounts(self):
+        return self._row_counts
+    
+    def var(self, db_type):
+        return type("Var", (), {"getvalue": lambda var: [f"out:{db_type}"]})()
+    
+    def close(self):
+        self.closed = True
+        self.connection.closed_cursors += 1
+
+class _AsyncConnection:
+    def __init__(self, batches=()):
+        self.batches = list(batches)
+        self.executed = []
+        self.autocommit = False
+        self.rowcount = 1
+        self.commits = 0
+        self.closed_cursors = 0
+    
+    def cursor(self):
+        return _AsyncCursor(self)
+    
+    async def commit(self):
+        self.commits += 1
+
+class _AsyncPool:
+    def __init__(self, connection):
+        self.connection = connection
+        self.acquired = self.released = 0
+    
+    async def acquire(self):
+        self.acquired += 1
+        return self.connection
+    
+    async def release(self, connection):
+        assert connection is self.connection
+        self.released += 1
+
+@pytest.fixture
+def async_client(monkeypatch):
+    """An OracleClient in async driver mode over a fake pool, and that pool"""
+    monkeypatch.setenv("ORACLE_DRIVER_MODE", "async")
+    pool = _AsyncPool(_AsyncConnection())
+    monkeypatch.setattr(oracle_client, "_pool", pool)
+    client = OracleClient()
+    assert client.async_mode
+    return client, pool
+
+def test_async_connection_is_released_even_when_the_body_fails(async_client):
+    client, pool = async_client
+    
+    async def use():
+        async with client.get_connection() as conn:
+            assert conn is pool.connection
+            raise RuntimeError("boom")
+    
+    with pytest.raises(RuntimeError):
+        asyncio.run(use())
+    assert (pool.acquired, pool.released) == (1, 1)
+
+def test_async_query_binds_input_sizes_and_decodes_rows(async_client):
+    client, pool = async_client
+    pool.connection.batches = [[("a", "A")], [("b", "B")]]
+    
+    rows = asyncio.run(client.execute_query(
+        "SELECT id, title FROM manhwa WHERE created_at < :t", {"t": "x"}, input_sizes={"t": "TIMESTAMP"}
+    ))
+    assert rows == [{"id": "a", "title": "A"}, {"id": "b", "title": "B"}]
+    assert pool.connection.executed == [("SELECT id, title FROM manhwa WHERE created_at < :t", {"t": "x"}, False)]
+    assert pool.connection.closed_cursors == 1 and pool.released == 1
+    
+    assert asyncio.run(client.execute_query("SELECT 1 FROM dual", row_format="tuple")) == [("a", "A"), ("b", "B")]
+
+def test_async_returning_commits_through_autocommit(async_client):
+    client, pool = async_client
+    result = asyncio.run(client.execute_returning(
+        "UPDATE manhwa SET title = :title WHERE id = :id RETURNING updated_at INTO :updated_at",
+        {"title": "T", "id": "m1"}, {"updated_at": "DATE"}
+    ))
+    
+    assert result == {"updated_at": "out:DATE"}
+    query, params, autocommit = pool.connection.executed[0]
+    assert set(params) == {"title", "id", "updated_at"} and autocommit is True
+    # Autocommit is switched back off before the session returns to the pool
+    assert pool.connection.autocommit is False and pool.connection.commits == 0
+
+def test_async_returning_without_a_matching_row(async_client):
+    client, pool = async_client
+    pool.connection.rowcount = 0
+    assert asyncio.run(client.execute_returning("DELETE FROM manhwa WHERE id = :id", {"id": "x"}, {})) is None
+
+def test_async_array_dml_reports_batch_errors_across_batches(async_client):
+    client, pool = async_client
+    rows = [{"id": "a"}, {"id": "b", "fail": True}, {"id": "c"}, {"id": "d", "fail": True}, {"id": "e"}]
+    row_counts = []
+    
+    errors = asyncio.run(client.execute_many(
+        "INSERT INTO manhwa (id) VALUES (:id)", rows, batch_size=2, row_counts=row_counts, input_sizes={"id": "VARCHAR"}
+    ))
+    assert errors == [{"offset": 1, "message": "ORA-00001"}, {"offset": 3, "message": "ORA-00001"}]
+    assert row_counts == [1, 0, 1, 0, 1]
+    assert [len(batch) for _, batch, _ in pool.connection.executed] == [2, 2, 1]
+    assert pool.connection.commits == 1
+    assert asyncio.run(client.execute_many("INSERT", [])) == [] and pool.acquired == 1
+
+def test_async_stream_query_awaits_each_fetch(async_client, monkeypatch):
+    client, pool = async_client
+    pool.connection.batches = [[("a", "A"), ("b", "B")], [("c", "C")]]
+    monkeypatch.setenv("ORACLE_STREAM_PREFETCHROWS", "3")
+    
+    async def collect():
+        rows = []
+        async for row in client.stream_query("SELECT id, title FROM manhwa", arraysize=2, row_format="tuple"):
+            rows.append(row)
+        return rows
+    
+    assert asyncio.run(collect()) == [("a", "A"), ("b", "B"), ("c", "C")]
+    assert pool.connection.closed_cursors == 1 and pool.released == 1
@@ -0,0 +1,59 @@
+import asyncio
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+def test_pool_status_without_oracle_client_loaded(monkeypatch):
+    from rest.manhwa_import import router
+    
+    # As in ORACLE_SKIP mode, where the lazy import never happens
+    monkeypatch.delitem(sys.modules, "dal.oracle_client", raising=False)
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1/admin")
+    
+    response = TestClient(app).get("/api/v1/admin/db/pool")
+    assert response.status_code == 200
+    assert response.json() == {"status": "success", "data": {"initialized": False}}
+
+def test_pool_config_from_env(monkeypatch):
+    pytest.importorskip("oracledb")
+    from dal.oracle_client import _pool_config, get_pool_stats
+    
+    monkeypatch.setenv("ORACLE_POOL_MIN", "1")
+    monkeypatch.setenv("ORACLE_POOL_MAX", "4")
+    config = _pool_config()
+    assert config["min"] == 1 and config["max"] == 4
+    assert get_pool_stats()["initialized"] is False
+
+class _DrainingPool:
+    """Thread-mode pool whose busy sessions are released one per `busy` check"""
+    
+    def __init__(self, busy: int, releases: bool = True):
+        self._busy = busy
+        self.releases = releases
+        self.closed_with = None
+    
+    @property
+    def busy(self) -> int:
+        busy = self._busy
+        if self.releases and self._busy:
+            self._busy -= 1
+        return busy
+    
+    def close(self, force=False):
+        self.closed_with = force
+
+@pytest.mark.parametrize("releases, forced", [(True, False), (False, True)])
+def test_close_pool_drains_busy_sessions_before_forcing(monkeypatch, releases, forced):
+    pytest.importorskip("oracledb")
+    import dal.oracle_client as oracle_client
+    
+    pool = _DrainingPool(busy=3, releases=releases)
+    monkeypatch.setattr(oracle_client, "_pool", pool)
+    asyncio.run(oracle_client.close_pool(drain_timeout=0.2))
+    
+    # Force only when sessions outlived the drain timeout
+    assert pool.closed_with is forced
+    assert oracle_client._pool is None
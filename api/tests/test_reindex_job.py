@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+import pytest
+
+from services import reindex_job
+from services.embedding_provider import HashingEmbeddingProvider
+from services.reindex_job import ReindexJob
+from services.vector_index import VectorIndex
+
+class _CatalogOracle:
+    """Keyset reads over an in-memory catalog; `fail_on_write` raises on that (1-based) write"""
+    
+    def __init__(self, count: int, edited=(), fail_on_write=None):
+        self.rows = [
+            {"id": f"m{i:02d}", "title": f"Title {i}", "description": "", "genre": [], "updated_at": i}
+            for i in range(count)
+        ]
+        self.edited = set(edited)
+        self.fail_on_write = fail_on_write
+        self.writes = []
+        self.counted_after = []
+    
+    async def count_manhwa(self, after_id=None):
+        self.counted_after.append(after_id)
+        return sum(1 for row in self.rows if after_id is None or row["id"] > after_id)
+    
+    async def get_manhwa_after_id(self, after_id, limit):
+        return [row for row in self.rows if after_id is None or row["id"] > after_id][:limit]
+    
+    async def update_manhwa_embeddings(self, rows):
+        if len(self.writes) + 1 == self.fail_on_write:
+            raise RuntimeError("ORA-03113: end-of-file on communication channel")
+        self.writes.append([row["id"] for row in rows])
+        # Rows edited since they were read fail the updated_at guard
+        return {"updated_ids": [row["id"] for row in rows if row["id"] not in self.edited], "errors": []}
+
+@pytest.fixture
+def provider(monkeypatch):
+    provider = HashingEmbeddingProvider()
+    monkeypatch.setattr("services.embedding_provider.get_embedding_provider", lambda: provider)
+    monkeypatch.setattr("services.vector_index._vector_index", None)
+    return provider
+
+def _run(job: ReindexJob, restart: bool = False) -> None:
+    async def run():
+        assert job.start(restart)
+        await job._task
+    asyncio.run(run())
+
+def test_full_run_updates_every_row_and_clears_the_checkpoint(tmp_path, provider, monkeypatch):
+    index = VectorIndex()
+    index.upsert({"id": "m03"}, [1.0] + [0.0] * 383)
+    monkeypatch.setattr("services.vector_index._vector_index", index)
+    
+    oracle = _CatalogOracle(7, edited={"m05"})
+    job = ReindexJob(oracle, str(tmp_path / "checkpoint.json"), batch_size=3, workers=2)
+    _run(job)
+    
+    status = job.get_status()
+    assert status["state"] == "completed" and status["model_id"] == provider.model_id
+    assert (status["total"], status["processed"], status["updated"], status["skipped"]) == (7, 7, 6, 1)
+    assert oracle.writes == [["m00", "m01", "m02"], ["m03", "m04", "m05"], ["m06"]]
+    assert status["checkpoint"] is None
+    # The in-process index now holds the new model's vector
+    assert index.get_vector("m03") == pytest.approx(provider.encode_one("Title 3. Title 3.  "), abs=1e-6)
+
+def test_failed_run_resumes_after_the_last_committed_batch(tmp_path, provider):
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+    oracle = _CatalogOracle(7, fail_on_write=2)
+    job = ReindexJob(oracle, checkpoint_path, batch_size=3, workers=1)
+    _run(job)
+    
+    assert job.state == "failed" and "ORA-03113" in job.error
+    with open(checkpoint_path) as f:
+        assert json.load(f)["last_id"] == "m02"
+    
+    oracle.fail_on_write = None
+    _run(job)
+    assert job.resumed_after == "m02" and oracle.counted_after[-1] == "m02"
+    assert oracle.writes[1:] == [["m03", "m04", "m05"], ["m06"]]
+    
+    # A restart ignores the checkpoint and walks the whole catalog again
+    _run(job, restart=True)
+    assert job.resumed_after is None and job.processed == 7
+
+def test_checkpoint_from_another_model_is_ignored(tmp_path, provider):
+    checkpoint_path = tmp_path / "checkpoint.json"
+    checkpoint_path.write_text(json.dumps({"model_id": "onnx:other:abc", "last_id": "m05"}))
+    job = ReindexJob(_CatalogOracle(7), str(checkpoint_path), batch_size=10)
+    _run(job)
+    assert job.resumed_after is None and job.processed == 7
+
+def test_only_one_job_runs_per_checkpoint(tmp_path, provider):
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+    first = ReindexJob(_CatalogOracle(3), checkpoint_path)
+    second = ReindexJob(_CatalogOracle(3), checkpoint_path)
+    
+    async def run():
+        assert first.start()
+        # Another worker sharing the checkpoint can't take the lock while the first runs
+        assert second.start() is False
+        assert first.start() is False
+        await first._task
+        assert second.start()
+        await second._task
+    
+    asyncio.run(run())
+    assert first.state == second.state == "completed"
+
+def test_checkpoint_path_defaults_under_the_data_dir(tmp_path, monkeypatch):
+    monkeypatch.delenv("REINDEX_CHECKPOINT_PATH", raising=False)
+    monkeypatch.setenv("API_DATA_DIR", str(tmp_path / "data"))
+    assert reindex_job.reindex_checkpoint_path() == str(tmp_path / "data" / "reindex_checkpoint.json")
+    assert (tmp_path / "data").is_dir()
+    
+    monkeypatch.setenv("REINDEX_CHECKPOINT_PATH", "/var/lib/codex/reindex.json")
+    assert reindex_job.reindex_checkpoint_path() == "/var/lib/codex/reindex.json"
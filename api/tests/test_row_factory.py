@@ -0,0 +1,42 @@
+import pytest
+
+from dal.row_factory import RowDecoder, make_record_type
+
+class _DbType:
+    def __init__(self, name):
+        self.name = name
+
+class _Lob:
+    def __init__(self, value):
+        self.value = value
+    
+    def read(self):
+        return self.value
+
+DESCRIPTION = [("ID", _DbType("DB_TYPE_VARCHAR")), ("DESCRIPTION", _DbType("DB_TYPE_CLOB"))]
+
+def test_dict_tuple_and_record_formats():
+    rows = [("m1", "first"), ("m2", None)]
+    
+    assert RowDecoder(DESCRIPTION).decode_many(rows) == [{"id": "m1", "description": "first"}, {"id": "m2", "description": None}]
+    assert RowDecoder(DESCRIPTION, "tuple").decode_many(rows) == rows
+    
+    record = RowDecoder(DESCRIPTION, "record").decode(rows[0])
+    assert (record.id, record.description) == ("m1", "first")
+    assert record._asdict() == {"id": "m1", "description": "first"}
+    with pytest.raises(AttributeError):
+        record.extra = 1
+
+def test_lob_locators_are_read_when_not_inline():
+    decoder = RowDecoder(DESCRIPTION, "tuple", lobs_inline=False)
+    assert decoder.lob_indexes == (1,)
+    assert decoder.decode_many([("m1", _Lob("text")), ("m2", None)]) == [("m1", "text"), ("m2", None)]
+
+def test_unknown_row_format():
+    with pytest.raises(ValueError):
+        RowDecoder(DESCRIPTION, "namedtuple")
+
+def test_record_attributes_for_awkward_column_names():
+    record_type = make_record_type(("count(*)", "count(*)", "sys$x", "class", "1st", "_asdict"))
+    record = record_type(1, 2, 3, 4, 5, 6)
+    assert record._asdict() == {"count___": 1, "count____2": 2, "sys_x": 3, "class_": 4, "_1st": 5, "_asdict_2": 6}
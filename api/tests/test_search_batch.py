@@ -0,0 +1,91 @@
+import asyncio
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from rest.search import router
+from services.embedding_provider import HashingEmbeddingProvider, manhwa_text
+from services.search_service import SearchService
+from services.vector_index import VectorIndex
+
+CATALOG = [
+    {"id": "solo", "title": "Solo Leveling", "author": "Chugong", "genre": ["Action"], "status": "completed",
+     "description": "The weakest hunter levels up alone."},
+    {"id": "tog", "title": "Tower of God", "author": "SIU", "genre": ["Fantasy"], "status": "ongoing",
+     "description": "A boy climbs the tower."},
+    {"id": "orv", "title": "Omniscient Reader", "author": "Sing Shong", "genre": ["Action"], "status": "ongoing",
+     "description": "A reader survives a hunter apocalypse."},
+]
+
+class _CountingEmbedder(HashingEmbeddingProvider):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+    
+    async def encode_async(self, texts):
+        self.calls += 1
+        return self.encode(texts)
+
+class _EmptyOracle:
+    """Knows no manhwa beyond the index; only reached for ids the index doesn't hold"""
+    
+    async def get_manhwa_embeddings(self, manhwa_ids):
+        return {}
+    
+    async def get_manhwa_by_id(self, manhwa_id):
+        return None
+
+def _service(monkeypatch) -> SearchService:
+    embedder = _CountingEmbedder()
+    index = VectorIndex()
+    for manhwa in CATALOG:
+        index.upsert(manhwa, embedder.encode_one(manhwa_text(manhwa["title"], manhwa["description"], manhwa["genre"])))
+    index.ready = True
+    monkeypatch.setattr("services.vector_index._vector_index", index)
+    monkeypatch.setattr("services.lexical_index._lexical_index", None)
+    
+    service = SearchService(oracle_client=_EmptyOracle())
+    service.embedder = embedder
+    return service
+
+def test_batch_matches_individual_searches_with_one_encode(monkeypatch):
+    service = _service(monkeypatch)
+    requests = [
+        {"query": "hunter", "limit": 2},
+        {"similar_to": "solo", "limit": 5},
+        {"query": "tower", "limit": 3, "genre": "Action", "status": "ongoing"},
+        {"similar_to": "missing", "limit": 5},
+    ]
+    
+    batch = asyncio.run(service.search_batch(requests))
+    assert service.embedder.calls == 1
+    
+    assert batch[0] == asyncio.run(service._search("hunter", 2))
+    # find_similar rows have no snippet; everything else must agree
+    assert [{k: v for k, v in r.items() if k != "snippet"} for r in batch[1]] == asyncio.run(service._find_similar("solo", 5))
+    assert batch[2] == asyncio.run(service._search("tower", 3, genre="Action", status="ongoing"))
+    assert "solo" not in [result["id"] for result in batch[1]]
+    assert batch[2] and all(result["id"] == "orv" for result in batch[2])
+    assert batch[3] == []
+
+def test_batch_route_validates_items_and_keys_results_by_id(monkeypatch):
+    service = _service(monkeypatch)
+    app = FastAPI()
+    app.state.services = SimpleNamespace(search_service=service)
+    app.include_router(router, prefix="/search")
+    client = TestClient(app)
+    
+    response = client.post("/search/batch", json={"searches": [
+        {"id": "q", "q": "tower", "limit": 1}, {"id": "s", "similar_to": "tog", "limit": 2}
+    ]})
+    assert response.status_code == 200
+    body = response.json()
+    assert [result["id"] for result in body["q"]] == ["tog"]
+    assert len(body["s"]) == 2 and body["s"][0]["relevance_score"] == 1 - body["s"][0]["similarity_score"]
+    
+    duplicate = client.post("/search/batch", json={"searches": [{"id": "x", "q": "a"}, {"id": "x", "q": "b"}]})
+    assert duplicate.status_code == 400
+    both = client.post("/search/batch", json={"searches": [{"id": "x", "q": "a", "similar_to": "tog"}]})
+    assert both.status_code == 400
+    assert client.post("/search/batch", json={"searches": []}).status_code == 422
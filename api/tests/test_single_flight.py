@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from services.single_flight import SingleFlight
+
+def test_concurrent_calls_for_one_key_share_a_single_execution():
+    group = SingleFlight("test")
+    started = []
+    
+    async def load():
+        started.append(1)
+        await asyncio.sleep(0.01)
+        return {"id": "m1"}
+    
+    async def run():
+        return await asyncio.gather(*(group.do("m1", load) for _ in range(5)), group.do("m2", load))
+    
+    results = asyncio.run(run())
+    assert len(started) == 2
+    assert results[0] is results[4]
+    assert group.get_stats() == {"calls": 6, "executed": 2, "collapsed": 4, "in_flight": 0}
+
+def test_errors_reach_every_waiter_and_are_not_remembered():
+    group = SingleFlight("test")
+    attempts = []
+    
+    async def flaky():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        if len(attempts) == 1:
+            raise RuntimeError("ORA-12170")
+        return "ok"
+    
+    async def run():
+        first = await asyncio.gather(group.do("k", flaky), group.do("k", flaky), return_exceptions=True)
+        return first, await group.do("k", flaky)
+    
+    first, retried = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in first)
+    assert retried == "ok" and len(attempts) == 2
+
+def test_a_cancelled_caller_does_not_cancel_the_shared_work():
+    group = SingleFlight("test")
+    
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "done"
+    
+    async def run():
+        impatient = asyncio.ensure_future(group.do("k", slow))
+        patient = asyncio.ensure_future(group.do("k", slow))
+        await asyncio.sleep(0)
+        impatient.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await impatient
+        return await patient
+    
+    assert asyncio.run(run()) == "done"
+
+def test_forget_starts_a_fresh_call_for_later_callers():
+    group = SingleFlight("test")
+    release = None
+    
+    async def old():
+        await release.wait()
+        return "old"
+    
+    async def new():
+        await asyncio.sleep(0.01)
+        return "new"
+    
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        first = asyncio.ensure_future(group.do("k", old))
+        await asyncio.sleep(0)
+        group.forget("k")
+        second = asyncio.ensure_future(group.do("k", new))
+        await asyncio.sleep(0)
+        
+        release.set()
+        assert await first == "old"
+        # The forgotten call finishing must not drop the newer call's entry
+        assert group.get_stats()["in_flight"] == 1
+        assert await group.do("k", old) == "new"
+        return await second
+    
+    assert asyncio.run(run()) == "new"
+    assert group.get_stats()["executed"] == 2
@@ -0,0 +1,123 @@
+import asyncio
+import random
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from rest.http_cache import SUGGEST_POLICY
+from rest.search import router
+from services import suggest_index as suggest_module
+from services.search_service import SearchService
+from services.suggest_index import SuggestIndex
+
+CATALOG = [
+    {"id": "solo", "title": "Solo Leveling", "author": "Chugong", "genre": ["Action", "Fantasy"], "view_count": 900},
+    {"id": "tog", "title": "Tower of God", "author": "SIU", "genre": ["Fantasy"], "view_count": 500},
+    {"id": "sweet", "title": "Sweet Home", "author": "Carnby Kim", "genre": ["Horror"], "view_count": 300},
+    {"id": "second", "title": "Second Life Ranker", "author": "Sadoyeon", "genre": ["Action"], "view_count": 50},
+]
+
+def _index(rows=CATALOG) -> SuggestIndex:
+    index = SuggestIndex()
+    index._build(rows)
+    return index
+
+def _texts(index: SuggestIndex, prefix: str, limit: int = 8):
+    return [suggestion["text"] for suggestion in index.suggest(prefix, limit)]
+
+def test_prefixes_match_the_start_of_any_word_ranked_by_popularity():
+    index = _index()
+    # SIU's 500 views come from Tower of God; on a tie, titles rank ahead of authors
+    assert _texts(index, "s") == ["Solo Leveling", "SIU", "Sweet Home", "Second Life Ranker", "Sadoyeon"]
+    # Both match at a later word, which halves their score
+    assert _texts(index, "L") == ["Solo Leveling", "Second Life Ranker"]
+    assert _texts(index, "  tower   OF ") == ["Tower of God"]
+    assert _texts(index, "s", limit=2) == ["Solo Leveling", "SIU"]
+    assert index.suggest("") == [] and index.suggest("xyz") == []
+
+def test_authors_and_genres_are_weighted_by_their_manhwa_views():
+    suggestions = _index().suggest("fan")
+    assert suggestions == [{"text": "Fantasy", "type": "genre", "id": None, "score": 1401.0}]
+    assert _index().suggest("solo")[0] == {"text": "Solo Leveling", "type": "title", "id": "solo", "score": 901.0}
+
+def test_writes_update_titles_and_drop_empty_groups():
+    index = _index()
+    assert _texts(index, "horror") == ["Horror"]
+    
+    index.upsert({**CATALOG[2], "title": "Bitter Home", "genre": ["Thriller"]})
+    assert _texts(index, "sweet") == []
+    assert _texts(index, "home") == ["Bitter Home"]
+    # Sweet Home was the only horror manhwa, so the genre stops being suggested
+    assert _texts(index, "horror") == []
+    
+    assert index.remove("solo") is True
+    assert index.remove("solo") is False
+    assert _texts(index, "l") == ["Second Life Ranker"]
+    assert index.get_stats()["entries"] == 3
+
+def test_heavy_prefix_lists_stay_exact_through_writes(monkeypatch):
+    # A tiny threshold makes every short prefix heavy, so writes go through the patching path
+    monkeypatch.setattr(suggest_module, "HEAVY_PREFIX_KEYS", 3)
+    monkeypatch.setenv("SUGGEST_MAX_LIMIT", "2")
+    rng = random.Random(7)
+    words = ["alpha", "beta", "bravo", "banner", "ash", "amber", "blue"]
+    
+    def row(manhwa_id: int):
+        return {
+            "id": f"m{manhwa_id}",
+            "title": " ".join(rng.sample(words, 2)),
+            "author": rng.choice(["Ann", "Abe", "Bo"]),
+            "genre": [rng.choice(["Action", "Adventure", "Boys Love"])],
+            "view_count": rng.randrange(100)
+        }
+    
+    index = _index([row(i) for i in range(30)])
+    assert index.get_stats()["heavy_prefixes"] > 0
+    for step in range(200):
+        manhwa_id = rng.randrange(40)
+        if rng.random() < 0.3:
+            index.remove(f"m{manhwa_id}")
+        else:
+            index.upsert(row(manhwa_id))
+        
+        prefix = rng.choice(["a", "b", "al", "ba", "bo", "ab"])
+        expected = SuggestIndex()
+        expected._build([{"id": manhwa_id, **doc} for manhwa_id, doc in index._docs.items()])
+        # Rank every prefix from the keys, as a reference for the patched lists
+        expected._heavy.clear()
+        assert index.suggest(prefix, 2) == expected.suggest(prefix, 2), (step, prefix)
+
+def test_warm_replays_writes_made_during_the_rebuild():
+    class _Oracle:
+        def __init__(self, index):
+            self.index = index
+        
+        async def iter_all_manhwa(self):
+            yield CATALOG[0]
+            self.index.upsert(CATALOG[1])
+            self.index.remove("solo")
+    
+    index = SuggestIndex()
+    assert asyncio.run(index.warm(_Oracle(index))) == 1
+    assert index.ready
+    assert _texts(index, "s") == ["SIU"]
+    assert _texts(index, "t") == ["Tower of God"]
+
+def test_suggest_route_is_not_cached_until_the_index_is_ready(monkeypatch):
+    app = FastAPI()
+    app.state.services = SimpleNamespace(search_service=SearchService(oracle_client=object()))
+    app.include_router(router, prefix="/search")
+    client = TestClient(app)
+    
+    monkeypatch.setattr(suggest_module, "_suggest_index", None)
+    response = client.get("/search/suggest", params={"q": "so"})
+    assert response.json() == []
+    assert response.headers["cache-control"] == "no-store"
+    
+    index = _index()
+    index.ready = True
+    monkeypatch.setattr(suggest_module, "_suggest_index", index)
+    response = client.get("/search/suggest", params={"q": "so"})
+    assert response.json()[0]["text"] == "Solo Leveling"
+    assert response.headers["cache-control"] == SUGGEST_POLICY
@@ -0,0 +1,100 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from services.vector_index import VectorIndex
+
+def _vector(*values) -> list:
+    vector = np.zeros(4, dtype=np.float32)
+    vector[:len(values)] = values
+    return vector.tolist()
+
+def _manhwa(manhwa_id: str, genre=None, status="ongoing") -> dict:
+    return {"id": manhwa_id, "title": manhwa_id.title(), "genre": genre or [], "status": status}
+
+def _index() -> VectorIndex:
+    index = VectorIndex(dimension=4, capacity=2)
+    index.upsert(_manhwa("a", ["Action"]), _vector(1, 0))
+    index.upsert(_manhwa("b", ["Action", "Fantasy"], "completed"), _vector(1, 1))
+    index.upsert(_manhwa("c", ["Romance"]), _vector(0, 1))
+    return index
+
+def test_results_are_ordered_by_cosine_distance():
+    index = _index()
+    results = index.search(_vector(2, 0), limit=2)
+    
+    assert [result["id"] for result in results] == ["a", "b"]
+    assert results[0]["similarity_score"] == pytest.approx(0.0, abs=1e-6)
+    assert results[1]["similarity_score"] == pytest.approx(1 - 1 / np.sqrt(2), abs=1e-6)
+    # Rows carry the listed fields only; vectors never leak into results
+    assert "embedding" not in results[0]
+
+def test_genre_and_status_filters_and_exclude_id():
+    index = _index()
+    query = _vector(1, 0)
+    
+    assert [r["id"] for r in index.search(query, genre="Action")] == ["a", "b"]
+    assert [r["id"] for r in index.search(query, genre="Action", status="completed")] == ["b"]
+    assert [r["id"] for r in index.search(query, genre="Action", exclude_id="a")] == ["b"]
+    assert [r["id"] for r in index.search(query, exclude_id="a")] == ["b", "c"]
+    assert index.search(query, genre="Horror") == []
+
+def test_remove_moves_the_last_row_into_the_hole():
+    index = _index()
+    assert index.remove("a") is True
+    assert index.remove("a") is False
+    
+    assert len(index) == 2 and "a" not in index
+    # "c" moved into position 0 and kept its genre mask and vector
+    assert [r["id"] for r in index.search(_vector(0, 1), genre="Romance")] == ["c"]
+    assert [r["id"] for r in index.search(_vector(1, 0), genre="Action")] == ["b"]
+    assert index.get_vector("c") == pytest.approx([0, 1, 0, 0])
+
+def test_upsert_replaces_filters_and_grows_past_capacity():
+    index = _index()
+    index.upsert(_manhwa("a", ["Romance"]), _vector(0, 1))
+    assert [r["id"] for r in index.search(_vector(1, 0), genre="Action")] == ["b"]
+    assert {r["id"] for r in index.search(_vector(0, 1), genre="Romance")} == {"a", "c"}
+    
+    # Started with capacity 2; three rows forced a growth and the masks followed
+    assert index.get_stats()["capacity"] == 4
+    for i in range(5):
+        index.upsert(_manhwa(f"x{i}", ["Action"]), _vector(0, 0, 1))
+    assert len(index) == 8
+    assert len(index.search(_vector(0, 0, 1), limit=20, genre="Action")) == 6
+    
+    # A row without an embedding is dropped, as Oracle's vector search skips it
+    index.upsert(_manhwa("x0"), None)
+    assert "x0" not in index
+
+def test_search_many_matches_individual_searches():
+    index = _index()
+    searches = [
+        {"embedding": _vector(1, 0), "limit": 2},
+        {"embedding": _vector(0, 1), "limit": 3, "genre": "Action"},
+        {"embedding": _vector(1, 1), "limit": 1, "exclude_id": "b"},
+        {"embedding": _vector(1, 0), "genre": "Horror"},
+    ]
+    expected = [index.search(search["embedding"], **{k: v for k, v in search.items() if k != "embedding"}) for search in searches]
+    assert index.search_many(searches) == expected
+
+def test_rejects_vectors_of_the_wrong_dimension():
+    with pytest.raises(ValueError, match="4-dim"):
+        _index().search([1.0, 0.0])
+
+def test_warm_replays_writes_made_during_the_rebuild():
+    class _Oracle:
+        def __init__(self, index):
+            self.index = index
+        
+        async def iter_manhwa_embeddings(self):
+            yield {**_manhwa("a"), "embedding": _vector(1, 0)}
+            # Writes that land mid-rebuild must survive the swap
+            self.index.upsert(_manhwa("new"), _vector(0, 1))
+            self.index.remove("a")
+            yield {**_manhwa("b"), "embedding": _vector(1, 1)}
+    
+    index = VectorIndex(dimension=4)
+    assert asyncio.run(index.warm(_Oracle(index))) == 2
+    assert index.ready and "a" not in index and "new" in index and "b" in index
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("oracledb")
+
+from services.vector_index_lifecycle import VectorIndexLifecycle
+
+class _IndexOracle:
+    """Exact searches return m1..m4; approximate ones miss m4, as a low-accuracy index might"""
+    
+    def __init__(self, rebuild_error=None):
+        self.rebuild_error = rebuild_error
+        self.rebuild_started = asyncio.Event()
+        self.release_rebuild = asyncio.Event()
+        self.searches = []
+    
+    async def rebuild_vector_index(self, index_type, accuracy, parameters, parallel=None):
+        self.rebuild_started.set()
+        await self.release_rebuild.wait()
+        if self.rebuild_error:
+            raise self.rebuild_error
+    
+    async def sample_manhwa_ids(self, count):
+        return ["m0", "m1"][:count]
+    
+    async def get_manhwa_embeddings(self, manhwa_ids):
+        return {manhwa_id: [0.1] for manhwa_id in manhwa_ids}
+    
+    async def search_similar_manhwa(self, embedding, limit, exclude_id=None, accuracy=None):
+        self.searches.append(("similar", exclude_id, accuracy))
+        ids = ["m1", "m2", "m3", "m4"] if accuracy == 100 else ["m1", "m2", "m3", "m9"]
+        return [{"id": manhwa_id} for manhwa_id in ids if manhwa_id != exclude_id][:limit]
+    
+    async def search_manhwa_hybrid(self, embedding, genre_filter=None, limit=10, accuracy=None):
+        self.searches.append(("hybrid", genre_filter, accuracy))
+        return [{"id": manhwa_id} for manhwa_id in ["m0", "m1", "m2", "m3"]][:limit]
+
+def test_only_one_rebuild_runs_and_its_outcome_is_recorded():
+    async def run():
+        oracle = _IndexOracle()
+        lifecycle = VectorIndexLifecycle(oracle)
+        with pytest.raises(ValueError):
+            lifecycle.start_rebuild("LSH", 95, {})
+        
+        assert lifecycle.start_rebuild("hnsw", 95, {"neighbors": 16})
+        await oracle.rebuild_started.wait()
+        assert lifecycle.start_rebuild("IVF", 95, {}) is False
+        assert lifecycle.rebuild["state"] == "running" and lifecycle.rebuild["index_type"] == "HNSW"
+        
+        oracle.release_rebuild.set()
+        await lifecycle._task
+        assert lifecycle.rebuild["state"] == "completed" and lifecycle.rebuild["build_seconds"] is not None
+        
+        oracle.rebuild_error = RuntimeError("ORA-51962: vector memory area is out of space")
+        assert lifecycle.start_rebuild("HNSW", 95, {})
+        await lifecycle._task
+        assert lifecycle.rebuild["state"] == "failed" and "ORA-51962" in lifecycle.rebuild["error"]
+    
+    asyncio.run(run())
+
+def test_stop_cancels_a_running_rebuild():
+    async def run():
+        oracle = _IndexOracle()
+        lifecycle = VectorIndexLifecycle(oracle)
+        lifecycle.start_rebuild("IVF", 95, {})
+        await oracle.rebuild_started.wait()
+        await lifecycle.stop()
+        assert not lifecycle.running and lifecycle.rebuild["state"] == "cancelled"
+    
+    asyncio.run(run())
+
+def test_recall_compares_approximate_results_with_exact_ones():
+    oracle = _IndexOracle()
+    report = asyncio.run(VectorIndexLifecycle(oracle).measure_recall(80, k=3, samples=2))
+    
+    # m0's exact top 3 is m1..m3, all found; m1's is m2..m4 and the approximate search misses m4
+    assert report["samples"] == 2
+    assert report["recall"] == pytest.approx((1 + 2 / 3) / 2, abs=1e-4)
+    assert report["min_recall"] == pytest.approx(2 / 3, abs=1e-4)
+    assert {accuracy for _, _, accuracy in oracle.searches} == {100, 80}
+    
+    # Hybrid search can't exclude the query manhwa, so it is dropped from the results instead
+    report = asyncio.run(VectorIndexLifecycle(oracle).measure_recall(80, k=2, samples=1, genre="Action"))
+    assert report["recall"] == 1.0
+    assert oracle.searches[-1] == ("hybrid", "Action", 80)
@@ -0,0 +1,80 @@
+import asyncio
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from rest.manhwa import router
+from services import view_counter as view_counter_module
+from services.manhwa_service import ManhwaService
+from services.view_counter import ViewCounterBuffer
+
+MANHWA = {
+    "id": "solo", "title": "Solo Leveling", "author": "Chugong", "genre": ["action"],
+    "status": "completed", "description": "Hunters", "slug": "solo-leveling"
+}
+
+class _FakeOracleClient:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.flushes = []
+    
+    async def increment_view_counts(self, counts):
+        if self.fail:
+            raise RuntimeError("ORA-03113: end-of-file on communication channel")
+        self.flushes.append(counts)
+    
+    async def get_manhwa_by_id(self, manhwa_id):
+        return MANHWA if manhwa_id == MANHWA["id"] else None
+
+def test_views_are_coalesced_per_manhwa():
+    oracle = _FakeOracleClient()
+    buffer = ViewCounterBuffer(oracle)
+    for manhwa_id in ("a", "b", "a", "a"):
+        buffer.record(manhwa_id)
+    
+    assert asyncio.run(buffer.flush()) == 4
+    assert oracle.flushes == [{"a": 3, "b": 1}]
+    assert buffer.unflushed_views == 0
+
+def test_failed_flush_keeps_views_for_the_next_one():
+    oracle = _FakeOracleClient(fail=True)
+    buffer = ViewCounterBuffer(oracle)
+    buffer.record("a", 2)
+    
+    assert asyncio.run(buffer.flush()) == 0
+    assert buffer.unflushed_views == 2 and buffer.failed_flushes == 1
+    
+    oracle.fail = False
+    buffer.record("a")
+    assert asyncio.run(buffer.flush()) == 3
+    assert oracle.flushes == [{"a": 3}]
+
+def test_threshold_triggers_an_early_flush(monkeypatch):
+    monkeypatch.setenv("VIEW_COUNT_FLUSH_THRESHOLD", "3")
+    oracle = _FakeOracleClient()
+    
+    async def record_views():
+        buffer = ViewCounterBuffer(oracle)
+        for _ in range(3):
+            buffer.record("a")
+        await buffer._threshold_task
+    
+    asyncio.run(record_views())
+    assert oracle.flushes == [{"a": 3}]
+
+def test_detail_route_records_a_view(monkeypatch):
+    oracle = _FakeOracleClient()
+    buffer = ViewCounterBuffer(oracle)
+    monkeypatch.setattr(view_counter_module, "_view_counter", buffer)
+    app = FastAPI()
+    app.state.services = SimpleNamespace(manhwa_service=ManhwaService(oracle_client=oracle))
+    app.include_router(router, prefix="/manhwa")
+    client = TestClient(app)
+    
+    assert client.get("/manhwa/solo").status_code == 200
+    assert client.get("/manhwa/solo").status_code == 200
+    assert client.get("/manhwa/missing").status_code == 404
+    # Only found manhwa are counted
+    assert buffer.unflushed_views == 2
+    assert buffer.get_status()["unflushed_manhwa"] == 1
@@ -1,10 +1,190 @@
 import oracledb
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 import json
 from datetime import datetime
 import asyncio
+import time
+from array import array
 from contextlib import asynccontextmanager
+from dal.row_factory import RowDecoder
+
+# Process-wide session pool shared by every OracleClient instance
+_pool = None
+_pool_lock: Optional[asyncio.Lock] = None
+
+def _use_async_driver() -> bool:
+    """Whether to use python-oracledb's native asyncio driver instead of the thread pool"""
+    return os.getenv('ORACLE_DRIVER_MODE', 'thread').lower() == 'async'
+
+_native_vectors: Optional[bool] = None
+
+def _supports_native_vectors() -> bool:
+    """Thin mode and 23ai Instant Client can bind VECTOR values natively; older thick clients cannot"""
+    global _native_vectors
+    
+    if _native_vectors is None:
+        try:
+            _native_vectors = oracledb.is_thin_mode() or oracledb.clientversion()[0] >= 23
+        except Exception:
+            _native_vectors = False
+    return _native_vectors
+
+def to_vector(embedding: Optional[List[float]]):
+    """Convert an embedding to a VECTOR bind value (array of float32 where supported)"""
+    if not embedding:
+        return None
+    if _supports_native_vectors():
+        return embedding if isinstance(embedding, array) else array('f', embedding)
+    # Text literal fallback, parsed server-side, for pre-23ai Instant Client
+    return f"[{','.join(map(str, embedding))}]"
+
+def _stream_config() -> Dict[str, int]:
+    """Default fetch tuning for streamed result sets"""
+    return {
+        'arraysize': int(os.getenv('ORACLE_STREAM_ARRAYSIZE', '500')),
+        'prefetchrows': int(os.getenv('ORACLE_STREAM_PREFETCHROWS', '501')),
+    }
+
+def _lob_output_type_handler(cursor, metadata):
+    """Fetch LOB columns inline as str/bytes instead of LOB locators needing a round trip each"""
+    if metadata.type_code is oracledb.DB_TYPE_CLOB:
+        return cursor.var(oracledb.DB_TYPE_LONG, arraysize=cursor.arraysize)
+    if metadata.type_code is oracledb.DB_TYPE_NCLOB:
+        return cursor.var(oracledb.DB_TYPE_LONG_NVARCHAR, arraysize=cursor.arraysize)
+    if metadata.type_code is oracledb.DB_TYPE_BLOB:
+        return cursor.var(oracledb.DB_TYPE_LONG_RAW, arraysize=cursor.arraysize)
+
+def _parse_genre(value) -> List[str]:
+    """Normalize a fetched genre value; JSON columns already arrive as Python lists"""
+    if isinstance(value, list):
+        return value
+    if not value:
+        return []
+    # Legacy CLOB column holding serialized JSON
+    try:
+        parsed = json.loads(value)
+        return parsed if isinstance(parsed, list) else []
+    except (json.JSONDecodeError, TypeError):
+        return []
+
+VECTOR_INDEX_NAME = "manhwa_vector_idx"
+
+def vector_index_ddl(index_type: str = "IVF", accuracy: int = 95, parameters: Optional[Dict[str, int]] = None,
+                     table: str = "manhwa", index_name: str = VECTOR_INDEX_NAME, parallel: Optional[int] = None,
+                     if_not_exists: bool = False) -> str:
+    """CREATE VECTOR INDEX statement for an IVF (neighbor partitions) or HNSW (in-memory graph) index
+    
+    `parameters` are the type-specific build options: `partitions` for IVF, `neighbors`
+    and `efconstruction` for HNSW. Options left out are Oracle's defaults.
+    """
+    parameters = parameters or {}
+    index_type = index_type.upper()
+    if index_type == "IVF":
+        organization = "NEIGHBOR PARTITIONS"
+        options = {"NEIGHBOR PARTITIONS": parameters.get("partitions")}
+    elif index_type == "HNSW":
+        organization = "INMEMORY NEIGHBOR GRAPH"
+        options = {"NEIGHBORS": parameters.get("neighbors"), "EFCONSTRUCTION": parameters.get("efconstruction")}
+    else:
+        raise ValueError(f"Unknown vector index type: {index_type}")
+    if not 1 <= int(accuracy) <= 100:
+        raise ValueError(f"Target accuracy must be between 1 and 100, got {accuracy}")
+    
+    clause = ", ".join([f"TYPE {index_type}"] + [f"{name} {int(value)}" for name, value in options.items() if value])
+    return f"""
+    CREATE VECTOR INDEX {"IF NOT EXISTS " if if_not_exists else ""}{index_name} ON {table} (embedding)
+    ORGANIZATION {organization}
+    DISTANCE COSINE
+    WITH TARGET ACCURACY {int(accuracy)}
+    PARAMETERS ({clause}){f" PARALLEL {int(parallel)}" if parallel else ""}
+    """
+
+def _env_accuracy(name: str) -> Optional[int]:
+    value = os.getenv(name, "")
+    return int(value) if value else None
+
+# Target accuracy of approximate searches through the vector index, per query kind; None or
+# 100 searches exactly, and is the default until an operator opts in. Process-local, so the
+# admin setting applies to this worker only.
+_search_accuracy: Dict[str, Optional[int]] = {
+    "similar": _env_accuracy("ORACLE_VECTOR_SIMILAR_ACCURACY"),
+    "hybrid": _env_accuracy("ORACLE_VECTOR_HYBRID_ACCURACY"),
+}
+
+def get_vector_search_accuracy() -> Dict[str, Optional[int]]:
+    return dict(_search_accuracy)
+
+def set_vector_search_accuracy(kind: str, accuracy: Optional[int]) -> None:
+    """Set the default target accuracy of `similar` or `hybrid` searches"""
+    if kind not in _search_accuracy:
+        raise ValueError(f"Unknown search kind: {kind}")
+    if accuracy is not None and not 1 <= accuracy <= 100:
+        raise ValueError(f"Target accuracy must be between 1 and 100, got {accuracy}")
+    _search_accuracy[kind] = accuracy
+
+def _fetch_first(limit_bind: str, accuracy: Optional[int]) -> str:
+    """Row limit of a vector search: exact top-k, or approximate through the index at `accuracy` percent"""
+    if accuracy is None or accuracy >= 100:
+        return f"FETCH FIRST {limit_bind} ROWS ONLY"
+    return f"FETCH APPROX FIRST {limit_bind} ROWS ONLY WITH TARGET ACCURACY {int(accuracy)}"
+
+def _pool_config() -> Dict[str, int]:
+    """Session pool sizing from environment variables"""
+    return {
+        'min': int(os.getenv('ORACLE_POOL_MIN', '2')),
+        'max': int(os.getenv('ORACLE_POOL_MAX', '10')),
+        'increment': int(os.getenv('ORACLE_POOL_INCREMENT', '1')),
+        # Idle sessions older than this many seconds are pinged on checkout (0 = always ping)
+        'ping_interval': int(os.getenv('ORACLE_POOL_PING_INTERVAL', '60')),
+        'wait_timeout': int(os.getenv('ORACLE_POOL_WAIT_TIMEOUT_MS', '5000')),
+    }
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Get statistics for the shared session pool"""
+    config = _pool_config()
+    mode = 'async' if _use_async_driver() else 'thread'
+    if _pool is None:
+        return {"initialized": False, "mode": mode, **config}
+    
+    return {
+        "initialized": True,
+        "mode": mode,
+        "min": _pool.min,
+        "max": _pool.max,
+        "increment": _pool.increment,
+        "ping_interval": _pool.ping_interval,
+        "opened": _pool.opened,
+        "busy": _pool.busy,
+        "idle": _pool.opened - _pool.busy,
+    }
+
+async def close_pool(drain_timeout: Optional[float] = None) -> None:
+    """Close the shared session pool, giving busy sessions `drain_timeout` seconds to be released
+    
+    Sessions still busy after that (ORACLE_POOL_DRAIN_TIMEOUT_S, 10 by default) are closed
+    anyway and their uncommitted work is rolled back.
+    """
+    global _pool
+    
+    if _pool is not None:
+        pool = _pool
+        _pool = None
+        if drain_timeout is None:
+            drain_timeout = float(os.getenv('ORACLE_POOL_DRAIN_TIMEOUT_S', '10'))
+        deadline = time.monotonic() + drain_timeout
+        while pool.busy and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        
+        # close() without force raises while sessions are busy
+        force = pool.busy > 0
+        if force:
+            print(f"Closing Oracle session pool with {pool.busy} sessions still busy")
+        if isinstance(pool, oracledb.AsyncConnectionPool):
+            await pool.close(force=force)
+        else:
+            await asyncio.get_running_loop().run_in_executor(None, lambda: pool.close(force=force))
+        print("Oracle session pool closed")
 
 class OracleClient:
     def __init__(self):
@@ -16,6 +196,12 @@ class OracleClient:
             'wallet_location': os.getenv('ORACLE_WALLET_LOCATION', '/opt/oracle/instantclient_21_13/network/admin'),
         }
         
+        # The asyncio driver only exists in thin mode, so skip loading Instant Client for it
+        self.async_mode = _use_async_driver()
+        if self.async_mode:
+            print("Oracle client using native asyncio driver (thin mode)")
+            return
+        
         # Initialize Oracle client with library path
         try:
             lib_dir = os.getenv('ORACLE_LIB_DIR', '/opt/oracle/instantclient_21_13')
@@ -29,62 +215,289 @@ class OracleClient:
             print(f"Oracle client initialization warning: {e}")
             print("Note: Oracle features will be limited without proper client setup")
     
+    async def get_pool(self):
+        """Get the shared session pool, creating it on first use"""
+        global _pool, _pool_lock
+        
+        if _pool is not None:
+            return _pool
+        
+        if _pool_lock is None:
+            _pool_lock = asyncio.Lock()
+        
+        async with _pool_lock:
+            if _pool is None:
+                config = _pool_config()
+                pool_params = {
+                    **self.connection_params,
+                    'min': config['min'],
+                    'max': config['max'],
+                    'increment': config['increment'],
+                    'ping_interval': config['ping_interval'],
+                    'getmode': oracledb.POOL_GETMODE_TIMEDWAIT,
+                    'wait_timeout': config['wait_timeout'],
+                }
+                if self.async_mode:
+                    _pool = oracledb.create_pool_async(**pool_params)
+                else:
+                    _pool = await asyncio.get_running_loop().run_in_executor(
+                        None, lambda: oracledb.create_pool(**pool_params)
+                    )
+                mode = 'async' if self.async_mode else 'thread'
+                print(f"Oracle session pool created (mode={mode}, min={config['min']}, max={config['max']})")
+        
+        return _pool
+    
     @asynccontextmanager
     async def get_connection(self):
-        connection = None
+        pool = await self.get_pool()
+        if self.async_mode:
+            connection = await pool.acquire()
+            try:
+                yield connection
+            finally:
+                await pool.release(connection)
+            return
+        
+        loop = asyncio.get_running_loop()
+        connection = await loop.run_in_executor(None, pool.acquire)
         try:
-            connection = await asyncio.get_event_loop().run_in_executor(
-                None, 
-                lambda: oracledb.connect(**self.connection_params)
-            )
             yield connection
         finally:
-            if connection:
-                connection.close()
+            # Hand the session back to the pool (rolls back any uncommitted work)
+            await loop.run_in_executor(None, pool.release, connection)
+    
+    def _fetch_rows(self, conn, query: str, params: tuple = None, row_format: str = 'dict', input_sizes: Optional[Dict[str, Any]] = None) -> List[Any]:
+        cursor = conn.cursor()
+        cursor.outputtypehandler = _lob_output_type_handler
+        try:
+            if input_sizes:
+                cursor.setinputsizes(**input_sizes)
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            
+            if not cursor.description:
+                return []
+            return RowDecoder(cursor.description, row_format).decode_many(cursor.fetchall())
+        finally:
+            cursor.close()
+    
+    async def _fetch_rows_async(self, conn, query: str, params: tuple = None, row_format: str = 'dict', input_sizes: Optional[Dict[str, Any]] = None) -> List[Any]:
+        cursor = conn.cursor()
+        cursor.outputtypehandler = _lob_output_type_handler
+        try:
+            if input_sizes:
+                cursor.setinputsizes(**input_sizes)
+            if params:
+                await cursor.execute(query, params)
+            else:
+                await cursor.execute(query)
+            
+            if not cursor.description:
+                return []
+            return RowDecoder(cursor.description, row_format).decode_many(await cursor.fetchall())
+        finally:
+            cursor.close()
+    
+    def _execute_and_commit(self, conn, query: str, params: tuple = None) -> None:
+        cursor = conn.cursor()
+        try:
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            conn.commit()
+        finally:
+            cursor.close()
+    
+    async def _execute_and_commit_async(self, conn, query: str, params: tuple = None) -> None:
+        cursor = conn.cursor()
+        try:
+            if params:
+                await cursor.execute(query, params)
+            else:
+                await cursor.execute(query)
+            await conn.commit()
+        finally:
+            cursor.close()
+    
+    def _execute_returning(self, conn, query: str, params: Dict[str, Any], returning: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        cursor = conn.cursor()
+        try:
+            out_vars = {name: cursor.var(db_type) for name, db_type in returning.items()}
+            # Autocommit piggybacks the commit on the execute round trip
+            conn.autocommit = True
+            try:
+                cursor.execute(query, {**params, **out_vars})
+            finally:
+                conn.autocommit = False
+            
+            if cursor.rowcount == 0:
+                return None
+            return {name: var.getvalue()[0] for name, var in out_vars.items()}
+        finally:
+            cursor.close()
+    
+    async def _execute_returning_async(self, conn, query: str, params: Dict[str, Any], returning: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        cursor = conn.cursor()
+        try:
+            out_vars = {name: cursor.var(db_type) for name, db_type in returning.items()}
+            conn.autocommit = True
+            try:
+                await cursor.execute(query, {**params, **out_vars})
+            finally:
+                conn.autocommit = False
+            
+            if cursor.rowcount == 0:
+                return None
+            return {name: var.getvalue()[0] for name, var in out_vars.items()}
+        finally:
+            cursor.close()
+    
+    def _execute_many(self, conn, query: str, rows: List[Dict[str, Any]], batch_size: int, row_counts: Optional[List[int]] = None,
+                      input_sizes: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        cursor = conn.cursor()
+        try:
+            if input_sizes:
+                cursor.setinputsizes(**input_sizes)
+            errors = []
+            for start in range(0, len(rows), batch_size):
+                cursor.executemany(query, rows[start:start + batch_size], batcherrors=True, arraydmlrowcounts=row_counts is not None)
+                for error in cursor.getbatcherrors():
+                    errors.append({"offset": start + error.offset, "message": error.message})
+                if row_counts is not None:
+                    row_counts.extend(cursor.getarraydmlrowcounts())
+            conn.commit()
+            return errors
+        finally:
+            cursor.close()
+    
+    async def _execute_many_async(self, conn, query: str, rows: List[Dict[str, Any]], batch_size: int, row_counts: Optional[List[int]] = None,
+                                  input_sizes: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        cursor = conn.cursor()
+        try:
+            if input_sizes:
+                cursor.setinputsizes(**input_sizes)
+            errors = []
+            for start in range(0, len(rows), batch_size):
+                await cursor.executemany(query, rows[start:start + batch_size], batcherrors=True, arraydmlrowcounts=row_counts is not None)
+                for error in cursor.getbatcherrors():
+                    errors.append({"offset": start + error.offset, "message": error.message})
+                if row_counts is not None:
+                    row_counts.extend(cursor.getarraydmlrowcounts())
+            await conn.commit()
+            return errors
+        finally:
+            cursor.close()
+    
+    async def execute_query(self, query: str, params: tuple = None, row_format: str = 'dict',
+                            input_sizes: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """Run a query and return all rows as dicts (default), tuples or __slots__ records
+        
+        `input_sizes` maps named binds to their types (cursor.setinputsizes), for binds
+        whose Python type would otherwise pick the wrong Oracle type.
+        """
+        async with self.get_connection() as conn:
+            if self.async_mode:
+                return await self._fetch_rows_async(conn, query, params, row_format, input_sizes)
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self._fetch_rows, conn, query, params, row_format, input_sizes
+            )
     
-    async def execute_query(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
+    async def stream_query(self, query: str, params: tuple = None, arraysize: int = None, prefetchrows: int = None, row_format: str = 'dict') -> AsyncIterator[Any]:
+        """Stream rows of a query as dicts without materializing the full result set
+        
+        Rows are fetched `arraysize` at a time over a single pooled session, which is held
+        until the iterator is exhausted or closed. LOB columns arrive inline as str/bytes.
+        
+        Args:
+            query: SELECT statement
+            params: Bind values
+            arraysize: Rows per fetch round trip (defaults to ORACLE_STREAM_ARRAYSIZE)
+            prefetchrows: Rows returned with the execute round trip (defaults to ORACLE_STREAM_PREFETCHROWS)
+            row_format: 'dict', 'tuple' or 'record'
+        """
+        config = _stream_config()
+        
         async with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.arraysize = arraysize or config['arraysize']
+            cursor.prefetchrows = prefetchrows or config['prefetchrows']
+            cursor.outputtypehandler = _lob_output_type_handler
+            loop = asyncio.get_running_loop()
             try:
-                if params:
-                    cursor.execute(query, params)
+                if self.async_mode:
+                    await cursor.execute(query, params)
                 else:
-                    cursor.execute(query)
-                
-                columns = [desc[0].lower() for desc in cursor.description] if cursor.description else []
-                rows = cursor.fetchall()
+                    await loop.run_in_executor(None, cursor.execute, query, params)
                 
-                # Handle CLOB objects by reading them immediately
-                results = []
-                for row in rows:
-                    result_dict = {}
-                    for i, value in enumerate(row):
-                        col_name = columns[i]
-                        # Handle CLOB objects by reading them immediately
-                        if hasattr(value, 'read'):
-                            try:
-                                result_dict[col_name] = value.read()
-                            except:
-                                result_dict[col_name] = str(value) if value else None
-                        else:
-                            result_dict[col_name] = value
-                    results.append(result_dict)
-                
-                return results
+                if not cursor.description:
+                    return
+                decode = RowDecoder(cursor.description, row_format).decode
+                while True:
+                    if self.async_mode:
+                        rows = await cursor.fetchmany()
+                    else:
+                        rows = await loop.run_in_executor(None, cursor.fetchmany)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield decode(row)
             finally:
                 cursor.close()
     
     async def execute_non_query(self, query: str, params: tuple = None) -> None:
         async with self.get_connection() as conn:
-            cursor = conn.cursor()
-            try:
-                if params:
-                    cursor.execute(query, params)
-                else:
-                    cursor.execute(query)
-                conn.commit()
-            finally:
-                cursor.close()
+            if self.async_mode:
+                await self._execute_and_commit_async(conn, query, params)
+                return
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._execute_and_commit, conn, query, params
+            )
+    
+    async def execute_returning(self, query: str, params: Dict[str, Any], returning: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Execute a DML statement with a RETURNING ... INTO clause and commit in one round trip
+        
+        Args:
+            query: DML statement whose RETURNING clause binds into the names in `returning`
+            params: Named input bind values
+            returning: Mapping of out bind name to its Python/DB type
+        
+        Returns:
+            Dict of returned values for the affected row, or None if no row matched
+        """
+        async with self.get_connection() as conn:
+            if self.async_mode:
+                return await self._execute_returning_async(conn, query, params, returning)
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self._execute_returning, conn, query, params, returning
+            )
+    
+    async def execute_many(self, query: str, rows: List[Dict[str, Any]], batch_size: int = 1000, row_counts: Optional[List[int]] = None,
+                           input_sizes: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Execute a DML statement for many rows using array DML, one round trip per batch
+        
+        Rows that fail do not abort the load; they are reported as batch errors and the
+        remaining rows are committed.
+        
+        Args:
+            row_counts: If given, extended with the number of rows each input row affected
+            input_sizes: Types of named binds, as for `execute_query`
+        
+        Returns:
+            List of batch errors, each with the row `offset` into `rows` and the Oracle `message`
+        """
+        if not rows:
+            return []
+        
+        async with self.get_connection() as conn:
+            if self.async_mode:
+                return await self._execute_many_async(conn, query, rows, batch_size, row_counts, input_sizes)
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self._execute_many, conn, query, rows, batch_size, row_counts, input_sizes
+            )
     
     async def init_database(self) -> None:
         """Initialize database tables"""
@@ -93,7 +506,7 @@ class OracleClient:
             id VARCHAR2(50) PRIMARY KEY,
             title VARCHAR2(500) NOT NULL,
             author VARCHAR2(200) NOT NULL,
-            genre CLOB,
+            genre JSON,
             status VARCHAR2(50) DEFAULT 'ongoing',
             description CLOB,
             cover_image VARCHAR2(1000),
@@ -105,10 +518,21 @@ class OracleClient:
         )
         """
         
-        create_vector_index = """
-        CREATE VECTOR INDEX IF NOT EXISTS manhwa_vector_idx ON manhwa (embedding)
-        ORGANIZATION NEIGHBOR PARTITIONS
-        WITH TARGET ACCURACY 95
+        # Lets JSON_EXISTS genre filters use an index instead of scanning every document
+        create_genre_index = """
+        CREATE MULTIVALUE INDEX IF NOT EXISTS manhwa_genre_mvi ON manhwa m (m.genre.string())
+        """
+        
+        # Rebuilt or switched between IVF and HNSW later through the admin API
+        create_vector_index = vector_index_ddl(
+            os.getenv("ORACLE_VECTOR_INDEX_TYPE", "IVF"),
+            int(os.getenv("ORACLE_VECTOR_INDEX_ACCURACY", "95")),
+            if_not_exists=True
+        )
+        
+        # Supports keyset pagination over (created_at, id) in both directions
+        create_listing_index = """
+        CREATE INDEX IF NOT EXISTS manhwa_created_id_idx ON manhwa (created_at, id)
         """
         
         create_chapters_table = """
@@ -135,6 +559,13 @@ class OracleClient:
         
         try:
             await self.execute_non_query(create_manhwa_table)
+            await self.migrate_genre_to_json()
+            await self.execute_non_query(create_listing_index)
+            
+            try:
+                await self.execute_non_query(create_genre_index)
+            except Exception as ge:
+                print(f"Genre index creation skipped: {ge}")
             await self.execute_non_query(create_chapters_table)
             await self.execute_non_query(create_reviews_table)
             
@@ -143,34 +574,143 @@ class OracleClient:
                 await self.execute_non_query(create_vector_index)
                 print("Vector index created successfully")
             except Exception as ve:
-                print(f"Vector index creation skipped: {ve}")
+                print(f"Vector index creation skipped, searches scan exactly until it is rebuilt: {ve}")
             
             print("Database tables initialized successfully")
         except Exception as e:
             print(f"Error initializing database: {e}")
     
+    async def migrate_genre_to_json(self) -> bool:
+        """Convert a legacy CLOB `genre` column into a native JSON column
+        
+        Each step checks the columns first, so a run that failed partway through
+        picks up where it stopped when run again.
+        
+        Returns:
+            True if a migration was performed, False if the column was already JSON
+        """
+        columns = {
+            row['column_name']: row['data_type']
+            for row in await self.execute_query(
+                "SELECT column_name, data_type FROM user_tab_columns "
+                "WHERE table_name = 'MANHWA' AND column_name IN ('GENRE', 'GENRE_JSON')"
+            )
+        }
+        if 'GENRE_JSON' not in columns and columns.get('GENRE') != 'CLOB':
+            return False
+        
+        print("Migrating manhwa.genre from CLOB to JSON...")
+        if 'GENRE_JSON' not in columns:
+            await self.execute_non_query("ALTER TABLE manhwa ADD (genre_json JSON)")
+        if 'GENRE' in columns:
+            await self.execute_non_query(
+                "UPDATE manhwa SET genre_json = JSON(NVL(genre, '[]')) WHERE genre_json IS NULL"
+            )
+            await self.execute_non_query("ALTER TABLE manhwa DROP COLUMN genre")
+        await self.execute_non_query("ALTER TABLE manhwa RENAME COLUMN genre_json TO genre")
+        print("Genre migration completed")
+        return True
+    
     async def get_manhwa_list(self, skip: int = 0, limit: int = 20) -> List[Dict[str, Any]]:
         query = """
-        SELECT id, title, author, genre, status, description, cover_image, rating, view_count
+        SELECT id, title, author, genre, status, description, cover_image, rating, view_count, created_at
         FROM manhwa 
-        ORDER BY created_at DESC
+        ORDER BY created_at DESC, id DESC
         OFFSET :skip ROWS FETCH NEXT :limit ROWS ONLY
         """
         
         results = await self.execute_query(query, (skip, limit))
         
-        # Parse JSON genre field
         for result in results:
-            if result.get('genre'):
-                try:
-                    result['genre'] = json.loads(result['genre'])
-                except json.JSONDecodeError:
-                    result['genre'] = []
-            else:
-                result['genre'] = []
+            result['genre'] = _parse_genre(result.get('genre'))
         
         return results
     
+    async def get_manhwa_list_after(self, after: Optional[Tuple[Optional[datetime], str]] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Keyset page of the catalog ordered by (created_at, id) descending
+        
+        Rows without a created_at sort first (NULLS FIRST, Oracle's default for DESC) and
+        are paged by id alone; a cursor from one of them continues through the rest of
+        that group and then on to the dated rows.
+        
+        Args:
+            after: (created_at, id) of the last row of the previous page, or None for the first page
+            limit: Page size
+        
+        Returns:
+            Rows including `created_at`, so the caller can build the next cursor
+        """
+        columns = "id, title, author, genre, status, description, cover_image, rating, view_count, created_at"
+        order = "ORDER BY created_at DESC NULLS FIRST, id DESC"
+        input_sizes = None
+        if after is None:
+            query = f"""
+            SELECT {columns}
+            FROM manhwa 
+            {order}
+            FETCH NEXT :limit ROWS ONLY
+            """
+            params = {"limit": limit}
+        elif after[0] is None:
+            query = f"""
+            SELECT {columns}
+            FROM manhwa 
+            WHERE (created_at IS NULL AND id < :after_id)
+               OR created_at IS NOT NULL
+            {order}
+            FETCH NEXT :limit ROWS ONLY
+            """
+            params = {"after_id": after[1], "limit": limit}
+        else:
+            query = f"""
+            SELECT {columns}
+            FROM manhwa 
+            WHERE created_at < :after_created_at
+               OR (created_at = :after_created_at AND id < :after_id)
+            {order}
+            FETCH NEXT :limit ROWS ONLY
+            """
+            params = {"after_created_at": after[0], "after_id": after[1], "limit": limit}
+            # A datetime binds as DATE by default, dropping fractional seconds, so rows
+            # created within the same second would be skipped or repeated
+            input_sizes = {"after_created_at": oracledb.DB_TYPE_TIMESTAMP}
+        
+        results = await self.execute_query(query, params, input_sizes=input_sizes)
+        
+        for result in results:
+            result['genre'] = _parse_genre(result.get('genre'))
+        
+        return results
+    
+    async def iter_all_manhwa(self, arraysize: int = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream the whole catalog, for exports and reindex jobs"""
+        query = """
+        SELECT id, title, author, genre, status, description, cover_image, rating, view_count, created_at
+        FROM manhwa 
+        ORDER BY id
+        """
+        
+        async for result in self.stream_query(query, arraysize=arraysize):
+            result['genre'] = _parse_genre(result.get('genre'))
+            yield result
+    
+    async def iter_manhwa_embeddings(self, arraysize: int = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream every embedded manhwa with its vector, for warming in-process indexes"""
+        # Older clients can't fetch VECTOR natively; have the server render it as text
+        embedding_column = "embedding" if _supports_native_vectors() else "FROM_VECTOR(embedding) AS embedding"
+        query = f"""
+        SELECT id, title, author, genre, status, description, cover_image, rating, view_count, {embedding_column}
+        FROM manhwa 
+        WHERE embedding IS NOT NULL
+        ORDER BY id
+        """
+        
+        async for result in self.stream_query(query, arraysize=arraysize):
+            result['genre'] = _parse_genre(result.get('genre'))
+            if isinstance(result['embedding'], str):
+                result['embedding'] = json.loads(result['embedding'])
+            yield result
+    
     async def get_manhwa_by_id(self, manhwa_id: str) -> Optional[Dict[str, Any]]:
         query = """
         SELECT id, title, author, genre, status, description, cover_image, rating, view_count
@@ -185,14 +725,7 @@ class OracleClient:
         
         result = results[0]
         
-        # Parse JSON genre field
-        if result.get('genre'):
-            try:
-                result['genre'] = json.loads(result['genre'])
-            except json.JSONDecodeError:
-                result['genre'] = []
-        else:
-            result['genre'] = []
+        result['genre'] = _parse_genre(result.get('genre'))
         
         return result
     
@@ -244,6 +777,139 @@ class OracleClient:
         
         return await self.get_manhwa_by_id(manhwa_id)
     
+    async def create_manhwa_with_embedding(self, manhwa_data: Dict[str, Any], embedding: List[float]) -> Dict[str, Any]:
+        """Insert a manhwa together with its embedding in a single transaction"""
+        manhwa_id = manhwa_data.get('id') or f"manhwa_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        
+        insert_query = """
+        INSERT INTO manhwa (id, title, author, genre, status, description, cover_image, embedding)
+        VALUES (:id, :title, :author, :genre, :status, :description, :cover_image, :embedding)
+        RETURNING rating, view_count INTO :out_rating, :out_view_count
+        """
+        
+        manhwa = {
+            'id': manhwa_id,
+            'title': manhwa_data['title'],
+            'author': manhwa_data['author'],
+            'genre': manhwa_data.get('genre', []),
+            'status': manhwa_data.get('status', 'ongoing'),
+            'description': manhwa_data.get('description', ''),
+            'cover_image': manhwa_data.get('cover_image', ''),
+        }
+        
+        params = {
+            **manhwa,
+            'genre': json.dumps(manhwa['genre']),
+            'embedding': to_vector(embedding),
+        }
+        
+        returned = await self.execute_returning(
+            insert_query, params, {'out_rating': float, 'out_view_count': int}
+        )
+        
+        return {
+            **manhwa,
+            'rating': returned['out_rating'],
+            'view_count': returned['out_view_count'],
+        }
+    
+    async def update_manhwa_with_embedding(self, manhwa_id: str, manhwa_data: Dict[str, Any], embedding: List[float]) -> Optional[Dict[str, Any]]:
+        """Update a manhwa and its embedding in a single transaction
+        
+        Returns:
+            The updated manhwa, or None if no row has the given id
+        """
+        update_query = """
+        UPDATE manhwa 
+        SET title = :title, author = :author, genre = :genre, status = :status, 
+            description = :description, cover_image = :cover_image, embedding = :embedding,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = :id
+        RETURNING rating, view_count INTO :out_rating, :out_view_count
+        """
+        
+        manhwa = {
+            'id': manhwa_id,
+            'title': manhwa_data.get('title'),
+            'author': manhwa_data.get('author'),
+            'genre': manhwa_data.get('genre', []),
+            'status': manhwa_data.get('status'),
+            'description': manhwa_data.get('description'),
+            'cover_image': manhwa_data.get('cover_image'),
+        }
+        
+        params = {
+            **manhwa,
+            'genre': json.dumps(manhwa['genre']),
+            'embedding': to_vector(embedding),
+        }
+        
+        returned = await self.execute_returning(
+            update_query, params, {'out_rating': float, 'out_view_count': int}
+        )
+        if returned is None:
+            return None
+        
+        return {
+            **manhwa,
+            'rating': returned['out_rating'],
+            'view_count': returned['out_view_count'],
+        }
+    
+    async def upsert_manhwa_many(self, manhwa_list: List[Dict[str, Any]], batch_size: int = 1000) -> Dict[str, Any]:
+        """Insert or update many manhwa (with optional `embedding`) using MERGE array DML
+        
+        A row without `embedding` keeps the stored vector. This writes straight to Oracle:
+        callers serving traffic must invalidate the catalog cache and update the in-process
+        vector, lexical and suggest indexes for `upserted_ids` themselves (or let the next
+        refresh pick them up).
+        
+        Returns:
+            Summary with processed/succeeded counts, the ids written and per-row errors
+        """
+        merge_query = """
+        MERGE INTO manhwa m
+        USING (
+            SELECT :id AS id, :title AS title, :author AS author, :genre AS genre, :status AS status,
+                   :description AS description, :cover_image AS cover_image, :embedding AS embedding
+            FROM dual
+        ) src
+        ON (m.id = src.id)
+        WHEN MATCHED THEN UPDATE SET
+            m.title = src.title, m.author = src.author, m.genre = src.genre, m.status = src.status,
+            m.description = src.description, m.cover_image = src.cover_image,
+            m.embedding = NVL(src.embedding, m.embedding), m.updated_at = CURRENT_TIMESTAMP
+        WHEN NOT MATCHED THEN INSERT (id, title, author, genre, status, description, cover_image, embedding)
+            VALUES (src.id, src.title, src.author, src.genre, src.status, src.description, src.cover_image, src.embedding)
+        """
+        
+        rows = []
+        for index, manhwa_data in enumerate(manhwa_list):
+            embedding = manhwa_data.get('embedding')
+            rows.append({
+                'id': manhwa_data.get('id') or f"manhwa_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{index}",
+                'title': manhwa_data['title'],
+                'author': manhwa_data['author'],
+                'genre': json.dumps(manhwa_data.get('genre', [])),
+                'status': manhwa_data.get('status', 'ongoing'),
+                'description': manhwa_data.get('description', ''),
+                'cover_image': manhwa_data.get('cover_image', ''),
+                'embedding': to_vector(embedding),
+            })
+        
+        batch_errors = await self.execute_many(merge_query, rows, batch_size=batch_size)
+        failed = {error["offset"] for error in batch_errors}
+        
+        return {
+            "processed": len(rows),
+            "succeeded": len(rows) - len(batch_errors),
+            "upserted_ids": [row["id"] for offset, row in enumerate(rows) if offset not in failed],
+            "errors": [
+                {"id": rows[error["offset"]]["id"], **error}
+                for error in batch_errors
+            ]
+        }
+    
     async def delete_manhwa(self, manhwa_id: str) -> bool:
         delete_query = "DELETE FROM manhwa WHERE id = :manhwa_id"
         
@@ -258,93 +924,327 @@ class OracleClient:
         update_query = "UPDATE manhwa SET view_count = view_count + 1 WHERE id = :manhwa_id"
         await self.execute_non_query(update_query, (manhwa_id,))
     
+    async def increment_view_counts(self, counts: Dict[str, int]) -> None:
+        """Apply coalesced view count deltas in one batched MERGE round trip"""
+        if not counts:
+            return
+        
+        merge_query = """
+        MERGE INTO manhwa m
+        USING (SELECT :id AS id, :delta AS delta FROM dual) src
+        ON (m.id = src.id)
+        WHEN MATCHED THEN UPDATE SET m.view_count = m.view_count + src.delta
+        """
+        
+        # Sorted ids give every flush the same row lock order
+        rows = [{'id': manhwa_id, 'delta': counts[manhwa_id]} for manhwa_id in sorted(counts)]
+        errors = await self.execute_many(merge_query, rows)
+        for error in errors:
+            print(f"Failed to flush view count for {rows[error['offset']]['id']}: {error['message']}")
+    
     async def update_manhwa_embedding(self, manhwa_id: str, embedding: List[float]) -> None:
         """Update the embedding vector for a manhwa"""
         update_query = "UPDATE manhwa SET embedding = :embedding WHERE id = :manhwa_id"
         
-        # Convert list to Oracle vector format
-        vector_str = f"[{','.join(map(str, embedding))}]"
-        
         try:
-            await self.execute_non_query(update_query, (vector_str, manhwa_id))
+            await self.execute_non_query(update_query, (to_vector(embedding), manhwa_id))
         except Exception as e:
             print(f"Failed to update embedding for {manhwa_id}: {e}")
     
-    async def search_similar_manhwa(self, query_embedding: List[float], limit: int = 10, exclude_id: str = None) -> List[Dict[str, Any]]:
-        """Find similar manhwa using vector similarity search"""
-        vector_str = f"[{','.join(map(str, query_embedding))}]"
+    async def get_manhwa_after_id(self, after_id: Optional[str] = None, limit: int = 256) -> List[Dict[str, Any]]:
+        """Next page of manhwa in id order with the fields they are embedded from, for re-embedding jobs"""
+        if after_id is None:
+            query = """
+            SELECT id, title, description, genre, updated_at
+            FROM manhwa
+            ORDER BY id
+            FETCH FIRST :limit ROWS ONLY
+            """
+            params = (limit,)
+        else:
+            query = """
+            SELECT id, title, description, genre, updated_at
+            FROM manhwa
+            WHERE id > :after_id
+            ORDER BY id
+            FETCH FIRST :limit ROWS ONLY
+            """
+            params = (after_id, limit)
+        
+        results = await self.execute_query(query, params)
+        for result in results:
+            result['genre'] = _parse_genre(result.get('genre'))
+        return results
+    
+    async def count_manhwa(self, after_id: Optional[str] = None) -> int:
+        """Number of manhwa, or of those after `after_id` in id order"""
+        if after_id is None:
+            rows = await self.execute_query("SELECT COUNT(*) FROM manhwa", row_format='tuple')
+        else:
+            rows = await self.execute_query("SELECT COUNT(*) FROM manhwa WHERE id > :after_id", (after_id,), row_format='tuple')
+        return int(rows[0][0])
+    
+    async def update_manhwa_embeddings(self, embeddings: List[Dict[str, Any]], batch_size: int = 1000) -> Dict[str, Any]:
+        """Write many embeddings with array DML, skipping rows edited since they were read
+        
+        Each entry has `id`, `embedding` and the `updated_at` it was read with. A row whose
+        `updated_at` has moved on was re-embedded by that edit, so it is left alone. Rows
+        that have never had an `updated_at` match on it still being NULL.
+        
+        Returns:
+            Summary with the processed count, the `updated_ids` and per-row errors
+        """
+        # DECODE treats two NULLs as equal, unlike =
+        update_query = """
+        UPDATE manhwa SET embedding = :embedding
+        WHERE id = :id AND DECODE(updated_at, :updated_at, 1) = 1
+        """
+        
+        rows = [
+            {'id': entry['id'], 'embedding': to_vector(entry['embedding']), 'updated_at': entry['updated_at']}
+            for entry in embeddings
+        ]
+        
+        row_counts: List[int] = []
+        # As a DATE bind the read timestamp would lose its fractional seconds and never match
+        batch_errors = await self.execute_many(
+            update_query, rows, batch_size=batch_size, row_counts=row_counts,
+            input_sizes={'updated_at': oracledb.DB_TYPE_TIMESTAMP}
+        )
+        
+        return {
+            "processed": len(rows),
+            "updated_ids": [row['id'] for row, count in zip(rows, row_counts) if count],
+            "errors": [
+                {"id": rows[error["offset"]]["id"], **error}
+                for error in batch_errors
+            ]
+        }
+    
+    async def get_manhwa_embedding(self, manhwa_id: str) -> Optional[List[float]]:
+        """Read a manhwa's stored embedding, or None if it has none (or doesn't exist)"""
+        if _supports_native_vectors():
+            query = "SELECT embedding FROM manhwa WHERE id = :manhwa_id"
+        else:
+            # Older clients can't fetch VECTOR natively; have the server render it as text
+            query = "SELECT FROM_VECTOR(embedding) FROM manhwa WHERE id = :manhwa_id"
+        
+        rows = await self.execute_query(query, (manhwa_id,), row_format='tuple')
+        if not rows or rows[0][0] is None:
+            return None
+        
+        embedding = rows[0][0]
+        if isinstance(embedding, str):
+            return json.loads(embedding)
+        # array('f') from the driver binds straight back into VECTOR_DISTANCE
+        return embedding
+    
+    async def get_manhwa_embeddings(self, manhwa_ids: List[str]) -> Dict[str, Any]:
+        """Read the stored embeddings of several manhwa in one query; ids without one are left out"""
+        if not manhwa_ids:
+            return {}
+        
+        binds = {f"id{i}": manhwa_id for i, manhwa_id in enumerate(manhwa_ids)}
+        column = "embedding" if _supports_native_vectors() else "FROM_VECTOR(embedding)"
+        query = f"SELECT id, {column} FROM manhwa WHERE embedding IS NOT NULL AND id IN ({', '.join(':' + name for name in binds)})"
+        
+        rows = await self.execute_query(query, binds, row_format='tuple')
+        return {
+            manhwa_id: json.loads(embedding) if isinstance(embedding, str) else embedding
+            for manhwa_id, embedding in rows
+        }
+    
+    async def search_similar_manhwa(self, query_embedding: List[float], limit: int = 10, exclude_id: str = None,
+                                    accuracy: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Find similar manhwa using vector similarity search
+        
+        `accuracy` is the target accuracy (percent) of the approximate index search, 100 for
+        an exact search; None uses the `similar` default from `set_vector_search_accuracy`.
+        """
+        query_vector = to_vector(query_embedding)
+        if accuracy is None:
+            accuracy = _search_accuracy["similar"]
         
         base_query = """
         SELECT id, title, author, genre, status, description, cover_image, rating, view_count,
-               VECTOR_DISTANCE(embedding, :query_vector) as similarity_score
+               VECTOR_DISTANCE(embedding, :query_vector, COSINE) as similarity_score
         FROM manhwa 
         WHERE embedding IS NOT NULL
         """
+        # Same metric as the index, or the optimizer can't use it
+        order_by = f" ORDER BY VECTOR_DISTANCE(embedding, :query_vector, COSINE) {_fetch_first(':limit', accuracy)}"
         
         if exclude_id:
-            query = base_query + " AND id != :exclude_id ORDER BY embedding <-> :query_vector FETCH FIRST :limit ROWS ONLY"
-            params = (vector_str, exclude_id, vector_str, limit)
+            query = base_query + " AND id != :exclude_id" + order_by
+            params = (query_vector, exclude_id, query_vector, limit)
         else:
-            query = base_query + " ORDER BY embedding <-> :query_vector FETCH FIRST :limit ROWS ONLY"
-            params = (vector_str, vector_str, limit)
+            query = base_query + order_by
+            params = (query_vector, query_vector, limit)
         
         try:
             results = await self.execute_query(query, params)
             
-            # Parse JSON genre field
             for result in results:
-                if result.get('genre'):
-                    try:
-                        result['genre'] = json.loads(result['genre'])
-                    except json.JSONDecodeError:
-                        result['genre'] = []
-                else:
-                    result['genre'] = []
+                result['genre'] = _parse_genre(result.get('genre'))
             
             return results
         except Exception as e:
             print(f"Vector search failed: {e}")
             return []
     
-    async def search_manhwa_hybrid(self, query_embedding: List[float], genre_filter: str = None, status_filter: str = None, limit: int = 10) -> List[Dict[str, Any]]:
-        """Hybrid search combining vector similarity with SQL filters"""
-        vector_str = f"[{','.join(map(str, query_embedding))}]"
+    async def search_similar_manhwa_many(self, searches: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Run several vector searches in one round trip, results in the same order as `searches`
+        
+        Each search is a dict with `embedding` and optional `limit`, `exclude_id`, `genre`,
+        `status` and `accuracy`, filtered as in `search_manhwa_hybrid`. The per-search
+        queries are joined with UNION ALL, each tagged with its position.
+        """
+        if not searches:
+            return []
+        
+        branches = []
+        params: Dict[str, Any] = {}
+        for i, search in enumerate(searches):
+            params[f"vec{i}"] = to_vector(search["embedding"])
+            params[f"lim{i}"] = search.get("limit", 10)
+            
+            where = "embedding IS NOT NULL"
+            if search.get("exclude_id"):
+                where += f" AND id != :excl{i}"
+                params[f"excl{i}"] = search["exclude_id"]
+            if search.get("genre"):
+                where += f" AND JSON_EXISTS(genre, '$[*]?(@.string() == $g)' PASSING :genre{i} AS \"g\")"
+                params[f"genre{i}"] = search["genre"]
+            if search.get("status"):
+                where += f" AND status = :status{i}"
+                params[f"status{i}"] = search["status"]
+            accuracy = search.get("accuracy") or _search_accuracy["hybrid" if search.get("genre") or search.get("status") else "similar"]
+            
+            branches.append(f"""
+            SELECT * FROM (
+                SELECT {i} AS query_index, id, title, author, genre, status, description, cover_image, rating, view_count,
+                       VECTOR_DISTANCE(embedding, :vec{i}, COSINE) as similarity_score
+                FROM manhwa
+                WHERE {where}
+                ORDER BY VECTOR_DISTANCE(embedding, :vec{i}, COSINE) {_fetch_first(f":lim{i}", accuracy)}
+            )""")
+        
+        query = f"SELECT * FROM ({' UNION ALL '.join(branches)}) ORDER BY query_index, similarity_score"
+        
+        results: List[List[Dict[str, Any]]] = [[] for _ in searches]
+        try:
+            rows = await self.execute_query(query, params)
+        except Exception as e:
+            print(f"Batched vector search failed: {e}")
+            return results
+        
+        for row in rows:
+            row['genre'] = _parse_genre(row.get('genre'))
+            results[int(row.pop('query_index'))].append(row)
+        return results
+    
+    async def search_manhwa_hybrid(self, query_embedding: List[float], genre_filter: str = None, status_filter: str = None,
+                                   limit: int = 10, accuracy: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Hybrid search combining vector similarity with SQL filters
+        
+        `accuracy` works as in `search_similar_manhwa`, defaulting to the `hybrid` setting;
+        filtered searches often need a higher target to fill the page from the index.
+        """
+        query_vector = to_vector(query_embedding)
+        if accuracy is None:
+            accuracy = _search_accuracy["hybrid"]
         
         query = """
         SELECT id, title, author, genre, status, description, cover_image, rating, view_count,
-               VECTOR_DISTANCE(embedding, :query_vector) as similarity_score
+               VECTOR_DISTANCE(embedding, :query_vector, COSINE) as similarity_score
         FROM manhwa 
         WHERE embedding IS NOT NULL
         """
         
-        params = [vector_str]
+        params = [query_vector]
         
         if genre_filter:
-            query += " AND JSON_EXISTS(genre, '$[*]?(@ == $genre)')"
+            query += " AND JSON_EXISTS(genre, '$[*]?(@.string() == $g)' PASSING :genre AS \"g\")"
             params.append(genre_filter)
         
         if status_filter:
             query += " AND status = :status"
             params.append(status_filter)
         
-        query += " ORDER BY embedding <-> :query_vector FETCH FIRST :limit ROWS ONLY"
-        params.append(vector_str)
+        query += f" ORDER BY VECTOR_DISTANCE(embedding, :query_vector, COSINE) {_fetch_first(':limit', accuracy)}"
+        params.append(query_vector)
         params.append(limit)
         
         try:
             results = await self.execute_query(query, tuple(params))
             
-            # Parse JSON genre field
             for result in results:
-                if result.get('genre'):
-                    try:
-                        result['genre'] = json.loads(result['genre'])
-                    except json.JSONDecodeError:
-                        result['genre'] = []
-                else:
-                    result['genre'] = []
+                result['genre'] = _parse_genre(result.get('genre'))
             
             return results
         except Exception as e:
             print(f"Hybrid search failed: {e}")
-            return []
\ No newline at end of file
+            return []
+    
+    async def rebuild_vector_index(self, index_type: str = "IVF", accuracy: int = 95, parameters: Optional[Dict[str, int]] = None,
+                                   parallel: Optional[int] = None) -> None:
+        """Replace manhwa_vector_idx with a freshly built one, e.g. to switch between IVF and HNSW
+        
+        The new index is built alongside the old one under a shadow name, then the old one is
+        dropped and the shadow renamed into place, so approximate searches always have an
+        index to use. If the build fails, the old index is left untouched. While it runs, the
+        table carries both indexes: twice the disk for IVF, twice the vector pool for HNSW.
+        """
+        shadow_name = f"{VECTOR_INDEX_NAME}_new"
+        create_shadow_index = vector_index_ddl(index_type, accuracy, parameters, index_name=shadow_name, parallel=parallel)
+        # Left over from a rebuild that was interrupted before the swap
+        await self.execute_non_query(f"DROP INDEX IF EXISTS {shadow_name}")
+        await self.execute_non_query(create_shadow_index)
+        
+        await self.execute_non_query(f"DROP INDEX IF EXISTS {VECTOR_INDEX_NAME}")
+        await self.execute_non_query(f"ALTER INDEX {shadow_name} RENAME TO {VECTOR_INDEX_NAME}")
+    
+    async def get_vector_index_info(self) -> Dict[str, Any]:
+        """Type, status and size of manhwa_vector_idx from the data dictionary"""
+        index_name = VECTOR_INDEX_NAME.upper()
+        rows = await self.execute_query("SELECT * FROM user_indexes WHERE index_name = :index_name", (index_name,))
+        embedded = await self.execute_query("SELECT COUNT(*) FROM manhwa WHERE embedding IS NOT NULL", row_format='tuple')
+        if not rows:
+            return {"exists": False, "embedded_rows": int(embedded[0][0])}
+        
+        index = rows[0]
+        subtype = index.get('index_subtype') or ''
+        info = {
+            "exists": True,
+            "type": "HNSW" if "GRAPH" in subtype or "HNSW" in subtype else "IVF",
+            "subtype": subtype or None,
+            "status": index.get('status'),
+            "embedded_rows": int(embedded[0][0]),
+        }
+        
+        # IVF keeps its centroids and partitions in internal tables named after the index
+        segments = await self.execute_query(
+            "SELECT NVL(SUM(bytes), 0) FROM user_segments WHERE segment_name = :index_name OR segment_name LIKE 'VECTOR$' || :index_name || '$%'",
+            {"index_name": index_name}, row_format='tuple'
+        )
+        info["disk_bytes"] = int(segments[0][0])
+        
+        # HNSW graphs live in the vector memory pool; the view needs SELECT on V$ views
+        try:
+            graph = await self.execute_query("SELECT * FROM v$vector_graph_index WHERE index_name = :index_name", (index_name,))
+            if graph:
+                info["memory"] = {key: value for key, value in graph[0].items() if key.endswith('bytes') or key.startswith('num_')}
+        except Exception as e:
+            info["memory"] = f"unavailable: {e}"
+        
+        return info
+    
+    async def sample_manhwa_ids(self, count: int) -> List[str]:
+        """Random ids of embedded manhwa, for accuracy checks"""
+        query = """
+        SELECT id FROM manhwa
+        WHERE embedding IS NOT NULL
+        ORDER BY DBMS_RANDOM.VALUE
+        FETCH FIRST :count ROWS ONLY
+        """
+        return [row[0] for row in await self.execute_query(query, (count,), row_format='tuple')]
@@ -0,0 +1,124 @@
+import keyword
+import re
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+from functools import lru_cache
+from itertools import repeat
+
+# Oracle LOB types, matched by DbType name so this module does not need the driver loaded
+_LOB_TYPE_NAMES = {'DB_TYPE_CLOB', 'DB_TYPE_NCLOB', 'DB_TYPE_BLOB', 'DB_TYPE_BFILE'}
+
+ROW_FORMATS = ('dict', 'tuple', 'record')
+
+def _attribute_name(column: str) -> str:
+    """Map an Oracle column name (which may contain $ or #) to a valid attribute name"""
+    name = re.sub(r'\W', '_', column)
+    if not name or name[0].isdigit() or keyword.iskeyword(name):
+        name = f"_{name}" if not keyword.iskeyword(name) else f"{name}_"
+    return name
+
+# Record class members a column attribute must not shadow
+_RESERVED_NAMES = {'__init__', '__repr__', '__slots__', '_asdict', 'self'}
+
+def _field_names(columns: Sequence[str]) -> Tuple[str, ...]:
+    """Attribute names for a column list, suffixed with _2, _3... where they would clash
+    
+    Expressions like COUNT(*) and joins can give several columns the same name, which
+    would otherwise generate an __init__ with duplicate arguments.
+    """
+    fields: List[str] = []
+    taken = set(_RESERVED_NAMES)
+    for column in columns:
+        base = _attribute_name(column)
+        name, suffix = base, 2
+        while name in taken:
+            name = f"{base}_{suffix}"
+            suffix += 1
+        taken.add(name)
+        fields.append(name)
+    return tuple(fields)
+
+@lru_cache(maxsize=256)
+def make_record_type(columns: Tuple[str, ...]) -> type:
+    """Build (and cache) a lightweight __slots__ record class for a column list"""
+    fields = _field_names(columns)
+    
+    # Generate a straight-line __init__ rather than looping over setattr per row
+    args = ', '.join(fields)
+    body = '; '.join(f"self.{name} = {name}" for name in fields) or 'pass'
+    namespace: Dict[str, Any] = {}
+    exec(f"def __init__(self, {args}):\n    {body}", namespace)
+    
+    def __repr__(self):
+        values = ', '.join(f"{name}={getattr(self, name)!r}" for name in fields)
+        return f"Row({values})"
+    
+    def _asdict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in fields}
+    
+    return type('Row', (), {
+        '__slots__': fields,
+        '__init__': namespace['__init__'],
+        '__repr__': __repr__,
+        '_asdict': _asdict,
+    })
+
+class RowDecoder:
+    """Row conversion compiled once per cursor description
+    
+    Column names, the output shape and which columns hold LOB locators are all worked
+    out up front, so decoding a row is a single call with no per-cell type checks.
+    """
+    
+    def __init__(self, description: Sequence[Sequence[Any]], row_format: str = 'dict', lobs_inline: bool = True):
+        """
+        Args:
+            description: cursor.description of the executed statement
+            row_format: 'dict', 'tuple' or 'record' (a __slots__ object with attribute access)
+            lobs_inline: True when an output type handler already fetches LOBs as str/bytes;
+                otherwise LOB columns are read from their locators
+        """
+        if row_format not in ROW_FORMATS:
+            raise ValueError(f"Unknown row format: {row_format}")
+        
+        self.columns = tuple(desc[0].lower() for desc in description) if description else ()
+        self.row_format = row_format
+        self.lob_indexes = () if lobs_inline else tuple(
+            i for i, desc in enumerate(description or ())
+            if getattr(desc[1], 'name', None) in _LOB_TYPE_NAMES
+        )
+        self.decode = self._compile()
+    
+    def _compile(self) -> Callable[[Sequence[Any]], Any]:
+        columns = self.columns
+        
+        if self.row_format == 'dict':
+            build = lambda values: dict(zip(columns, values))
+        elif self.row_format == 'record':
+            record_type = make_record_type(columns)
+            build = lambda values: record_type(*values)
+        elif self.lob_indexes:
+            build = tuple
+        else:
+            # Driver rows are already tuples
+            return lambda row: row
+        
+        if not self.lob_indexes:
+            return build
+        
+        lob_indexes = self.lob_indexes
+        
+        def decode_with_lobs(row):
+            values = list(row)
+            for i in lob_indexes:
+                if values[i] is not None:
+                    values[i] = values[i].read()
+            return build(values)
+        
+        return decode_with_lobs
+    
+    def decode_many(self, rows: Sequence[Sequence[Any]]) -> List[Any]:
+        if self.row_format == 'dict' and not self.lob_indexes:
+            # Keep the whole batch in C-level map/zip/dict calls
+            return list(map(dict, map(zip, repeat(self.columns), rows)))
+        decode = self.decode
+        return [decode(row) for row in rows]
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the embedding provider: encoding throughput and a retrieval sanity check
+
+Times the configured provider (EMBEDDING_PROVIDER, hashing by default) one document at a
+time and in batches, in docs/sec, and checks its dimension against VECTOR(384). Then
+compares it with the legacy md5 embedding on a small retrieval task: a query made of a
+few words from one synthetic manhwa should rank that manhwa first.
+
+Usage:
+    python benchmark_embeddings.py --docs 5000
+    EMBEDDING_PROVIDER=onnx EMBEDDING_MODEL_PATH=/models/all-MiniLM-L6-v2 python benchmark_embeddings.py
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+from services.embedding_provider import VECTOR_DIMENSION, create_embedding_provider, manhwa_text
+
+SYLLABLES = ["ka", "ren", "shi", "mo", "dan", "yu", "ji", "hwa", "seo", "rin", "tae", "gon",
+             "mi", "ra", "sol", "beom", "chu", "hyeon", "no", "pa", "lee", "won", "ga", "eun"]
+
+def _vocabulary(size: int, rng: random.Random) -> list:
+    # Pseudo-words, so documents have a realistic spread of distinctive terms
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+GENRES = ["Action", "Fantasy", "Adventure", "Drama", "Comedy", "Romance", "Mystery",
+          "Supernatural", "Martial Arts", "School", "Game", "Horror", "Slice of Life"]
+
+def _synthetic_manhwa(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    vocabulary = _vocabulary(8000, rng)
+    return [
+        {
+            "title": " ".join(rng.sample(vocabulary, 3)).title(),
+            "description": " ".join(rng.choice(vocabulary) for _ in range(rng.randint(25, 60))),
+            "genre": rng.sample(GENRES, rng.randint(1, 4))
+        }
+        for _ in range(count)
+    ]
+
+def legacy_embedding(text: str) -> list:
+    """The md5-based embedding the services used before the provider interface"""
+    hash_hex = hashlib.md5(text.lower().encode()).hexdigest()
+    embedding = []
+    for i in range(0, min(len(hash_hex), 96), 2):
+        embedding.extend([(int(hash_hex[i:i+2], 16) - 127.5) / 127.5] * 8)
+    return (embedding + [0.0] * 384)[:384]
+
+def _recall_at_1(encode, manhwa, rng) -> float:
+    corpus = np.asarray(encode([manhwa_text(m["title"], m["description"], m["genre"]) for m in manhwa]), dtype=np.float32)
+    corpus /= np.clip(np.linalg.norm(corpus, axis=1, keepdims=True), 1e-12, None)
+    
+    targets = rng.sample(range(len(manhwa)), min(200, len(manhwa)))
+    queries = []
+    for index in targets:
+        words = manhwa[index]["description"].split()
+        queries.append(" ".join(rng.sample(words, min(4, len(words)))))
+    
+    query_vectors = np.asarray(encode(queries), dtype=np.float32)
+    query_vectors /= np.clip(np.linalg.norm(query_vectors, axis=1, keepdims=True), 1e-12, None)
+    best = np.argmax(query_vectors @ corpus.T, axis=1)
+    return float(np.mean(best == np.asarray(targets)))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark embedding throughput and retrieval quality")
+    parser.add_argument("--docs", type=int, default=5000, help="Number of synthetic manhwa")
+    parser.add_argument("--batch-sizes", default="1,32,256", help="Comma-separated batch sizes to time")
+    args = parser.parse_args()
+    
+    provider = create_embedding_provider()
+    print(f"Provider: {provider.model_id} ({provider.dimension} dims, column is VECTOR({VECTOR_DIMENSION}))")
+    
+    manhwa = _synthetic_manhwa(args.docs)
+    texts = [manhwa_text(m["title"], m["description"], m["genre"]) for m in manhwa]
+    
+    print(f"\nThroughput on {len(texts)} documents")
+    start = time.perf_counter()
+    [legacy_embedding(text) for text in texts]
+    legacy_elapsed = time.perf_counter() - start
+    print(f"  {'legacy md5':22}{len(texts) / legacy_elapsed:>12.0f} docs/sec")
+    
+    for batch_size in (int(size) for size in args.batch_sizes.split(",")):
+        start = time.perf_counter()
+        for offset in range(0, len(texts), batch_size):
+            provider.encode(texts[offset:offset + batch_size])
+        elapsed = time.perf_counter() - start
+        print(f"  {f'provider batch={batch_size}':22}{len(texts) / elapsed:>12.0f} docs/sec")
+    
+    print("\nRetrieval sanity check (4 description words -> source manhwa at rank 1)")
+    subset = manhwa[:min(len(manhwa), 2000)]
+    print(f"  {'legacy md5':22}{_recall_at_1(lambda batch: [legacy_embedding(t) for t in batch], subset, random.Random(1)):>12.1%}")
+    print(f"  {provider.model_id:22}{_recall_at_1(provider.encode, subset, random.Random(1)):>12.1%}")
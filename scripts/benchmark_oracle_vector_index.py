@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark for Oracle's vector index: recall@k against latency, per index type and target accuracy
+
+Loads synthetic clustered 384-dim embeddings into a scratch table (manhwa_vector_bench,
+never the real catalog) at each catalog size, then for each index type builds the index
+the same way the admin rebuild does and runs the queries at each target accuracy. Exact
+top-k is computed client-side in float64 while loading, in chunks, so 1M rows don't need
+to fit in memory. The in-process index has its own benchmark (benchmark_vector_index.py).
+
+HNSW needs the database's vector memory pool (VECTOR_MEMORY_SIZE) sized for the graph;
+if the build fails, that type is reported and skipped.
+
+Usage (uses ORACLE_* env vars):
+    python benchmark_oracle_vector_index.py --sizes 10000,100000,1000000 --types IVF,HNSW --accuracies 80,90,95,99
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+from dal.oracle_client import OracleClient, close_pool, to_vector, vector_index_ddl, _fetch_first
+from services.embedding_provider import VECTOR_DIMENSION
+
+TABLE = "manhwa_vector_bench"
+INDEX = "manhwa_vector_bench_idx"
+CHUNK_ROWS = 10000
+
+def _centers(size: int, rng: np.random.Generator) -> np.ndarray:
+    # Clustered like real embeddings, so nearest neighbours aren't all equidistant
+    return rng.standard_normal((max(8, size // 200), VECTOR_DIMENSION))
+
+def _chunk(centers: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    vectors = centers[rng.integers(0, len(centers), count)] + 0.6 * rng.standard_normal((count, VECTOR_DIMENSION))
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def _merge_top_k(best_ids, best_scores, chunk_scores, offset: int, k: int):
+    """Fold one chunk's scores into the running exact top-k per query"""
+    ids = np.concatenate([best_ids, offset + np.broadcast_to(np.arange(chunk_scores.shape[1]), chunk_scores.shape)], axis=1)
+    scores = np.concatenate([best_scores, chunk_scores], axis=1)
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return np.take_along_axis(ids, top, axis=1), np.take_along_axis(scores, top, axis=1)
+
+async def _load(client: OracleClient, size: int, queries: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    """Create and fill the scratch table; returns exact top-k ids per query"""
+    await client.execute_non_query(f"DROP TABLE IF EXISTS {TABLE} PURGE")
+    await client.execute_non_query(f"CREATE TABLE {TABLE} (id NUMBER PRIMARY KEY, embedding VECTOR({VECTOR_DIMENSION}, FLOAT32))")
+    
+    centers = _centers(size, rng)
+    best_ids = np.zeros((len(queries), 0), dtype=np.int64)
+    best_scores = np.zeros((len(queries), 0))
+    start = time.perf_counter()
+    for offset in range(0, size, CHUNK_ROWS):
+        vectors = _chunk(centers, min(CHUNK_ROWS, size - offset), rng)
+        rows = [{"id": offset + i, "embedding": to_vector(vector.astype(np.float32).tolist())} for i, vector in enumerate(vectors)]
+        errors = await client.execute_many(f"INSERT INTO {TABLE} (id, embedding) VALUES (:id, :embedding)", rows)
+        if errors:
+            raise RuntimeError(f"Load failed: {errors[0]['message']}")
+        best_ids, best_scores = _merge_top_k(best_ids, best_scores, queries @ vectors.T, offset, k)
+    print(f"  load: {size} rows in {time.perf_counter() - start:.1f}s")
+    
+    order = np.argsort(-best_scores, axis=1)
+    return np.take_along_axis(best_ids, order, axis=1)
+
+async def _run_queries(client: OracleClient, queries: np.ndarray, truth: np.ndarray, k: int, accuracy):
+    query = f"SELECT id FROM {TABLE} ORDER BY VECTOR_DISTANCE(embedding, :q, COSINE) {_fetch_first(':k', accuracy)}"
+    latencies, hits = [], 0
+    for vector, expected in zip(queries, truth):
+        bind = to_vector(vector.astype(np.float32).tolist())
+        start = time.perf_counter()
+        rows = await client.execute_query(query, (bind, k), row_format='tuple')
+        latencies.append(time.perf_counter() - start)
+        hits += len({int(row[0]) for row in rows} & set(expected.tolist()))
+    return latencies, hits / truth.size
+
+def _report(label: str, latencies, recall: float):
+    p50, p99 = np.percentile(np.asarray(latencies) * 1e3, [50, 99])
+    print(f"  {label:34}{p50:>10.2f} ms{p99:>10.2f} ms{recall:>10.1%}")
+
+async def _bench_size(client: OracleClient, size: int, args, rng: np.random.Generator):
+    # Queries near catalog items, like "more like this" and short text queries
+    centers = _centers(size, np.random.default_rng(size))
+    queries = _chunk(centers, args.queries, rng)
+    truth = await _load(client, size, queries, args.k, np.random.default_rng(size))
+    
+    print(f"  {'':34}{'p50':>13}{'p99':>13}{'recall':>10}")
+    exact = min(args.exact_queries, args.queries)
+    latencies, recall = await _run_queries(client, queries[:exact], truth[:exact], args.k, None)
+    _report(f"exact scan ({exact} queries)", latencies, recall)
+    
+    for index_type in args.types.split(","):
+        parameters = {"partitions": args.partitions} if index_type.upper() == "IVF" else {"neighbors": args.neighbors, "efconstruction": args.efconstruction}
+        ddl = vector_index_ddl(index_type, max(args.accuracies), parameters, table=TABLE, index_name=INDEX, parallel=args.parallel)
+        await client.execute_non_query(f"DROP INDEX IF EXISTS {INDEX}")
+        start = time.perf_counter()
+        try:
+            await client.execute_non_query(ddl)
+        except Exception as e:
+            print(f"  {index_type.upper()} build failed, skipping: {e}")
+            continue
+        print(f"  {index_type.upper()} build: {time.perf_counter() - start:.1f}s")
+        
+        for accuracy in args.accuracies:
+            latencies, recall = await _run_queries(client, queries, truth, args.k, accuracy)
+            _report(f"{index_type.upper()} target accuracy {accuracy}", latencies, recall)
+        await client.execute_non_query(f"DROP INDEX IF EXISTS {INDEX}")
+
+async def main(args):
+    client = OracleClient()
+    rng = np.random.default_rng(7)
+    try:
+        for size in (int(s) for s in args.sizes.split(",")):
+            print(f"\n{size} rows, {args.queries} queries, recall@{args.k}")
+            await _bench_size(client, size, args, rng)
+    finally:
+        if not args.keep:
+            await client.execute_non_query(f"DROP TABLE IF EXISTS {TABLE} PURGE")
+        await close_pool()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Oracle vector index recall and latency")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated catalog sizes")
+    parser.add_argument("--types", default="IVF,HNSW", help="Comma-separated index types")
+    parser.add_argument("--accuracies", default="80,90,95,99", help="Comma-separated target accuracies")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per configuration")
+    parser.add_argument("--exact-queries", type=int, default=20, help="Queries for the exact-scan baseline (slow at 1M rows)")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per query")
+    parser.add_argument("--partitions", type=int, default=None, help="IVF neighbor partitions (Oracle default if unset)")
+    parser.add_argument("--neighbors", type=int, default=32, help="HNSW neighbors per vector")
+    parser.add_argument("--efconstruction", type=int, default=200, help="HNSW build candidate list size")
+    parser.add_argument("--parallel", type=int, default=None, help="Index build degree of parallelism")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch table afterwards")
+    args = parser.parse_args()
+    args.accuracies = [int(a) for a in args.accuracies.split(",")]
+    
+    asyncio.run(main(args))
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark for API response encoding: stdlib json vs orjson, and bytes on the wire with gzip/brotli
+
+Builds payloads shaped like the heaviest LLM responses (an ImageResponse and the
+generate-full-manhwa result with two base64 images) plus a catalog page, then times
+serialization and reports the compressed sizes CompressionMiddleware would send.
+
+Usage:
+    python benchmark_serialization.py --width 832 --height 1216
+"""
+
+import argparse
+import base64
+import json
+import os
+import time
+import zlib
+from datetime import datetime
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+def _fake_png_base64(width: int, height: int) -> str:
+    # Generated PNGs are already deflate-compressed, so random bytes are a fair stand-in;
+    # roughly 1.5 bytes per pixel matches what Stable Diffusion output compresses to
+    return base64.b64encode(os.urandom(int(width * height * 1.5))).decode("ascii")
+
+def _image_response(width: int, height: int) -> dict:
+    return {
+        "image_base64": _fake_png_base64(width, height),
+        "prompt": "masterpiece, best quality, manhwa cover, dramatic lighting, " * 4,
+        "style": "anime",
+        "width": width,
+        "height": height,
+        "type": "cover_art"
+    }
+
+def _full_manhwa_response(width: int, height: int) -> dict:
+    chapters = [
+        {
+            "chapter_number": i + 1,
+            "title": f"Chapter {i + 1}: The Awakening",
+            "summary": "The hunter faces a gate that should not exist. " * 20,
+            "content": "Rain fell over the silent city as the gate pulsed with light. " * 120
+        }
+        for i in range(5)
+    ]
+    return {
+        "story": {"title": "Shadow Gate", "genre": "Action, Fantasy", "chapters": chapters},
+        "cover_art": _image_response(width, height),
+        "character_sheet": {"name": "Jin", "art_prompt": "young hunter, black coat, " * 5, "traits": ["calm", "driven"]},
+        "character_art": _image_response(512, 768),
+        "storage_info": None,
+        "created": True,
+        "stored": False,
+        "storage_error": "MinIO storage unavailable"
+    }
+
+def _catalog_page(limit: int = 100) -> list:
+    now = datetime.now().isoformat()
+    return [
+        {
+            "id": f"manhwa_{i}", "title": f"Title {i}", "author": f"Author {i % 97}",
+            "genre": ["Action", "Fantasy"], "status": "ongoing",
+            "description": f"Description for manhwa {i} " * 8, "cover_image": f"/assets/covers/{i}.jpg",
+            "rating": 4.5, "view_count": i * 3, "created_at": now, "updated_at": now
+        }
+        for i in range(limit)
+    ]
+
+def _stdlib_dumps(payload) -> bytes:
+    # Same settings as Starlette's JSONResponse.render
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def _time(fn, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _gzip(body: bytes, level: int) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(body) + compressor.flush()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization and response compression")
+    parser.add_argument("--width", type=int, default=832, help="Cover image width")
+    parser.add_argument("--height", type=int, default=1216, help="Cover image height")
+    parser.add_argument("--gzip-level", type=int, default=6, help="gzip level (COMPRESSION_GZIP_LEVEL)")
+    parser.add_argument("--brotli-quality", type=int, default=4, help="brotli quality (COMPRESSION_BROTLI_QUALITY)")
+    args = parser.parse_args()
+    
+    if orjson is None:
+        print("orjson is not installed; only stdlib json timings will be shown")
+    if brotli is None:
+        print("brotli is not installed; brotli sizes will be skipped")
+    
+    payloads = {
+        "ImageResponse": _image_response(args.width, args.height),
+        "generate-full-manhwa": _full_manhwa_response(args.width, args.height),
+        "catalog page (100)": _catalog_page(100),
+    }
+    
+    for name, payload in payloads.items():
+        body = _stdlib_dumps(payload)
+        print(f"\n{name}: {len(body) / 1024:.1f} KiB of JSON (best of 5)")
+        
+        json_time = _time(lambda: _stdlib_dumps(payload))
+        print(f"  {'json.dumps':22}{json_time * 1e3:>10.2f} ms")
+        if orjson is not None:
+            orjson_time = _time(lambda: orjson.dumps(payload))
+            print(f"  {'orjson.dumps':22}{orjson_time * 1e3:>10.2f} ms{json_time / orjson_time:>8.1f}x")
+        
+        gzip_time = _time(lambda: _gzip(body, args.gzip_level))
+        gzip_size = len(_gzip(body, args.gzip_level))
+        print(f"  {f'gzip -{args.gzip_level}':22}{gzip_time * 1e3:>10.2f} ms{gzip_size / 1024:>10.1f} KiB ({gzip_size / len(body):.0%})")
+        if brotli is not None:
+            brotli_time = _time(lambda: brotli.compress(body, quality=args.brotli_quality))
+            brotli_size = len(brotli.compress(body, quality=args.brotli_quality))
+            print(f"  {f'brotli q{args.brotli_quality}':22}{brotli_time * 1e3:>10.2f} ms{brotli_size / 1024:>10.1f} KiB ({brotli_size / len(body):.0%})")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark for /search/suggest: per-keystroke latency of the prefix index
+
+Builds SuggestIndex over a synthetic catalog and replays typing sessions, one prefix
+per keystroke of a title or author, reporting p50/p99 for the first time each prefix
+is seen (nothing memoized) and for repeats. Also times incremental writes, since the
+index is patched on every create/update/delete.
+
+Usage:
+    python benchmark_suggest.py --docs 20000 --sessions 2000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+from services.suggest_index import SuggestIndex
+
+SYLLABLES = ["ka", "ren", "shi", "mo", "dan", "yu", "ji", "hwa", "seo", "rin", "tae", "gon",
+             "mi", "ra", "sol", "beom", "chu", "hyeon", "no", "pa", "lee", "won", "ga", "eun"]
+GENRES = ["Action", "Fantasy", "Adventure", "Drama", "Comedy", "Romance", "Mystery",
+          "Supernatural", "Martial Arts", "School", "Game", "Horror", "Slice of Life"]
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+def _synthetic_catalog(count: int, rng: random.Random):
+    authors = [f"{_word(rng)} {_word(rng)}".title() for _ in range(max(1, count // 5))]
+    return [
+        {
+            "id": f"m{i}",
+            "title": " ".join(_word(rng) for _ in range(rng.randint(1, 4))).title(),
+            "author": rng.choice(authors),
+            "genre": rng.sample(GENRES, rng.randint(1, 3)),
+            # Long-tailed, like real view counts
+            "view_count": int(rng.paretovariate(1.2) * 100)
+        }
+        for i in range(count)
+    ]
+
+class _SyntheticSource:
+    """Stands in for OracleClient.iter_all_manhwa"""
+    
+    def __init__(self, rows):
+        self.rows = rows
+    
+    async def iter_all_manhwa(self):
+        for row in self.rows:
+            yield row
+
+def _report(label: str, samples):
+    samples = sorted(samples)
+    p50 = samples[len(samples) // 2] * 1e6
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6
+    print(f"  {label:28}{p50:>10.1f} us{p99:>10.1f} us{samples[-1] * 1e6:>10.1f} us   ({len(samples)} samples)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark typeahead suggestion latency")
+    parser.add_argument("--docs", type=int, default=20000, help="Number of synthetic manhwa")
+    parser.add_argument("--sessions", type=int, default=2000, help="Typing sessions to replay")
+    parser.add_argument("--writes", type=int, default=500, help="Incremental writes to time")
+    args = parser.parse_args()
+    
+    rng = random.Random(7)
+    catalog = _synthetic_catalog(args.docs, rng)
+    
+    index = SuggestIndex()
+    start = time.perf_counter()
+    asyncio.run(index.warm(_SyntheticSource(catalog)))
+    stats = index.get_stats()
+    print(f"Warmed {stats['entries']} manhwa, {stats['keys']} keys, {stats['heavy_prefixes']} heavy prefixes "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+    
+    # Each session types the start of a title or author, one character at a time
+    keystrokes = []
+    for _ in range(args.sessions):
+        manhwa = rng.choice(catalog)
+        target = manhwa["title"] if rng.random() < 0.7 else manhwa["author"]
+        keystrokes.extend(target[:length] for length in range(1, min(len(target), 12) + 1))
+    
+    first, repeat, seen = [], [], set()
+    for prefix in keystrokes:
+        start = time.perf_counter()
+        index.suggest(prefix, 8)
+        elapsed = time.perf_counter() - start
+        (repeat if prefix in seen else first).append(elapsed)
+        seen.add(prefix)
+    
+    print(f"\n  {'':28}{'p50':>13}{'p99':>13}{'max':>13}")
+    _report("first time prefix", first)
+    _report("repeated prefix", repeat)
+    
+    writes = []
+    for i in range(args.writes):
+        manhwa = dict(rng.choice(catalog))
+        if rng.random() < 0.5:
+            manhwa = {**manhwa, "id": f"new{i}", "title": f"{_word(rng)} {_word(rng)}".title()}
+        manhwa["view_count"] += rng.randint(0, 1000)
+        start = time.perf_counter()
+        index.upsert(manhwa)
+        writes.append(time.perf_counter() - start)
+    _report("incremental upsert", writes)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for embedding encode/bind cost: text literal vs native float32 VECTOR binds
+
+Usage:
+    python benchmark_vector_binding.py            # client-side encode cost only
+    python benchmark_vector_binding.py --oracle   # also time binds against Oracle (uses ORACLE_* env vars)
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import os
+import time
+from array import array
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+DIMENSIONS = 384
+
+def encode_text(embedding):
+    return f"[{','.join(map(str, embedding))}]"
+
+def encode_native(embedding):
+    return array('f', embedding)
+
+def _random_embeddings(count: int):
+    rng = random.Random(7)
+    return [[rng.uniform(-1.0, 1.0) for _ in range(DIMENSIONS)] for _ in range(count)]
+
+def _time(fn, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+def bench_encode(reindex_rows: int):
+    single = _random_embeddings(1)[0]
+    batch = _random_embeddings(reindex_rows)
+    
+    print(f"Encode cost ({DIMENSIONS} dims)")
+    print(f"{'':24}{'text literal':>16}{'array(f)':>16}")
+    
+    text_single = _time(lambda: encode_text(single), repeat=2000)
+    native_single = _time(lambda: encode_native(single), repeat=2000)
+    print(f"{'single query (us)':24}{text_single * 1e6:>16.1f}{native_single * 1e6:>16.1f}")
+    
+    text_batch = _time(lambda: [encode_text(e) for e in batch])
+    native_batch = _time(lambda: [encode_native(e) for e in batch])
+    print(f"{f'{reindex_rows} row reindex (ms)':24}{text_batch * 1e3:>16.1f}{native_batch * 1e3:>16.1f}")
+    
+    text_bytes = len(encode_text(single).encode())
+    native_bytes = len(encode_native(single).tobytes())
+    print(f"{'payload bytes/vector':24}{text_bytes:>16}{native_bytes:>16}")
+
+async def bench_bind(reindex_rows: int):
+    from dal.oracle_client import OracleClient, close_pool
+    
+    client = OracleClient()
+    single = _random_embeddings(1)[0]
+    batch = _random_embeddings(reindex_rows)
+    
+    await client.execute_non_query(
+        "CREATE TABLE IF NOT EXISTS bench_vectors (id NUMBER PRIMARY KEY, embedding VECTOR(384, FLOAT32))"
+    )
+    try:
+        print("\nBind + execute cost against Oracle")
+        print(f"{'':24}{'text literal':>16}{'array(f)':>16}")
+        
+        timings = {}
+        for name, encode in (("text", encode_text), ("native", encode_native)):
+            query = "SELECT VECTOR_DISTANCE(TO_VECTOR(:1), TO_VECTOR(:2)) FROM dual"
+            await client.execute_query(query, (encode(single), encode(single)))  # warm up
+            start = time.perf_counter()
+            for _ in range(200):
+                await client.execute_query(query, (encode(single), encode(single)))
+            timings[name] = (time.perf_counter() - start) / 200
+        print(f"{'single query (ms)':24}{timings['text'] * 1e3:>16.2f}{timings['native'] * 1e3:>16.2f}")
+        
+        for name, encode in (("text", encode_text), ("native", encode_native)):
+            await client.execute_non_query("TRUNCATE TABLE bench_vectors")
+            start = time.perf_counter()
+            rows = [{"id": i, "embedding": encode(e)} for i, e in enumerate(batch)]
+            await client.execute_many(
+                "INSERT INTO bench_vectors (id, embedding) VALUES (:id, :embedding)", rows
+            )
+            timings[name] = time.perf_counter() - start
+        print(f"{f'{reindex_rows} row reindex (s)':24}{timings['text']:>16.2f}{timings['native']:>16.2f}")
+    finally:
+        await client.execute_non_query("DROP TABLE IF EXISTS bench_vectors")
+        await close_pool()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark embedding encode/bind cost")
+    parser.add_argument("--rows", type=int, default=10000, help="Rows in the simulated reindex")
+    parser.add_argument("--oracle", action="store_true", help="Also measure bind + execute against Oracle")
+    args = parser.parse_args()
+    
+    bench_encode(args.rows)
+    if args.oracle:
+        asyncio.run(bench_bind(args.rows))
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the in-process vector index: recall@k against latency
+
+Builds VectorIndex over synthetic clustered 384-dim embeddings at each catalog size
+and measures p50/p99 query latency, unfiltered and with a genre + status pre-filter.
+Recall@k is checked against exact float64 cosine ranking. If `hnswlib` is installed,
+an HNSW graph is swept over `ef` on the same data for comparison.
+
+Usage:
+    python benchmark_vector_index.py --sizes 10000,50000 --queries 500 --k 10
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+from services.embedding_provider import VECTOR_DIMENSION
+from services.vector_index import VectorIndex
+
+GENRES = ["Action", "Fantasy", "Adventure", "Drama", "Comedy", "Romance", "Mystery",
+          "Supernatural", "Martial Arts", "School", "Game", "Horror", "Slice of Life"]
+STATUSES = ["ongoing", "completed", "hiatus"]
+
+def _synthetic_catalog(size: int, rng: np.random.Generator):
+    # Clustered like real embeddings, so nearest neighbours aren't all equidistant
+    centers = rng.standard_normal((max(8, size // 200), VECTOR_DIMENSION))
+    vectors = centers[rng.integers(0, len(centers), size)] + 0.6 * rng.standard_normal((size, VECTOR_DIMENSION))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    rows = [
+        {
+            "id": f"m{i}",
+            "title": f"Manhwa {i}",
+            "genre": list(rng.choice(GENRES, size=rng.integers(1, 4), replace=False)),
+            "status": STATUSES[int(rng.integers(0, len(STATUSES)))]
+        }
+        for i in range(size)
+    ]
+    return vectors, rows
+
+class _SyntheticSource:
+    """Stands in for OracleClient.iter_manhwa_embeddings"""
+    
+    def __init__(self, vectors, rows):
+        self.vectors = vectors
+        self.rows = rows
+    
+    async def iter_manhwa_embeddings(self):
+        for row, vector in zip(self.rows, self.vectors):
+            yield {**row, "embedding": vector}
+
+def _exact_top_k(vectors: np.ndarray, queries: np.ndarray, k: int, mask: np.ndarray = None) -> np.ndarray:
+    scores = queries.astype(np.float64) @ vectors.astype(np.float64).T
+    if mask is not None:
+        scores[:, ~mask] = -np.inf
+    return np.argsort(-scores, axis=1)[:, :k]
+
+def _percentiles(samples):
+    return np.percentile(np.asarray(samples) * 1e6, [50, 99])
+
+def _report(label: str, latencies, recall: float):
+    p50, p99 = _percentiles(latencies)
+    print(f"  {label:34}{p50:>10.0f} us{p99:>10.0f} us{recall:>10.1%}")
+
+def _bench_index(vectors, rows, queries, k):
+    index = VectorIndex()
+    start = time.perf_counter()
+    asyncio.run(index.warm(_SyntheticSource(vectors, rows)))
+    print(f"  warm: {(time.perf_counter() - start) * 1000:.0f} ms, matrix {index.get_stats()['matrix_bytes'] / 2**20:.1f} MiB")
+    
+    truth = _exact_top_k(vectors, queries, k)
+    latencies, hits = [], 0
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        results = index.search(query, k)
+        latencies.append(time.perf_counter() - start)
+        hits += len({int(r["id"][1:]) for r in results} & set(expected.tolist()))
+    _report("numpy brute-force", latencies, hits / truth.size)
+    
+    genre, status = "Action", "ongoing"
+    mask = np.array([genre in row["genre"] and row["status"] == status for row in rows])
+    truth = _exact_top_k(vectors, queries, k, mask)
+    latencies, hits = [], 0
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        results = index.search(query, k, genre=genre, status=status)
+        latencies.append(time.perf_counter() - start)
+        hits += len({int(r["id"][1:]) for r in results} & set(expected.tolist()))
+    _report(f"numpy, {genre}+{status} ({mask.mean():.0%})", latencies, hits / truth.size)
+
+def _bench_hnsw(vectors, queries, k):
+    try:
+        import hnswlib
+    except ImportError:
+        print("  (hnswlib not installed, skipping HNSW comparison)")
+        return
+    
+    graph = hnswlib.Index(space="cosine", dim=VECTOR_DIMENSION)
+    start = time.perf_counter()
+    graph.init_index(max_elements=len(vectors), ef_construction=200, M=16)
+    graph.add_items(vectors.astype(np.float32))
+    print(f"  hnsw build: {(time.perf_counter() - start) * 1000:.0f} ms")
+    
+    truth = _exact_top_k(vectors, queries, k)
+    for ef in (16, 32, 64, 128):
+        graph.set_ef(max(ef, k))
+        latencies, hits = [], 0
+        for query, expected in zip(queries, truth):
+            start = time.perf_counter()
+            labels, _ = graph.knn_query(query.astype(np.float32), k=k)
+            latencies.append(time.perf_counter() - start)
+            hits += len(set(labels[0].tolist()) & set(expected.tolist()))
+        _report(f"hnsw ef={ef}", latencies, hits / truth.size)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark vector index recall and latency")
+    parser.add_argument("--sizes", default="10000,50000", help="Comma-separated catalog sizes")
+    parser.add_argument("--queries", type=int, default=500, help="Queries per configuration")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per query")
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(7)
+    for size in (int(s) for s in args.sizes.split(",")):
+        vectors, rows = _synthetic_catalog(size, rng)
+        # Queries near catalog items, like "more like this" and short text queries
+        queries = vectors[rng.integers(0, size, args.queries)] + 0.3 * rng.standard_normal((args.queries, VECTOR_DIMENSION))
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+        
+        print(f"\n{size} manhwa, {args.queries} queries, recall@{args.k}")
+        print(f"  {'':34}{'p50':>13}{'p99':>13}{'recall':>10}")
+        _bench_index(vectors, rows, queries, args.k)
+        _bench_hnsw(vectors, queries, args.k)
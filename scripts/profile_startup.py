@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Profile API cold start: per-module import cost of `api/main.py`
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter and prints the
+slowest imports by cumulative time, plus a per-package rollup, so it's easy to see
+what every autoscaled replica pays before serving its first request. Client init
+costs are reported separately by the API itself at GET /api/v1/admin/startup/report.
+
+Usage:
+    python profile_startup.py --top 25
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api')
+REPO_DIR = os.path.join(API_DIR, '..')
+
+def _run_importtime(module: str):
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([API_DIR, REPO_DIR, os.environ.get("PYTHONPATH", "")])}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=API_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        # importtime lines come first; the traceback is at the end of stderr
+        print(result.stderr.splitlines()[-1] if result.stderr else "import failed", file=sys.stderr)
+        sys.exit(result.returncode)
+    return result.stderr.splitlines()
+
+def _parse(lines):
+    """Yield (module, self_us, cumulative_us, depth) from -X importtime output"""
+    for line in lines:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        yield name.strip(), int(self_us), int(cumulative_us), depth
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile API import time")
+    parser.add_argument("--module", default="main", help="Module to import from api/")
+    parser.add_argument("--top", type=int, default=20, help="Number of slowest imports to show")
+    args = parser.parse_args()
+    
+    entries = list(_parse(_run_importtime(args.module)))
+    total_us = sum(self_us for _, self_us, _, _ in entries)
+    
+    print(f"Importing {args.module}: {total_us / 1000:.1f} ms across {len(entries)} modules\n")
+    
+    print(f"Slowest {args.top} imports (cumulative, includes children)")
+    for name, _, cumulative_us, _ in sorted(entries, key=lambda e: e[2], reverse=True)[:args.top]:
+        print(f"  {name:48}{cumulative_us / 1000:>10.1f} ms")
+    
+    by_package = defaultdict(int)
+    for name, self_us, _, _ in entries:
+        by_package[name.split(".")[0]] += self_us
+    
+    print("\nSelf time by top-level package")
+    for package, self_us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {package:48}{self_us / 1000:>10.1f} ms{self_us / total_us:>8.0%}")
@@ -1,17 +1,26 @@
 #!/usr/bin/env python3
 """
 Seed script to populate the database with sample manhwa data
+
+Usage:
+    python seed-data.py                      # insert the sample manhwa one at a time
+    python seed-data.py --bulk               # upsert the sample manhwa with array DML
+    python seed-data.py --synthetic 50000    # also bulk load 50k generated manhwa
 """
 
+import argparse
 import asyncio
+import random
 import sys
 import os
+import time
 
 # Add the project root to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'api'))
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'dal'))
 
 from dal.oracle_client import OracleClient
+from services.embedding_provider import get_embedding_provider, manhwa_text
 
 sample_manhwa_data = [
     {
@@ -61,31 +70,74 @@ sample_manhwa_data = [
     }
 ]
 
-def _generate_simple_embedding(title: str, description: str, genres: list) -> list:
-    """Generate a simple deterministic embedding for development/seeding"""
-    import hashlib
-    
-    # Combine text for embedding
-    text = f"{title} {description} {' '.join(genres)}".lower()
-    
-    # Create a hash-based embedding (384 dimensions)
-    hash_obj = hashlib.md5(text.encode())
-    hash_hex = hash_obj.hexdigest()
+def _generate_embeddings(manhwa_list: list, batch_size: int = 256) -> list:
+    """Embed manhwa with the API's configured provider, batch by batch"""
+    embedder = get_embedding_provider()
+    texts = [manhwa_text(m['title'], m['description'], m['genre']) for m in manhwa_list]
+    embeddings = []
+    for start in range(0, len(texts), batch_size):
+        embeddings.extend(embedder.encode(texts[start:start + batch_size]))
+    return embeddings
+
+def _generate_synthetic_manhwa(count: int) -> list:
+    """Generate synthetic catalog rows for load testing"""
+    genres = ["Action", "Fantasy", "Adventure", "Drama", "Comedy", "Romance", "Mystery",
+              "Supernatural", "Martial Arts", "School", "Game", "Horror", "Slice of Life"]
+    statuses = ["ongoing", "completed", "hiatus"]
+    rng = random.Random(42)
     
-    # Convert hex to normalized float values
-    embedding = []
-    for i in range(0, min(len(hash_hex), 96), 2):  # 96 hex chars = 48 bytes = 384 bits
-        hex_pair = hash_hex[i:i+2]
-        # Convert hex to float between -1 and 1
-        val = (int(hex_pair, 16) - 127.5) / 127.5
-        embedding.extend([val] * 8)  # Repeat to get to 384 dimensions
+    rows = []
+    for i in range(count):
+        row_genres = rng.sample(genres, rng.randint(1, 4))
+        rows.append({
+            "id": f"synthetic-{i:07d}",
+            "title": f"Synthetic Manhwa {i}",
+            "author": f"Author {rng.randint(1, count // 10 + 1)}",
+            "genre": row_genres,
+            "status": rng.choice(statuses),
+            "description": f"A generated {' and '.join(row_genres).lower()} story used for catalog load testing (#{i}).",
+            "cover_image": ""
+        })
+    return rows
+
+async def seed_database_bulk(synthetic_count: int = 0, batch_size: int = 1000):
+    print("🌱 Starting bulk database seeding...")
     
-    # Pad or truncate to exactly 384 dimensions
-    while len(embedding) < 384:
-        embedding.append(0.0)
-    embedding = embedding[:384]
+    oracle_client = OracleClient()
     
-    return embedding
+    try:
+        print("📋 Initializing database tables...")
+        await oracle_client.init_database()
+        
+        manhwa_list = sample_manhwa_data + _generate_synthetic_manhwa(synthetic_count)
+        
+        print(f"🧮 Generating embeddings for {len(manhwa_list)} manhwa...")
+        start = time.perf_counter()
+        embeddings = _generate_embeddings(manhwa_list)
+        elapsed = time.perf_counter() - start
+        print(f"   {get_embedding_provider().model_id}: {len(embeddings) / max(elapsed, 1e-9):.0f} docs/sec")
+        rows = [
+            {**manhwa_data, "embedding": embedding}
+            for manhwa_data, embedding in zip(manhwa_list, embeddings)
+        ]
+        
+        print(f"📚 Upserting in batches of {batch_size}...")
+        start = time.perf_counter()
+        summary = await oracle_client.upsert_manhwa_many(rows, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        
+        for error in summary["errors"][:20]:
+            print(f"   ⚠️  {error['id']}: {error['message']}")
+        if len(summary["errors"]) > 20:
+            print(f"   ... and {len(summary['errors']) - 20} more errors")
+        
+        print("✅ Bulk seeding completed!")
+        print(f"📊 Upserted {summary['succeeded']}/{summary['processed']} manhwa in {elapsed:.2f}s "
+              f"({summary['processed'] / max(elapsed, 1e-9):.0f} rows/sec)")
+        
+    except Exception as e:
+        print(f"❌ Error seeding database: {e}")
+        raise
 
 async def seed_database():
     print("🌱 Starting database seeding...")
@@ -108,10 +160,8 @@ async def seed_database():
             
             # Generate and add embedding to Oracle
             print(f"   Generating embedding for: {manhwa_data['title']}")
-            embedding = _generate_simple_embedding(
-                manhwa_data['title'],
-                manhwa_data['description'], 
-                manhwa_data['genre']
+            embedding = get_embedding_provider().encode_one(
+                manhwa_text(manhwa_data['title'], manhwa_data['description'], manhwa_data['genre'])
             )
             await oracle_client.update_manhwa_embedding(manhwa["id"], embedding)
         
@@ -123,4 +173,13 @@ async def seed_database():
         raise
 
 if __name__ == "__main__":
-    asyncio.run(seed_database())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Seed the manhwa catalog")
+    parser.add_argument("--bulk", action="store_true", help="Upsert with array DML instead of row-by-row inserts")
+    parser.add_argument("--synthetic", type=int, default=0, help="Number of synthetic manhwa to generate (implies --bulk)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per executemany round trip in bulk mode")
+    args = parser.parse_args()
+    
+    if args.bulk or args.synthetic:
+        asyncio.run(seed_database_bulk(args.synthetic, args.batch_size))
+    else:
+        asyncio.run(seed_database())
\ No newline at end of file
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { Manhwa, SearchResult } from '../types/manhwa';
+import { BatchSearch, Manhwa, SearchResult } from '../types/manhwa';
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000';
 
@@ -16,6 +16,15 @@ class ManhwaService {
     return response.data;
   }
 
+  async getManhwaPage(cursor?: string, limit: number = 20): Promise<{ items: Manhwa[]; nextCursor?: string }> {
+    const params = new URLSearchParams({ limit: String(limit) });
+    if (cursor) {
+      params.set('cursor', cursor);
+    }
+    const response = await this.api.get(`/manhwa/?${params.toString()}`);
+    return { items: response.data, nextCursor: response.headers['x-next-cursor'] };
+  }
+
   async getManhwaById(id: string): Promise<Manhwa> {
     const response = await this.api.get(`/manhwa/${id}`);
     return response.data;
@@ -31,6 +40,11 @@ class ManhwaService {
     return response.data;
   }
 
+  async searchBatch(searches: BatchSearch[]): Promise<Record<string, SearchResult[]>> {
+    const response = await this.api.post('/search/batch', { searches });
+    return response.data;
+  }
+
   async generateSummary(manhwaId: string): Promise<{ summary: string }> {
     const response = await this.api.post(`/llm/summarize?manhwa_id=${manhwaId}`);
     return response.data;
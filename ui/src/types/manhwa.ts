@@ -10,6 +10,18 @@ export interface Manhwa {
 }
 
 export interface SearchResult extends Manhwa {
-  relevance_score: number;
+  relevance_score: number;     // higher is better
+  similarity_score?: number;   // cosine distance, lower is closer
+  rrf_score?: number;          // set when keyword results were fused in
   snippet: string;
-}
\ No newline at end of file
+}
+
+// One entry of a POST /search/batch call: either a text query or a similar-to id
+export interface BatchSearch {
+  id: string;
+  q?: string;
+  similar_to?: string;
+  limit?: number;
+  genre?: string;
+  status?: string;
+}